@@ -0,0 +1,401 @@
+"""Benchmarks of the request, batch and DataFrame hot paths of ctx-python.
+
+Every benchmark runs offline, against a local `ctxpy.mock_server.MockCTXServer` or
+synthetic records, and the results are written as JSON so runs can be compared
+across releases.
+
+Usage
+-----
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --quick --only to_df format_post_query
+
+"""
+
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from importlib import metadata
+
+import pandas as pd
+
+from ctxpy.arrow import pa
+from ctxpy.base import (
+    ColumnBuffer,
+    CTXConnection,
+    ResponseTransformer,
+    normalize_nulls,
+)
+from ctxpy.mock_server import MockCTXServer
+from ctxpy.ratelimit import RateLimiter
+
+SIZES = {
+    "format_post_query": [1_000, 10_000, 100_000],
+    "to_df": [10_000, 100_000, 1_000_000],
+    "normalize_nulls": [100_000, 1_000_000],
+    "mmdb_memory": [100_000, 500_000],
+    "columnar": [100_000, 1_000_000],
+    "single": 200,
+    "batched": 10_000,
+    "large_list": 100_000,
+}
+QUICK_SIZES = {
+    "format_post_query": [1_000, 10_000],
+    "to_df": [10_000, 100_000],
+    "normalize_nulls": [100_000],
+    "mmdb_memory": [20_000],
+    "columnar": [100_000],
+    "single": 50,
+    "batched": 2_000,
+    "large_list": 10_000,
+}
+
+## Frames with at least this many rows are timed fewer times
+LARGE_FRAME = 1_000_000
+
+
+def summarize(samples: list) -> dict:
+    """Latency percentiles, in milliseconds, of a list of durations in seconds."""
+    samples = sorted(samples)
+    if len(samples) > 1:
+        cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    else:
+        cuts = samples * 99
+    return {
+        "n": len(samples),
+        "mean_ms": 1000 * statistics.fmean(samples),
+        "p50_ms": 1000 * cuts[49],
+        "p90_ms": 1000 * cuts[89],
+        "p99_ms": 1000 * cuts[98],
+        "max_ms": 1000 * samples[-1],
+    }
+
+
+def timed(func, repeat: int = 5) -> list:
+    """Durations, in seconds, of `repeat` calls to `func`."""
+    samples = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def records(n: int, seed: int = 0) -> list:
+    """Synthetic API records, with the "-" and "" placeholders the APIs use."""
+    return [
+        {
+            "dtxsid": f"DTXSID{i:09d}",
+            "preferredName": f"Chemical {i}",
+            "casrn": f"{i % 9999}-{i % 97:02d}-{i % 10}",
+            "value": (i + seed) / 7,
+            "units": "mg/kg-day",
+            "source": "-" if i % 5 == 0 else "ToxVal",
+            "qualifier": "" if i % 3 == 0 else "=",
+            "notes": None if i % 2 == 0 else "note",
+        }
+        for i in range(n)
+    ]
+
+
+def connect(server: MockCTXServer, **kwargs) -> CTXConnection:
+    return CTXConnection(
+        x_api_key="benchmark",
+        host=server.url,
+        rate_limiter=RateLimiter(rate=None),
+        **kwargs,
+    )
+
+
+def bench_ctx_call(sizes: dict, workers: int) -> list:
+    """Throughput and latency of `ctx_call` in single, batched and large-list mode."""
+    results = []
+    with MockCTXServer(latency=(0.001, 0.005), seed=0) as server:
+        conn = connect(server)
+        endpoint = "chemical/detail/search/by-dtxsid/"
+        params = {"projection": "compact"}
+
+        ## One GET per identifier
+        n = sizes["single"]
+        samples = []
+        start = time.perf_counter()
+        for i in range(n):
+            t = time.perf_counter()
+            conn.ctx_call(endpoint=endpoint, query=f"DTXSID{i:09d}", params=params)
+            samples.append(time.perf_counter() - t)
+        elapsed = time.perf_counter() - start
+        results.append(
+            {
+                "name": "ctx_call.single",
+                "params": {"requests": n},
+                "metrics": {
+                    "requests_per_s": n / elapsed,
+                    "items_per_s": n / elapsed,
+                    **summarize(samples),
+                },
+            }
+        )
+
+        ## Batched POSTs, sequential and concurrent chunks
+        for mode in ("batched", "large_list"):
+            n = sizes[mode]
+            query = [f"DTXSID{i:09d}" for i in range(n)]
+            for max_workers in sorted({1, workers}):
+                server.stats.clear()
+                samples = timed(
+                    lambda: conn.ctx_call(
+                        endpoint=endpoint,
+                        query=query,
+                        params=params,
+                        batched=True,
+                        batch_size=200,
+                        max_workers=max_workers,
+                    ),
+                    repeat=3,
+                )
+                best = min(samples)
+                results.append(
+                    {
+                        "name": f"ctx_call.{mode}",
+                        "params": {
+                            "items": n,
+                            "batch_size": 200,
+                            "max_workers": max_workers,
+                        },
+                        "metrics": {
+                            "requests_per_s": server.stats["requests"]
+                            / sum(samples),
+                            "items_per_s": n / best,
+                            **summarize(samples),
+                        },
+                    }
+                )
+    return results
+
+
+def bench_format_post_query(sizes: dict) -> list:
+    """Time to build POST bodies for 1k-100k identifiers."""
+    conn = CTXConnection(x_api_key="benchmark")
+    results = []
+    for n in sizes["format_post_query"]:
+        query = [f"DTXSID{i:09d}" for i in range(n)]
+        for bracketed in (True, False):
+            samples = timed(
+                lambda: conn._format_post_query(query=query, bracketed=bracketed),
+                repeat=10,
+            )
+            results.append(
+                {
+                    "name": "format_post_query",
+                    "params": {"items": n, "bracketed": bracketed},
+                    "metrics": {
+                        "items_per_s": n / min(samples),
+                        **summarize(samples),
+                    },
+                }
+            )
+    return results
+
+
+def bench_to_df(sizes: dict) -> list:
+    """Time and memory of `ResponseTransformer.to_df` at 10k-1M rows."""
+    backends = ["numpy"] if pa is None else ["numpy", "pyarrow"]
+    results = []
+    for n in sizes["to_df"]:
+        data = records(n)
+        repeat = 3 if n >= LARGE_FRAME else 5
+        for backend in backends:
+            transformer = ResponseTransformer(data)
+            samples = timed(
+                lambda: transformer.to_df(dtype_backend=backend), repeat=repeat
+            )
+
+            ## tracemalloc doesn't see Arrow's memory pool, so also report the size of
+            ## the frame itself
+            gc.collect()
+            tracemalloc.start()
+            df = transformer.to_df(dtype_backend=backend)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            results.append(
+                {
+                    "name": "to_df",
+                    "params": {"rows": n, "dtype_backend": backend},
+                    "metrics": {
+                        "rows_per_s": n / min(samples),
+                        "peak_mib": peak / 2**20,
+                        "frame_mib": df.memory_usage(deep=True).sum() / 2**20,
+                        **summarize(samples),
+                    },
+                }
+            )
+    return results
+
+
+def chained_nulls(df: pd.DataFrame) -> pd.DataFrame:
+    """The null handling `to_df` used before `normalize_nulls`, for comparison."""
+    return df.fillna(pd.NA).replace("-", pd.NA).replace("", pd.NA)
+
+
+def bench_normalize_nulls(sizes: dict) -> list:
+    """Time and peak memory of replacing missing-value placeholders with pd.NA."""
+    results = []
+    methods = {"chained": chained_nulls, "single_pass": normalize_nulls}
+    for n in sizes["normalize_nulls"]:
+        df = pd.DataFrame(records(n))
+        repeat = 3 if n >= LARGE_FRAME else 5
+        for method, func in methods.items():
+            ## normalize_nulls works in place, so each run gets its own shallow copy
+            samples = timed(lambda: func(df.copy(deep=False)), repeat=repeat)
+
+            gc.collect()
+            tracemalloc.start()
+            func(df.copy(deep=False))
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            results.append(
+                {
+                    "name": "normalize_nulls",
+                    "params": {"rows": n, "method": method},
+                    "metrics": {
+                        "rows_per_s": n / min(samples),
+                        "peak_mib": peak / 2**20,
+                        **summarize(samples),
+                    },
+                }
+            )
+    return results
+
+
+def bench_mmdb_memory(sizes: dict) -> list:
+    """Peak memory of requesting and decoding MMDB-sized responses."""
+    results = []
+    call = {
+        "endpoint": "exposure/mmdb/single-sample/by-medium",
+        "query": "",
+        "params": {"medium": "surface water"},
+    }
+    for n in sizes["mmdb_memory"]:
+        with MockCTXServer(mmdb_records=n, extra_fields=4) as server:
+            ## Have the server build and encode the body before measuring
+            warmup = connect(server)
+            warmup.ctx_call(**call)
+            payload_mib = len(warmup.response.content) / 2**20
+            del warmup
+
+            for stream in (False, True):
+                conn = connect(server, stream=stream)
+                gc.collect()
+                tracemalloc.start()
+                start = time.perf_counter()
+                info = conn.ctx_call(**call)
+                elapsed = time.perf_counter() - start
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                del info, conn
+                results.append(
+                    {
+                        "name": "mmdb_memory",
+                        "params": {"records": n, "stream": stream},
+                        "metrics": {
+                            "payload_mib": payload_mib,
+                            "peak_mib": peak / 2**20,
+                            "seconds": elapsed,
+                        },
+                    }
+                )
+    return results
+
+
+def bench_columnar(sizes: dict, chunk_size: int = 1000) -> list:
+    """Time and peak memory of building a frame from chunks of records."""
+    results = []
+    for n in sizes["columnar"]:
+        for mode in ("records", "columnar"):
+            gc.collect()
+            tracemalloc.start()
+            start = time.perf_counter()
+            if mode == "records":
+                ## What a batched `ctx_call` followed by `to_df` does
+                info = []
+                for i in range(0, n, chunk_size):
+                    info.extend(records(chunk_size, seed=i))
+                df = ResponseTransformer(info).to_df()
+                del info
+            else:
+                buffer = ColumnBuffer()
+                for i in range(0, n, chunk_size):
+                    buffer.write(records(chunk_size, seed=i))
+                df = buffer.to_df()
+                del buffer
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del df
+            results.append(
+                {
+                    "name": "columnar",
+                    "params": {"rows": n, "mode": mode},
+                    "metrics": {"peak_mib": peak / 2**20, "seconds": elapsed},
+                }
+            )
+    return results
+
+
+BENCHMARKS = {
+    "ctx_call": bench_ctx_call,
+    "format_post_query": bench_format_post_query,
+    "to_df": bench_to_df,
+    "normalize_nulls": bench_normalize_nulls,
+    "mmdb_memory": bench_mmdb_memory,
+    "columnar": bench_columnar,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--output", default="benchmark-results.json", help="JSON file to write"
+    )
+    parser.add_argument(
+        "--only", nargs="+", choices=sorted(BENCHMARKS), help="benchmarks to run"
+    )
+    parser.add_argument("--quick", action="store_true", help="use smaller sizes")
+    parser.add_argument(
+        "--workers", type=int, default=8, help="max_workers for concurrent batches"
+    )
+    args = parser.parse_args(argv)
+
+    sizes = QUICK_SIZES if args.quick else SIZES
+    results = []
+    for name in args.only or BENCHMARKS:
+        print(f"Running {name}...", file=sys.stderr)
+        func = BENCHMARKS[name]
+        if name == "ctx_call":
+            results.extend(func(sizes, workers=args.workers))
+        else:
+            results.extend(func(sizes))
+
+    report = {
+        "ctxpy_version": metadata.version("ctx-python"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "quick": args.quick,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -57,12 +57,31 @@ the United States Government.
 from importlib import metadata
 from sys import version_info
 
+from .aio import (
+    AsyncChemical,
+    AsyncChemicalList,
+    AsyncDossier,
+    AsyncExposure,
+    AsyncHazard,
+)
 from .chemical import Chemical
 from .chemical_list import ChemicalList
+from .dossier import Dossier
 from .exposure import Exposure
 from .hazard import Hazard
 
-__all__ = ["Chemical", "Exposure", "Hazard", "ChemicalList"]
+__all__ = [
+    "Chemical",
+    "Exposure",
+    "Hazard",
+    "ChemicalList",
+    "Dossier",
+    "AsyncChemical",
+    "AsyncExposure",
+    "AsyncHazard",
+    "AsyncChemicalList",
+    "AsyncDossier",
+]
 __version__ = metadata.version("ctx-python")
 
 _DISCLAIMER = """
@@ -0,0 +1,1027 @@
+"""Asynchronous connections to the CTX APIs.
+
+The classes here mirror CTXConnection and the domain classes, with every method that
+calls the API being a coroutine. Argument validation and endpoint construction are
+shared with the synchronous classes, so both accept exactly the same arguments.
+
+Requires the optional `httpx` dependency: ``pip install ctx-python[async]``.
+
+Classes
+-------
+AsyncCTXConnection: connect and interact with CTX APIs from asyncio code
+AsyncChemical: asynchronous version of Chemical
+AsyncChemicalList: asynchronous version of ChemicalList
+AsyncExposure: asynchronous version of Exposure
+AsyncHazard: asynchronous version of Hazard
+AsyncDossier: asynchronous version of Dossier
+
+"""
+
+import asyncio
+import json
+import warnings
+from collections import deque
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Union
+
+from pandas.api.types import is_list_like
+
+from .arrow import records_to_table
+from .base import ColumnBuffer, CTXConnection
+from .checkpoint import JobCheckpoint
+from .chemical import Chemical
+from .chemical_list import ChemicalList
+from .dossier import Dossier
+from .exceptions import BatchChunkError
+from .exposure import Exposure
+from .hazard import Hazard
+from .retry import RetrySummary
+from .schema import get_schema
+from .streaming import JSONRecordParser
+from .utils import chunker, select_fields
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class AsyncCTXConnection(CTXConnection):
+    """
+    Asynchronous connection to the CTX APIs.
+
+    Requests are sent through an `httpx.AsyncClient` and the number of requests in
+    flight at any one time is bounded by a semaphore.
+
+    Parameters
+    ----------
+    x_api_key : str or None, default None
+        A user's API key provided to them for accessing CCTE's APIs. Will use value
+        provided in .env file if no key is provided.
+    env_path : str or None, default None
+        The .env file location. Will default to a user's home directory if no value is
+        provided.
+    client : httpx.AsyncClient or None, default None
+        Client used to send requests. If None, a client with a connection pool of
+        `max_concurrency` connections is created and closed by `aclose`.
+    max_concurrency : int, default 100
+        Maximum number of requests in flight at once. Ignored if `semaphore` is given.
+    semaphore : asyncio.Semaphore or None, default None
+        Semaphore bounding requests in flight. Pass the same semaphore to several
+        connections to share one concurrency limit between them.
+    **kwargs
+        Other options passed on to CTXConnection.
+
+    Examples
+    --------
+    >>> async with AsyncChemical() as chem:
+    ...     info = await chem.details(by='dtxsid', query='DTXSID7020182')
+
+    """
+
+    def __init__(
+        self,
+        x_api_key: Optional[str] = None,
+        env_path: Optional[Union[str, Path]] = None,
+        client=None,
+        max_concurrency: int = 100,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        **kwargs,
+    ):
+        if httpx is None:
+            raise ImportError(
+                "Asynchronous connections require `httpx`. Install it with "
+                "`pip install ctx-python[async]`."
+            )
+        super().__init__(x_api_key=x_api_key, env_path=env_path, **kwargs)
+
+        self._owns_client = client is None
+        if client is None:
+            limits = httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            )
+            transport = None
+            if self.cassette is not None:
+                transport = self.cassette.async_transport()
+            client = httpx.AsyncClient(
+                limits=limits, timeout=None, transport=transport
+            )
+        self.client = client
+
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max_concurrency)
+        self.semaphore = semaphore
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close the HTTP client, if it was created by this connection."""
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def _request(
+        self,
+        endpoint: str,
+        query: Optional[str] = None,
+        params: Optional[dict] = None,
+        bracketed: bool = True,
+        quote_method: Union[str, Callable] = "default",
+        stats: Optional[dict] = None,
+    ):
+
+        ## Batch searches cached per identifier are handled by ctx_call
+        cache = self.cache
+        if self._caches_items(endpoint=endpoint, query=query):
+            cache = None
+
+        if cache is not None:
+            key = cache.key(
+                host=self.host, endpoint=endpoint, query=query, params=params
+            )
+            body = cache.get(key)
+            if body is not None:
+                return json.loads(body.decode("utf-8"))
+
+        method, url, data, headers = self._prepare_request(
+            endpoint=endpoint,
+            query=query,
+            bracketed=bracketed,
+            quote_method=quote_method,
+        )
+
+        send = partial(
+            self.client.request,
+            method=method,
+            url=url,
+            content=data,
+            headers=headers,
+            params=params,
+        )
+        if self.stream:
+            send = partial(
+                self.client.send,
+                self.client.build_request(
+                    method=method,
+                    url=url,
+                    content=data,
+                    headers=headers,
+                    params=params,
+                ),
+                stream=True,
+            )
+
+        async with self.semaphore:
+            response = await self.retry_policy.send_async(
+                method=method,
+                send=send,
+                rate_limiter=self.rate_limiter,
+                summary=self.retry_summary,
+                errors=(httpx.TransportError,),
+            )
+            self.response = response
+            if self.stream:
+                try:
+                    response.raise_for_status()
+                    info = await self._decode_stream(response)
+                finally:
+                    await response.aclose()
+        if not self.stream:
+            response.raise_for_status()
+            info = json.loads(response.content.decode("utf-8"))
+
+        if cache is not None:
+            body = json.dumps(info).encode("utf-8") if self.stream else response.content
+            cache.set(key=key, endpoint=endpoint, body=body)
+        if stats is not None:
+            stats.update(self._response_stats(response))
+        return info
+
+    async def _decode_stream(self, response):
+        ## Asynchronous version of `CTXConnection._decode_stream`
+        parser = JSONRecordParser()
+        records = []
+        async for chunk in response.aiter_bytes(chunk_size=self.stream_chunk_size):
+            records.extend(parser.feed(chunk))
+        records.extend(parser.close())
+        return parser.assemble(records)
+
+    async def _fetch_chunk(
+        self,
+        index: int,
+        chunk: list,
+        endpoint: str,
+        params: Optional[dict] = None,
+        bracketed: bool = True,
+        quote_method: Union[str, Callable] = "default",
+        limit: Optional[asyncio.Semaphore] = None,
+        checkpoint: Optional[JobCheckpoint] = None,
+    ):
+        if (checkpoint is not None) and checkpoint.is_done(index):
+            return checkpoint.load(index)
+        try:
+            if limit is None:
+                records = await self._request(
+                    endpoint=endpoint,
+                    query=chunk,
+                    params=params,
+                    bracketed=bracketed,
+                    quote_method=quote_method,
+                )
+            else:
+                async with limit:
+                    records = await self._request(
+                        endpoint=endpoint,
+                        query=chunk,
+                        params=params,
+                        bracketed=bracketed,
+                        quote_method=quote_method,
+                    )
+        except Exception as err:
+            raise BatchChunkError(index=index, chunk=chunk, error=err) from err
+        if checkpoint is not None:
+            checkpoint.save(index, records)
+        return records
+
+    async def _send_one(self, request: dict):
+        ## Asynchronous version of `CTXConnection._send_one`
+        endpoint, query = request["endpoint"], request.get("query")
+        if not self._caches_items(endpoint=endpoint, query=query):
+            return await self._request(**request)
+
+        params = request.get("params")
+        query, hits, misses = self._get_cached_items(
+            endpoint=endpoint, query=query, params=params
+        )
+        records = (
+            await self._request(**{**request, "query": misses}) if misses else []
+        )
+        return self._merge_cached_items(
+            endpoint=endpoint,
+            query=query,
+            params=params,
+            hits=hits,
+            misses=misses,
+            records=records,
+        )
+
+    async def _send(self, request: dict, limit: Optional[asyncio.Semaphore] = None):
+        ## Asynchronous version of `CTXConnection._send`
+        try:
+            if limit is None:
+                return await self._send_one(request), None
+            async with limit:
+                return await self._send_one(request), None
+        except Exception as err:
+            return None, err
+
+    async def _send_all(self, calls: list, max_workers: Optional[int] = None):
+        """
+        Asynchronous version of `CTXConnection._send_all`.
+
+        Every request is scheduled at once, bounded by the connection's semaphore;
+        `max_workers`, if given, further limits how many are in flight.
+        """
+        limit = None if max_workers is None else asyncio.Semaphore(max_workers)
+        return await asyncio.gather(
+            *(self._send(request, limit=limit) for request in calls)
+        )
+
+    async def _fan_out(
+        self,
+        endpoint: str,
+        query: Iterable[str],
+        params: Optional[dict] = None,
+        key: str = "dtxsid",
+        max_workers: Optional[int] = None,
+    ) -> list:
+        """
+        Asynchronous version of `CTXConnection._fan_out`.
+
+        Every identifier is requested concurrently, bounded by the connection's
+        semaphore and rate limiter; `max_workers`, if given, further limits how many
+        requests of this call are in flight.
+        """
+
+        ## Remove duplicated DTXSIDs, keeping the order they were given in
+        query = list(dict.fromkeys(query))
+        results = await self._send_all(
+            [{"endpoint": endpoint, "query": q, "params": params} for q in query],
+            max_workers=max_workers,
+        )
+
+        info = []
+        for q, (records, err) in zip(query, results):
+            if err is None:
+                info.extend(self._tag_records(records, item=q, key=key))
+        self._warn_failed_items({q: err for q, (_, err) in zip(query, results)})
+        return info
+
+    async def _batch(
+        self,
+        endpoint: str,
+        query: Iterable[str],
+        batch_size: int,
+        params: Optional[dict] = None,
+        bracketed: bool = True,
+        quote_method: Union[str, Callable] = "default",
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Asynchronous version of `CTXConnection._batch`.
+
+        All chunks are scheduled at once and bounded by the connection's semaphore;
+        `max_workers`, if given, further limits how many chunks of this call are in
+        flight. Results are returned in chunk order. If the connection has a
+        `batch_sizer`, chunks are instead sent in rounds of `max_workers` (defaults to
+        the connection's `max_workers`), each sized from the rounds before it.
+        """
+
+        ## Remove duplicated DTXSIDs, keeping the order they were given in
+        query = list(dict.fromkeys(query))
+        if (self.batch_sizer is not None) and (self.job_id is None):
+            info = []
+            async for records in self._iter_adaptive(
+                fetch=self._fetch_split,
+                endpoint=endpoint,
+                query=query,
+                batch_size=batch_size,
+                params=params,
+                bracketed=bracketed,
+                quote_method=quote_method,
+                max_workers=self.max_workers if max_workers is None else max_workers,
+            ):
+                info.extend(records)
+            return info
+        chunks = list(chunker(query, batch_size))
+        checkpoint = self._start_checkpoint(
+            endpoint=endpoint, chunks=chunks, params=params, bracketed=bracketed
+        )
+
+        limit = None if max_workers is None else asyncio.Semaphore(max_workers)
+        tasks = [
+            asyncio.ensure_future(
+                self._fetch_chunk(
+                    index=i,
+                    chunk=chunk,
+                    endpoint=endpoint,
+                    params=params,
+                    bracketed=bracketed,
+                    quote_method=quote_method,
+                    limit=limit,
+                    checkpoint=checkpoint,
+                )
+            )
+            for i, chunk in enumerate(chunks)
+        ]
+        try:
+            results = await asyncio.gather(*tasks)
+        except BatchChunkError:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        info = []
+        for result in results:
+            info.extend(result)
+
+        return info
+
+    async def _fetch_split(
+        self,
+        index: int,
+        chunk: list,
+        endpoint: str,
+        params: Optional[dict] = None,
+        bracketed: bool = True,
+        quote_method: Union[str, Callable] = "default",
+    ):
+        ## Asynchronous version of `CTXConnection._fetch_split`
+        stats = {}
+        try:
+            records = await self._request(
+                endpoint=endpoint,
+                query=chunk,
+                params=params,
+                bracketed=bracketed,
+                quote_method=quote_method,
+                stats=stats,
+            )
+        except Exception as err:
+            if (len(chunk) <= 1) or (not self.batch_sizer.should_split(err)):
+                raise BatchChunkError(index=index, chunk=chunk, error=err) from err
+            stats = None
+
+        if stats is None:
+            ## Only blame the chunk's size if its halves are answered. If they fail
+            ## down to a single identifier, that identifier's error is raised.
+            half = len(chunk) // 2
+            kwargs = {
+                "index": index,
+                "endpoint": endpoint,
+                "params": params,
+                "bracketed": bracketed,
+                "quote_method": quote_method,
+            }
+            halves = await asyncio.gather(
+                self._fetch_split(chunk=chunk[:half], **kwargs),
+                self._fetch_split(chunk=chunk[half:], **kwargs),
+            )
+            self.batch_sizer.split(endpoint=endpoint, size=len(chunk))
+            return halves[0] + halves[1]
+        if stats:
+            self.batch_sizer.record(
+                endpoint=endpoint,
+                size=len(chunk),
+                seconds=stats["seconds"],
+                nbytes=stats["bytes"],
+            )
+        return records
+
+    async def _iter_adaptive(
+        self,
+        fetch: Callable,
+        endpoint: str,
+        query: list,
+        batch_size: int,
+        params: Optional[dict] = None,
+        bracketed: bool = True,
+        quote_method: Union[str, Callable] = "default",
+        max_workers: int = 1,
+    ):
+        ## Asynchronous version of `CTXConnection._iter_adaptive`
+        fetch = partial(
+            fetch,
+            endpoint=endpoint,
+            params=params,
+            bracketed=bracketed,
+            quote_method=quote_method,
+        )
+        max_workers = max(1, max_workers)
+        start = 0
+        index = 0
+        while start < len(query):
+            chunks = []
+            while (start < len(query)) and (len(chunks) < max_workers):
+                size = self.batch_sizer.size(endpoint=endpoint, default=batch_size)
+                chunks.append(query[start : start + size])
+                start += size
+            results = await asyncio.gather(
+                *[
+                    fetch(index=index + i, chunk=chunk)
+                    for i, chunk in enumerate(chunks)
+                ]
+            )
+            for records in results:
+                yield records
+            index += len(chunks)
+
+    async def _call(
+        self,
+        endpoint: str,
+        query: Optional[str] = None,
+        params: Optional[dict] = None,
+        bracketed: bool = True,
+        batched: bool = False,
+        batch_size: int = 200,
+        quote_method="default",
+        max_workers: Optional[int] = None,
+    ):
+
+        if (not batched) and (is_list_like(query)) and (not isinstance(query, dict)):
+            if self.batch_sizer is not None:
+                ## The sizer decides how many identifiers are sent at once
+                batched = True
+            elif len(query) > batch_size:
+                warnings.warn(
+                    "Length of query's iterable is larger than `batch_size`, "
+                    "performing batched search."
+                )
+                batched = True
+
+        if batched:
+            info = await self._batch(
+                endpoint=endpoint,
+                query=query,
+                params=params,
+                bracketed=bracketed,
+                batch_size=batch_size,
+                quote_method=quote_method,
+                max_workers=max_workers,
+            )
+        else:
+            info = await self._request(
+                endpoint=endpoint,
+                query=query,
+                params=params,
+                bracketed=bracketed,
+                quote_method=quote_method,
+            )
+        return info
+
+    async def ctx_call(
+        self,
+        endpoint: str,
+        query: Optional[str] = None,
+        params: Optional[dict] = None,
+        bracketed: bool = True,
+        batched: bool = False,
+        batch_size: int = 200,
+        quote_method="default",
+        max_workers: Optional[int] = None,
+    ):
+
+        self.retry_summary = RetrySummary()
+        kwargs = {
+            "endpoint": endpoint,
+            "params": params,
+            "bracketed": bracketed,
+            "batched": batched,
+            "batch_size": batch_size,
+            "quote_method": quote_method,
+            "max_workers": max_workers,
+        }
+
+        if not self._caches_items(endpoint=endpoint, query=query):
+            return await self._call(query=query, **kwargs)
+
+        ## Only request the identifiers that aren't cached already
+        query, hits, misses = self._get_cached_items(
+            endpoint=endpoint, query=query, params=params
+        )
+        records = (await self._call(query=misses, **kwargs)) if misses else []
+        return self._merge_cached_items(
+            endpoint=endpoint,
+            query=query,
+            params=params,
+            hits=hits,
+            misses=misses,
+            records=records,
+        )
+
+    async def _fetch_items(
+        self,
+        index: int,
+        chunk: list,
+        endpoint: str,
+        params: Optional[dict] = None,
+        bracketed: bool = True,
+        quote_method: Union[str, Callable] = "default",
+        checkpoint: Optional[JobCheckpoint] = None,
+    ):
+        ## Asynchronous version of `CTXConnection._fetch_items`
+        kwargs = {
+            "endpoint": endpoint,
+            "params": params,
+            "bracketed": bracketed,
+            "quote_method": quote_method,
+        }
+        fetch = partial(self._fetch_chunk, checkpoint=checkpoint)
+        if (self.batch_sizer is not None) and (checkpoint is None):
+            fetch = self._fetch_split
+        if not self._caches_items(endpoint=endpoint, query=chunk):
+            return await fetch(index=index, chunk=chunk, **kwargs)
+
+        chunk, hits, misses = self._get_cached_items(
+            endpoint=endpoint, query=chunk, params=params
+        )
+        records = (
+            (await fetch(index=index, chunk=misses, **kwargs))
+            if misses
+            else []
+        )
+        return self._merge_cached_items(
+            endpoint=endpoint,
+            query=chunk,
+            params=params,
+            hits=hits,
+            misses=misses,
+            records=records,
+        )
+
+    async def _write_sink(self, sink, call: dict, columns: Optional[list] = None):
+        ## Asynchronous version of `CTXConnection._write_sink`
+        schema = get_schema(call["endpoint"]) if self.use_schemas else None
+        async for info in self.iter_ctx_call(**call):
+            sink.write(records_to_table(info, schema=schema, columns=columns))
+        return sink
+
+    async def _collect(self, call: dict, columns: Optional[list] = None):
+        ## Asynchronous version of `CTXConnection._collect`
+        buffer = ColumnBuffer(
+            dtype_backend=self.dtype_backend,
+            schema=get_schema(call["endpoint"]) if self.use_schemas else None,
+            columns=columns,
+        )
+        async for info in self.iter_ctx_call(**call):
+            buffer.write(info)
+        if self.dtype_backend == "pyarrow_table":
+            return buffer.to_arrow()
+        return buffer.to_df()
+
+    async def iter_ctx_call(
+        self,
+        endpoint: str,
+        query: Optional[str] = None,
+        params: Optional[dict] = None,
+        bracketed: bool = True,
+        batched: bool = True,
+        batch_size: int = 200,
+        quote_method="default",
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Asynchronous version of `CTXConnection.iter_ctx_call`, used with ``async for``.
+        """
+
+        self.retry_summary = RetrySummary()
+        if (not is_list_like(query)) or (isinstance(query, dict)):
+            yield await self._request(
+                endpoint=endpoint,
+                query=query,
+                params=params,
+                bracketed=bracketed,
+                quote_method=quote_method,
+            )
+            return
+
+        if max_workers is None:
+            max_workers = self.max_workers
+
+        ## Remove duplicated DTXSIDs, keeping the order they were given in
+        query = list(dict.fromkeys(query))
+        if (self.batch_sizer is not None) and (self.job_id is None):
+            async for records in self._iter_adaptive(
+                fetch=self._fetch_items,
+                endpoint=endpoint,
+                query=query,
+                batch_size=batch_size,
+                params=params,
+                bracketed=bracketed,
+                quote_method=quote_method,
+                max_workers=max_workers,
+            ):
+                yield records
+            return
+        chunks = list(chunker(query, batch_size))
+        checkpoint = self._start_checkpoint(
+            endpoint=endpoint, chunks=chunks, params=params, bracketed=bracketed
+        )
+
+        ## Keep up to `max_workers` chunks ahead of the one being yielded
+        pending = deque()
+        try:
+            for i, chunk in enumerate(chunks):
+                pending.append(
+                    asyncio.ensure_future(
+                        self._fetch_items(
+                            index=i,
+                            chunk=chunk,
+                            endpoint=endpoint,
+                            params=params,
+                            bracketed=bracketed,
+                            quote_method=quote_method,
+                            checkpoint=checkpoint,
+                        )
+                    )
+                )
+                if len(pending) >= max_workers:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+class AsyncChemical(AsyncCTXConnection, Chemical):
+    """
+    Asynchronous version of Chemical.
+
+    Takes the same arguments as Chemical and AsyncCTXConnection.
+    """
+
+    async def search(
+        self,
+        by: str,
+        query: Union[str, Iterable[str]],
+        batch_size: Optional[int] = 200,
+        top_n_hits: Optional[int] = None,
+    ):
+        """Asynchronous version of `Chemical.search`."""
+        call = self._search_call(
+            by=by, query=query, batch_size=batch_size, top_n_hits=top_n_hits
+        )
+        return await self.ctx_call(**call)
+
+    async def iter_search(
+        self,
+        by: str,
+        query: Union[str, Iterable[str]],
+        batch_size: Optional[int] = 200,
+        top_n_hits: Optional[int] = None,
+    ):
+        """Asynchronous version of `Chemical.iter_search`."""
+        call = self._search_call(
+            by=by, query=query, batch_size=batch_size, top_n_hits=top_n_hits
+        )
+        async for info in self.iter_ctx_call(**call):
+            yield info
+
+    async def details(
+        self,
+        by: str,
+        query: Union[str, Iterable[str]],
+        subset: Optional[str] = None,
+        batch_size: Optional[int] = 1000,
+        columns: Optional[list] = None,
+        sink=None,
+    ):
+        """Asynchronous version of `Chemical.details`."""
+        call = self._details_call(
+            by=by, query=query, subset=subset, batch_size=batch_size
+        )
+        if sink is not None:
+            return await self._write_sink(sink=sink, call=call, columns=columns)
+        info = await self.ctx_call(**call)
+        if columns is not None:
+            info = select_fields(info, columns)
+        return info
+
+    async def iter_details(
+        self,
+        by: str,
+        query: Union[str, Iterable[str]],
+        subset: Optional[str] = None,
+        batch_size: Optional[int] = 1000,
+        columns: Optional[list] = None,
+    ):
+        """Asynchronous version of `Chemical.iter_details`."""
+        call = self._details_call(
+            by=by, query=query, subset=subset, batch_size=batch_size
+        )
+        async for info in self.iter_ctx_call(**call):
+            yield info if columns is None else select_fields(info, columns)
+
+    async def msready(
+        self,
+        by: str,
+        query: Optional[str] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ):
+        """Asynchronous version of `Chemical.msready`."""
+        call = self._msready_call(by=by, query=query, start=start, end=end)
+        return await self.ctx_call(**call)
+
+
+class AsyncChemicalList(AsyncCTXConnection, ChemicalList):
+    """
+    Asynchronous version of ChemicalList.
+
+    Takes the same arguments as ChemicalList and AsyncCTXConnection.
+    """
+
+    async def get_list_types(self):
+        """Asynchronous version of `ChemicalList.get_list_types`."""
+        return await self.ctx_call(endpoint=f"{self.KIND}/type")
+
+    async def get_all_list_meta(self, output: Optional[str] = None):
+        """Asynchronous version of `ChemicalList.get_all_list_meta`."""
+        call = self._get_all_list_meta_call(output=output)
+        return await self.ctx_call(**call)
+
+    async def get_list_meta_by_type(self, list_type: str, output: Optional[str] = None):
+        """Asynchronous version of `ChemicalList.get_list_meta_by_type`."""
+        call = self._get_list_meta_by_type_call(list_type=list_type, output=output)
+        return await self.ctx_call(**call)
+
+    async def get_list_meta_by_name(self, list_name: str, output: Optional[str] = None):
+        """Asynchronous version of `ChemicalList.get_list_meta_by_name`."""
+        call = self._get_list_meta_by_name_call(list_name=list_name, output=output)
+        return await self.ctx_call(**call)
+
+    async def filter_list_by_chemicals(
+        self, list_name: str, chem_filter: str, how: str
+    ):
+        """Asynchronous version of `ChemicalList.filter_list_by_chemicals`."""
+        call = self._filter_list_by_chemicals_call(
+            list_name=list_name, chem_filter=chem_filter, how=how
+        )
+        return await self.ctx_call(**call)
+
+    async def get_lists_containing(self, dtxsid: str):
+        """Asynchronous version of `ChemicalList.get_lists_containing`."""
+        return await self.ctx_call(**self._get_lists_containing_call(dtxsid=dtxsid))
+
+    async def get_list(self, list_name: str):
+        """Asynchronous version of `ChemicalList.get_list`."""
+        endpoint = f"{self.KIND}/chemicals/search/by-listname/"
+        return await self.ctx_call(endpoint=endpoint, query=list_name)
+
+
+class AsyncExposure(AsyncCTXConnection, Exposure):
+    """
+    Asynchronous version of Exposure.
+
+    Takes the same arguments as Exposure and AsyncCTXConnection.
+    """
+
+    async def search_cpdat(
+        self, vocab_name, dtxsid, batch_size=200, columns=None, sink=None
+    ):
+        """Asynchronous version of `Exposure.search_cpdat`."""
+        call = self._search_cpdat_call(
+            vocab_name=vocab_name, dtxsid=dtxsid, batch_size=batch_size
+        )
+        if sink is not None:
+            return await self._write_sink(sink=sink, call=call, columns=columns)
+        if self.columnar:
+            return await self._collect(call=call, columns=columns)
+        info = await self.ctx_call(**call)
+        return self._to_df(info, endpoint=call["endpoint"], columns=columns)
+
+    async def iter_search_cpdat(self, vocab_name, dtxsid, batch_size=200, columns=None):
+        """Asynchronous version of `Exposure.iter_search_cpdat`."""
+        call = self._search_cpdat_call(
+            vocab_name=vocab_name, dtxsid=dtxsid, batch_size=batch_size
+        )
+        async for info in self.iter_ctx_call(**call):
+            yield self._to_df(info, endpoint=call["endpoint"], columns=columns)
+
+    async def search_qsurs(self, dtxsid, columns=None, max_workers=None):
+        """Asynchronous version of `Exposure.search_qsurs`."""
+        call = self._search_qsurs_call(dtxsid=dtxsid)
+        if is_list_like(dtxsid):
+            info = await self._fan_out(**call, max_workers=max_workers)
+        else:
+            info = await self.ctx_call(**call)
+        return self._to_df(info, endpoint=call["endpoint"], columns=columns)
+
+    async def search_mmdb(self, by, query, aggregate=False, columns=None):
+        """Asynchronous version of `Exposure.search_mmdb`."""
+        call = self._search_mmdb_call(by=by, query=query)
+        info = await self.ctx_call(**call)
+        return self._mmdb_to_df(
+            by=by, info=info, endpoint=call["endpoint"], columns=columns
+        )
+
+    async def search_exposures(self, by, dtxsid, columns=None):
+        """Asynchronous version of `Exposure.search_exposures`."""
+        call = self._search_exposures_call(by=by, dtxsid=dtxsid)
+        info = await self.ctx_call(**call)
+        return self._to_df(info, endpoint=call["endpoint"], columns=columns)
+
+    async def search_httk(self, dtxsid, columns=None):
+        """Asynchronous version of `Exposure.search_httk`."""
+        call = self._search_httk_call(dtxsid=dtxsid)
+        info = await self.ctx_call(**call)
+        return self._to_df(info, endpoint=call["endpoint"], columns=columns)
+
+    async def get_mmdb_vocabulary(self):
+        """Asynchronous version of `Exposure.get_mmdb_vocabulary`."""
+        endpoint = f"{self.KIND}/mmdb/mediums"
+        info = await self.ctx_call(endpoint=endpoint)
+        return self._to_df(info, endpoint=endpoint)
+
+    async def get_cpdat_vocabulary(self, vocab_name):
+        """Asynchronous version of `Exposure.get_cpdat_vocabulary`."""
+        call = self._get_cpdat_vocabulary_call(vocab_name=vocab_name)
+        info = await self.ctx_call(**call)
+        return self._to_df(info, endpoint=call["endpoint"])
+
+
+class AsyncHazard(AsyncCTXConnection, Hazard):
+    """
+    Asynchronous version of Hazard.
+
+    Takes the same arguments as Hazard and AsyncCTXConnection.
+    """
+
+    async def search_toxvaldb(
+        self, by: str, dtxsid, columns: Optional[list] = None, sink=None
+    ):
+        """Asynchronous version of `Hazard.search_toxvaldb`."""
+        call = self._search_toxvaldb_call(by=by, dtxsid=dtxsid)
+        if sink is not None:
+            return await self._write_sink(sink=sink, call=call, columns=columns)
+        if self.columnar:
+            return await self._collect(call=call, columns=columns)
+        info = await self.ctx_call(**call)
+        return self._to_df(info, endpoint=call["endpoint"], columns=columns)
+
+    async def search_toxrefdb(
+        self,
+        by: str,
+        domain: str,
+        query: Iterable[str],
+        columns: Optional[list] = None,
+        sink=None,
+    ):
+        """Asynchronous version of `Hazard.search_toxrefdb`."""
+        call = self._search_toxrefdb_call(by=by, domain=domain, query=query)
+        if sink is not None:
+            return await self._write_sink(sink=sink, call=call, columns=columns)
+        if self.columnar:
+            return await self._collect(call=call, columns=columns)
+        info = await self.ctx_call(**call)
+        return self._to_df(info, endpoint=call["endpoint"], columns=columns)
+
+    async def iter_search_toxrefdb(
+        self,
+        by: str,
+        domain: str,
+        query: Iterable[str],
+        columns: Optional[list] = None,
+    ):
+        """Asynchronous version of `Hazard.iter_search_toxrefdb`."""
+        call = self._search_toxrefdb_call(by=by, domain=domain, query=query)
+        async for info in self.iter_ctx_call(**call):
+            yield self._to_df(info, endpoint=call["endpoint"], columns=columns)
+
+    async def _search_other(self, other, dtxsid, columns=None, max_workers=None):
+        call = self._search_other_call(other=other, dtxsid=dtxsid)
+        if is_list_like(dtxsid):
+            info = await self._fan_out(**call, max_workers=max_workers)
+        else:
+            info = await self.ctx_call(**call)
+        return self._to_df(info, endpoint=call["endpoint"], columns=columns)
+
+    async def search_pprtv(
+        self, dtxsid, columns: Optional[list] = None, max_workers: Optional[int] = None
+    ):
+        """Asynchronous version of `Hazard.search_pprtv`."""
+        return await self._search_other(
+            other="pprtv", dtxsid=dtxsid, columns=columns, max_workers=max_workers
+        )
+
+    async def search_hawc(
+        self, dtxsid, columns: Optional[list] = None, max_workers: Optional[int] = None
+    ):
+        """Asynchronous version of `Hazard.search_hawc`."""
+        return await self._search_other(
+            other="hawc", dtxsid=dtxsid, columns=columns, max_workers=max_workers
+        )
+
+    async def search_iris(
+        self, dtxsid, columns: Optional[list] = None, max_workers: Optional[int] = None
+    ):
+        """Asynchronous version of `Hazard.search_iris`."""
+        return await self._search_other(
+            other="iris", dtxsid=dtxsid, columns=columns, max_workers=max_workers
+        )
+
+    async def search_adme_ivive(
+        self, dtxsid, columns: Optional[list] = None, max_workers: Optional[int] = None
+    ):
+        """Asynchronous version of `Hazard.search_adme_ivive`."""
+        return await self._search_other(
+            other="adme-ivive", dtxsid=dtxsid, columns=columns, max_workers=max_workers
+        )
+
+    async def profile(
+        self,
+        dtxsid,
+        domains: Optional[Iterable[str]] = None,
+        how: str = "dict",
+        columns: Optional[list] = None,
+        max_workers: Optional[int] = None,
+    ):
+        """Asynchronous version of `Hazard.profile`."""
+        dtxsid, domains = self._profile_args(dtxsid=dtxsid, domains=domains, how=how)
+        calls = self._profile_requests(dtxsid=dtxsid, domains=domains)
+        results = await self._send_all(
+            [request for _, _, request in calls], max_workers=max_workers
+        )
+        return self._profile_results(
+            calls=calls,
+            results=results,
+            domains=domains,
+            how=how,
+            columns=columns,
+        )
+
+
+class AsyncDossier(AsyncCTXConnection, Dossier):
+    """
+    Asynchronous version of Dossier.
+
+    Takes the same arguments as Dossier and AsyncCTXConnection.
+    """
+
+    async def fetch(
+        self,
+        dtxsid,
+        datasets: Iterable[str],
+        columns: Optional[list] = None,
+        max_workers: Optional[int] = None,
+    ) -> dict:
+        """Asynchronous version of `Dossier.fetch`."""
+        plan = self.plan(dtxsid=dtxsid, datasets=datasets)
+        results = await self._send_all(plan.requests, max_workers=max_workers)
+        return self._assemble(plan=plan, results=results, columns=columns)
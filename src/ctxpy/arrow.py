@@ -0,0 +1,207 @@
+"""Build Apache Arrow tables from the records returned by the CTX APIs.
+
+Requires the optional `pyarrow` dependency (``pip install ctx-python[arrow]``).
+
+Functions
+---------
+require_pyarrow: raise an informative ImportError if pyarrow is not installed
+records_to_table: convert decoded records to a pyarrow.Table
+unify_schemas: unify the schemas of tables built from different chunks
+conform_table: cast the columns of a table to their type in a schema
+table_to_df: convert a pyarrow.Table to a pyarrow-backed DataFrame
+
+"""
+
+from typing import Optional
+
+import pandas as pd
+
+from .utils import NULL_SENTINELS
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+
+def require_pyarrow():
+    """Raise an ImportError if `pyarrow` is not installed."""
+    if pa is None:
+        raise ImportError(
+            "Arrow output requires `pyarrow`. Install it with "
+            "`pip install ctx-python[arrow]`."
+        )
+
+
+def _is_text(dtype) -> bool:
+    return pa.types.is_string(dtype) or pa.types.is_large_string(dtype)
+
+
+def _arrow_type(dtype: str):
+    ## Arrow type of a `ctxpy.schema` column type
+    return {
+        "category": pa.dictionary(pa.int32(), pa.string()),
+        "Int64": pa.int64(),
+        "float64": pa.float64(),
+        "boolean": pa.bool_(),
+    }[dtype]
+
+
+def _column(values: list, dtype: Optional[str] = None):
+    ## Build the column with its declared type if it has one and the values fit it.
+    ## Otherwise infer the type from the values. Columns that mix types, e.g. numbers
+    ## with "-" placeholders, are retried without the placeholders, then kept as text.
+    if dtype is not None:
+        try:
+            return pa.array(
+                [None if v in NULL_SENTINELS else v for v in values],
+                type=_arrow_type(dtype),
+            )
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        pass
+    values = [None if v in NULL_SENTINELS else v for v in values]
+    try:
+        return pa.array(values)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.array(
+            [None if v is None else str(v) for v in values], type=pa.string()
+        )
+
+
+def _nullify(column):
+    ## Replace the NULL_SENTINELS in a text column with nulls
+    if not _is_text(column.type):
+        return column
+    mask = pc.is_in(column, value_set=pa.array(NULL_SENTINELS, type=column.type))
+    if not pc.any(mask).as_py():
+        return column
+    return pc.if_else(mask, pa.scalar(None, type=column.type), column)
+
+
+def records_to_table(
+    records, schema: Optional[dict] = None, columns: Optional[list] = None
+) -> "pa.Table":
+    """
+    Convert decoded API records to a pyarrow.Table, with missing values as nulls.
+
+    Columns are built directly from the records, one at a time, without an
+    intermediate DataFrame. Every key found in any record becomes a column, in order
+    of first appearance (or only the fields in `columns`), and the "-" and ""
+    placeholders in text columns become nulls.
+
+    Parameters
+    ----------
+    records : list of dict or dict
+        Decoded response of an API call. A single dict is treated as one record.
+    schema : dict or None, default None
+        Column types, keyed on field name (see `ctxpy.schema`). Columns named in it
+        are built with their declared type instead of an inferred one; "category"
+        columns become dictionary-encoded.
+    columns : list of str or None, default None
+        Fields to keep, in order. Other fields are never read from the records.
+
+    Returns
+    -------
+    pyarrow.Table
+    """
+    require_pyarrow()
+    if isinstance(records, dict):
+        records = [records]
+    schema = schema or {}
+    if columns is None:
+        names = list(dict.fromkeys(key for record in records for key in record))
+    else:
+        names = list(columns)
+    return pa.table(
+        {
+            name: _nullify(
+                _column([record.get(name) for record in records], schema.get(name))
+            )
+            for name in names
+        }
+    )
+
+
+def _merge_fields(field, other):
+    ## Field of a type both fields' values fit, text if there is none
+    if field.type == other.type:
+        return field
+    try:
+        return pa.unify_schemas(
+            [pa.schema([field]), pa.schema([other])], promote_options="permissive"
+        ).field(0)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return pa.field(field.name, pa.string())
+
+
+def unify_schemas(schemas) -> "pa.Schema":
+    """
+    Unify the schemas of tables built from different chunks of records.
+
+    Each chunk's column types are inferred from its own records, so the same field
+    can be, e.g., int64 in one chunk and string in the next. Fields whose types
+    differ are given a type both fit (e.g. float64 for int64 and float64), or string
+    if there is none.
+
+    Parameters
+    ----------
+    schemas : iterable of pyarrow.Schema
+
+    Returns
+    -------
+    pyarrow.Schema
+        Every field found in `schemas`, in order of first appearance.
+    """
+    fields = {}
+    for schema in schemas:
+        for field in schema:
+            previous = fields.get(field.name)
+            fields[field.name] = (
+                field if previous is None else _merge_fields(previous, field)
+            )
+    return pa.schema(list(fields.values()))
+
+
+def _cast(column, dtype):
+    try:
+        return column.cast(dtype)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError):
+        if not _is_text(dtype):
+            raise
+    ## e.g. lists or structs, which Arrow can't cast to text
+    return pa.array(
+        [None if v is None else str(v) for v in column.to_pylist()], type=dtype
+    )
+
+
+def conform_table(table, schema) -> "pa.Table":
+    """
+    Cast the columns of `table` to their type in `schema`.
+
+    Columns not in `schema` are kept as they are, and fields of `schema` missing from
+    `table` are not added.
+
+    Returns
+    -------
+    pyarrow.Table
+    """
+    for i, field in enumerate(table.schema):
+        if field.name not in schema.names:
+            continue
+        dtype = schema.field(field.name).type
+        if field.type != dtype:
+            table = table.set_column(
+                i, pa.field(field.name, dtype), _cast(table.column(i), dtype)
+            )
+    return table
+
+
+def table_to_df(table) -> pd.DataFrame:
+    """Convert a pyarrow.Table to a DataFrame backed by pandas.ArrowDtype columns."""
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
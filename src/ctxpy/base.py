@@ -4,11 +4,23 @@ Classes
 -------
 CTXConnection: connect and interact with CTX APIs
 ResponseTransformer: covert API returns to pandas DataFrame
+RawResponse: reference to a raw API response that pandas does not copy
+ColumnBuffer: per-column buffers that the chunks of a batched call are appended to
+
+Functions
+---------
+get_session: retrieve a pooled, keep-alive session shared across connections
+normalize_nulls: replace the APIs' missing-value placeholders with pd.NA
 
 """
 
 import json
+import threading
 import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 from pathlib import Path
 from typing import Callable, Iterable, Optional, Union
 from urllib.parse import quote
@@ -16,8 +28,99 @@ from urllib.parse import quote
 import pandas as pd
 import requests
 from pandas.api.types import is_list_like
+from requests.adapters import HTTPAdapter
+
+from .arrow import (
+    conform_table,
+    pa,
+    records_to_table,
+    require_pyarrow,
+    table_to_df,
+    unify_schemas,
+)
+from .batching import AdaptiveBatchSizer
+from .cache import ResponseCache
+from .cassette import Cassette
+from .checkpoint import DEFAULT_CHECKPOINT_DIR, JobCheckpoint
+from .exceptions import BatchChunkError
+from .ratelimit import RateLimiter, get_rate_limiter
+from .retry import RetryPolicy, RetrySummary
+from .schema import apply_schema, get_schema
+from .streaming import JSONRecordParser, iter_records
+from .utils import NULL_SENTINELS, chunker, read_env
+
+## Output formats of the DataFrame-returning methods
+DTYPE_BACKENDS = ("numpy", "pyarrow", "pyarrow_table")
+
+## Sessions are shared process-wide, one per unique pool configuration
+_SESSIONS = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def get_session(
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+    keep_alive: bool = True,
+) -> requests.Session:
+    """
+    Get the process-wide HTTP session for a given connection pool configuration.
+
+    Every CTXConnection (and so every Chemical, ChemicalList, Exposure, and Hazard
+    object) created with the same pool settings re-uses the same session, so TCP and
+    TLS connections to the API server are kept open and re-used between calls.
+
+    Parameters
+    ----------
+    pool_connections : int, default 10
+        Number of per-host connection pools to cache.
+    pool_maxsize : int, default 10
+        Maximum number of connections kept open to a single host.
+    keep_alive : bool, default True
+        If False, ask the server to close the connection after every response.
+
+    Returns
+    -------
+    requests.Session
+    """
+    key = (pool_connections, pool_maxsize, keep_alive)
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(key)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=pool_connections, pool_maxsize=pool_maxsize
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            if not keep_alive:
+                session.headers["Connection"] = "close"
+            _SESSIONS[key] = session
+    return session
+
+
+def normalize_nulls(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Replace None, NaN and the `NULL_SENTINELS` with pd.NA, in place.
 
-from .utils import chunker, read_env
+    Only text and object columns are scanned, one vectorized mask per column, and
+    only the columns that hold a missing value are replaced. Numeric columns are left
+    as they are.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The same DataFrame, for chaining.
+    """
+    for name, col in df.items():
+        if col.dtype == object:
+            mask = col.isna() | col.isin(NULL_SENTINELS)
+        elif isinstance(col.dtype, pd.StringDtype):
+            mask = col.isin(NULL_SENTINELS)
+        else:
+            continue
+        if mask.any():
+            df[name] = col.where(~mask, pd.NA)
+    return df
 
 
 class CTXConnection:
@@ -33,11 +136,85 @@ class CTXConnection:
     env_path : str or None, default None
         The .env file location. Will default to a user's home directory if no value is
         provided.
+    session : requests.Session or None, default None
+        Session used to send requests. If None, the process-wide session for the
+        given pool settings is used (see `get_session`).
+    pool_connections : int, default 10
+        Number of per-host connection pools to cache. Ignored if `session` is given.
+    pool_maxsize : int, default 10
+        Maximum number of connections kept open to a single host. Ignored if
+        `session` is given.
+    keep_alive : bool, default True
+        Whether connections are kept open between calls. Ignored if `session` is
+        given.
+    max_workers : int, default 1
+        Number of chunks of a batched call that are sent at the same time. The
+        default sends chunks one after another.
+    rate_limiter : RateLimiter or None, default None
+        Limiter every request waits on before being sent. If None, the process-wide
+        limiter is used (see `ctxpy.ratelimit.set_rate_limit`).
+    retry_policy : RetryPolicy or None, default None
+        When to re-send requests that fail with a transient error. If None, a
+        default RetryPolicy (3 attempts) is used.
+    cache : ResponseCache or None, default None
+        Persistent cache responses are served from and stored in. Responses are not
+        cached by default.
+    stream : bool, default False
+        Whether response bodies are decoded incrementally as they are received,
+        instead of after the whole body has been read. The parsed result is still
+        returned whole, but the raw and decoded text of the body are never held in
+        full next to it, which lowers peak memory use on large responses (e.g. MMDB
+        searches by medium).
+    stream_chunk_size : int, default 65536
+        Bytes read from the connection at a time when `stream` is True.
+    checkpoint_dir : str or pathlib.Path or None, default None
+        Directory the finished chunks of batched calls made inside `job` are saved
+        to. Defaults to ~/.cache/ctxpy/jobs.
+    host : str or None, default None
+        Base URL of the API, e.g. that of a `ctxpy.mock_server.MockCTXServer`.
+        Defaults to the host in the .env file, or the public CTX APIs if
+        `x_api_key` is given.
+    cassette : Cassette or None, default None
+        Cassette responses are recorded to or replayed from (see
+        `ctxpy.cassette.Cassette`). Ignored if `session` is given.
+    keep_response : bool, default False
+        Whether DataFrames returned by this connection keep the raw response, as a
+        `RawResponse` in `df.attrs["response"]`. Off by default, as it keeps the whole
+        response in memory for as long as the DataFrame, or any frame derived from
+        it, is alive.
+    dtype_backend : {"numpy", "pyarrow", "pyarrow_table"}, default "numpy"
+        What DataFrame-returning methods build from the records. "numpy" gives
+        DataFrames with NumPy and object columns, "pyarrow" DataFrames with
+        `pandas.ArrowDtype` columns, and "pyarrow_table" a `pyarrow.Table`. The
+        pyarrow options need the optional `pyarrow` dependency and build the result
+        straight from the records, without an intermediate object-dtype frame.
+    use_schemas : bool, default False
+        Whether DataFrame-returning methods cast columns to the types declared for
+        their endpoint in `ctxpy.schema`, e.g. categoricals for repeated text.
+    columnar : bool, default False
+        Whether batched DataFrame-returning methods append each chunk to per-column
+        buffers as it arrives (see `ColumnBuffer`), instead of collecting every
+        record and converting them at the end. Lowers peak memory use on large
+        batches. The raw response is not kept, whatever `keep_response` is.
+    batch_sizer : AdaptiveBatchSizer or None, default None
+        Sizer the chunks of batched calls are sized by, from the response times and
+        sizes observed on each endpoint, instead of by `batch_size`. This includes
+        the `iter_*` methods and calls made with `sink` or `columnar`. List-like
+        queries are always batched, however short they are. Chunks the server
+        rejects as too large, or that time out, are split in half and sent again.
+        Not used inside `job`, whose chunks must be the same on every run.
 
     Attributes
     ----------
     headers : dict
         A dictionary of information used to make an API call
+    session : requests.Session
+        The pooled session requests are sent through
+    retry_summary : RetrySummary
+        Attempts and retries made during the most recent call
+    failed_items : dict
+        Identifiers whose request failed during the most recent per-identifier
+        call (e.g. `Exposure.search_qsurs` with a list), mapped to the error
 
     Methods
     -------
@@ -52,6 +229,24 @@ class CTXConnection:
         self,
         x_api_key: Optional[str] = None,
         env_path: Optional[Union[str, Path]] = None,
+        session: Optional[requests.Session] = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
+        max_workers: int = 1,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        cache: Optional[ResponseCache] = None,
+        stream: bool = False,
+        stream_chunk_size: int = 65536,
+        checkpoint_dir: Optional[Union[str, Path]] = None,
+        host: Optional[str] = None,
+        cassette: Optional[Cassette] = None,
+        keep_response: bool = False,
+        dtype_backend: str = "numpy",
+        use_schemas: bool = False,
+        columnar: bool = False,
+        batch_sizer: Optional[AdaptiveBatchSizer] = None,
     ):
         if isinstance(x_api_key, str):
             ## Need this here in case there is no .env file
@@ -66,6 +261,133 @@ class CTXConnection:
                 "x-api-key": config["ctx_api_x_api_key"],
             }
 
+        if host is not None:
+            self.host = host if host.endswith("/") else f"{host}/"
+
+        if dtype_backend not in DTYPE_BACKENDS:
+            raise ValueError(
+                f"Value {dtype_backend} is invalid option for argument "
+                "`dtype_backend`."
+            )
+        if dtype_backend != "numpy":
+            require_pyarrow()
+        self.dtype_backend = dtype_backend
+        self.use_schemas = use_schemas
+        self.columnar = columnar
+        self.batch_sizer = batch_sizer
+        self.keep_response = keep_response
+        self.cassette = cassette
+        if (session is None) and (cassette is not None):
+            session = cassette.session()
+        if session is None:
+            session = get_session(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                keep_alive=keep_alive,
+            )
+        self.session = session
+        self.max_workers = max_workers
+        if rate_limiter is None:
+            rate_limiter = get_rate_limiter()
+        self.rate_limiter = rate_limiter
+        if retry_policy is None:
+            retry_policy = RetryPolicy()
+        self.retry_policy = retry_policy
+        self.retry_summary = RetrySummary()
+        self.failed_items = {}
+        self.cache = cache
+        self.stream = stream
+        self.stream_chunk_size = stream_chunk_size
+        if checkpoint_dir is None:
+            checkpoint_dir = DEFAULT_CHECKPOINT_DIR
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.job_id = None
+
+    def _to_df(
+        self, info, endpoint: Optional[str] = None, columns: Optional[list] = None
+    ):
+        ## DataFrame (or Table) of a response, in the connection's dtype backend
+        schema = None
+        if self.use_schemas and (endpoint is not None):
+            schema = get_schema(endpoint)
+        transformer = ResponseTransformer(info)
+        if self.dtype_backend == "pyarrow_table":
+            return transformer.to_arrow(schema=schema, columns=columns)
+        return transformer.to_df(
+            keep_response=self.keep_response,
+            dtype_backend=self.dtype_backend,
+            schema=schema,
+            columns=columns,
+        )
+
+    def _write_sink(self, sink, call: dict, columns: Optional[list] = None):
+        ## Write each chunk of a call to `sink` as it arrives, and return the sink
+        schema = get_schema(call["endpoint"]) if self.use_schemas else None
+        for info in self.iter_ctx_call(**call):
+            sink.write(records_to_table(info, schema=schema, columns=columns))
+        return sink
+
+    def _collect(self, call: dict, columns: Optional[list] = None):
+        ## Build the DataFrame (or Table) of a call column by column, chunk by chunk
+        buffer = ColumnBuffer(
+            dtype_backend=self.dtype_backend,
+            schema=get_schema(call["endpoint"]) if self.use_schemas else None,
+            columns=columns,
+        )
+        for info in self.iter_ctx_call(**call):
+            buffer.write(info)
+        if self.dtype_backend == "pyarrow_table":
+            return buffer.to_arrow()
+        return buffer.to_df()
+
+    @contextmanager
+    def job(self, job_id: str):
+        """
+        Checkpoint the batched calls made inside the `with` block under `job_id`.
+
+        Each finished chunk of a batched call is saved to `checkpoint_dir`, along
+        with a manifest of the call's chunks. If the call fails part way through,
+        re-running the same call under the same `job_id` loads the finished chunks
+        from disk and only requests the remaining ones. Results of calls made in a
+        job are not cached per identifier.
+
+        Parameters
+        ----------
+        job_id : str
+            Name of the job, used as a directory name under `checkpoint_dir`.
+
+        Examples
+        --------
+        >>> chem = ctx.Chemical(checkpoint_dir='checkpoints')
+        >>> with chem.job('all-details'):
+        ...     info = chem.details(by='batch-dtxsid', query=dtxsids)
+        """
+        previous = self.job_id
+        self.job_id = job_id
+        try:
+            yield self
+        finally:
+            self.job_id = previous
+
+    def _start_checkpoint(
+        self,
+        endpoint: str,
+        chunks: list,
+        params: Optional[dict] = None,
+        bracketed: bool = True,
+    ) -> Optional[JobCheckpoint]:
+        ## Checkpoint of a batched call, if it is being made inside `job`
+        if self.job_id is None:
+            return None
+        return JobCheckpoint(
+            directory=self.checkpoint_dir,
+            job_id=self.job_id,
+            endpoint=endpoint,
+            chunks=chunks,
+            params=params,
+            bracketed=bracketed,
+        )
+
     def _format_post_query(self, query: str, bracketed: bool = True):
 
         query = [quote(q, safe="") for q in query]
@@ -120,19 +442,19 @@ class CTXConnection:
             data = None
         return url, data
 
-    def _request(
+    def _prepare_request(
         self,
         endpoint: str,
         query: Optional[str] = None,
-        params: Optional[dict] = None,
         bracketed: bool = True,
         quote_method: Union[str, Callable] = "default",
     ):
-
         method = self._get_request_method(query=query)
 
+        ## Copy headers so concurrent calls on a shared session don't collide
+        headers = dict(self.headers)
         if (method in {"POST", "PUT"}):
-            self.headers["content-type"] = "application/json"
+            headers["content-type"] = "application/json"
 
         query = self._get_quoted_query(
             query=query, quote_method=quote_method, bracketed=bracketed
@@ -141,23 +463,134 @@ class CTXConnection:
         url, data = self._get_url_and_data(
             method=method, endpoint=endpoint, query=query
         )
+        return method, url, data, headers
+
+    def _decode_stream(self, response):
+        ## Parse the body record by record as it is read off the connection. Every
+        ## parsed record is kept until the body ends, but only one chunk of the raw
+        ## bytes and decoded text is held at a time, rather than all of both
+        parser = JSONRecordParser()
+        try:
+            records = list(
+                iter_records(
+                    response.iter_content(chunk_size=self.stream_chunk_size), parser
+                )
+            )
+        finally:
+            response.close()
+        return parser.assemble(records)
+
+    def _request(
+        self,
+        endpoint: str,
+        query: Optional[str] = None,
+        params: Optional[dict] = None,
+        bracketed: bool = True,
+        quote_method: Union[str, Callable] = "default",
+        stats: Optional[dict] = None,
+    ):
+
+        ## Batch searches cached per identifier are handled by ctx_call
+        cache = self.cache
+        if self._caches_items(endpoint=endpoint, query=query):
+            cache = None
+
+        if cache is not None:
+            key = cache.key(
+                host=self.host, endpoint=endpoint, query=query, params=params
+            )
+            body = cache.get(key)
+            if body is not None:
+                return json.loads(body.decode("utf-8"))
+
+        method, url, data, headers = self._prepare_request(
+            endpoint=endpoint,
+            query=query,
+            bracketed=bracketed,
+            quote_method=quote_method,
+        )
+
+        send = partial(
+            self.session.request,
+            method=method,
+            url=url,
+            data=data,
+            headers=headers,
+            params=params,
+        )
+        if self.stream:
+            send = partial(send, stream=True)
 
         ## Try the request, raise errors if there are any
         try:
-            self.response = requests.request(
-                method=method, url=url, data=data, headers=self.headers, params=params
+            response = self.retry_policy.send(
+                method=method,
+                send=send,
+                rate_limiter=self.rate_limiter,
+                summary=self.retry_summary,
             )
-            self.response.raise_for_status()
+            self.response = response
+            try:
+                response.raise_for_status()
+            except requests.exceptions.HTTPError:
+                ## The body of a streamed response isn't read on error; release its
+                ## connection back to the pool
+                if self.stream:
+                    response.close()
+                raise
         except requests.exceptions.RequestException as err:
             raise err
 
         try:
-            info = json.loads(self.response.content.decode("utf-8"))
+            if self.stream:
+                info = self._decode_stream(response)
+            else:
+                info = json.loads(response.content.decode("utf-8"))
         except json.JSONDecodeError as err:
             raise err
 
+        if cache is not None:
+            body = json.dumps(info).encode("utf-8") if self.stream else response.content
+            cache.set(key=key, endpoint=endpoint, body=body)
+
+        if stats is not None:
+            stats.update(self._response_stats(response))
         return info
 
+    def _response_stats(self, response) -> dict:
+        ## Seconds the server took to respond, and size of the body if it is known
+        if self.stream:
+            nbytes = int(response.headers.get("content-length") or 0) or None
+        else:
+            nbytes = len(response.content)
+        return {"seconds": response.elapsed.total_seconds(), "bytes": nbytes}
+
+    def _fetch_chunk(
+        self,
+        index: int,
+        chunk: list,
+        endpoint: str,
+        params: Optional[dict] = None,
+        bracketed: bool = True,
+        quote_method: Union[str, Callable] = "default",
+        checkpoint: Optional[JobCheckpoint] = None,
+    ):
+        if (checkpoint is not None) and checkpoint.is_done(index):
+            return checkpoint.load(index)
+        try:
+            records = self._request(
+                endpoint=endpoint,
+                query=chunk,
+                params=params,
+                bracketed=bracketed,
+                quote_method=quote_method,
+            )
+        except Exception as err:
+            raise BatchChunkError(index=index, chunk=chunk, error=err) from err
+        if checkpoint is not None:
+            checkpoint.save(index, records)
+        return records
+
     def _batch(
         self,
         endpoint: str,
@@ -166,28 +599,341 @@ class CTXConnection:
         params: Optional[dict] = None,
         bracketed: bool = True,
         quote_method: Union[str, Callable] = "default",
+        max_workers: Optional[int] = None,
     ):
         """
         There are some inconsistencies in how to provide 'batch' data to the API.
         Sometimes the list of identifiers needs to be a bracketed list, other times it
         needs to be a new-line separated, unbracketed list. The `bracketed` argument
         here will help the users specify this.
+
+        Chunks are sent on a thread pool of up to `max_workers` threads (defaults to
+        the connection's `max_workers`). Results are always returned in chunk order.
+        If a chunk fails, the remaining chunks are cancelled and a BatchChunkError
+        carrying the failed chunk's index is raised. Inside `job`, finished chunks are
+        checkpointed and chunks finished by an earlier run are not requested again.
+        Otherwise, if the connection has a `batch_sizer`, chunks are sized by it.
         """
 
-        ## Remove duplicated DTXSIDs
-        query = list(set(query))
+        if max_workers is None:
+            max_workers = self.max_workers
+
+        ## Remove duplicated DTXSIDs, keeping the order they were given in
+        query = list(dict.fromkeys(query))
+        if (self.batch_sizer is not None) and (self.job_id is None):
+            info = []
+            for records in self._iter_adaptive(
+                fetch=self._fetch_split,
+                endpoint=endpoint,
+                query=query,
+                batch_size=batch_size,
+                params=params,
+                bracketed=bracketed,
+                quote_method=quote_method,
+                max_workers=max_workers,
+            ):
+                info.extend(records)
+            return info
+        chunks = list(chunker(query, batch_size))
+
+        kwargs = {
+            "endpoint": endpoint,
+            "params": params,
+            "bracketed": bracketed,
+            "quote_method": quote_method,
+            "checkpoint": self._start_checkpoint(
+                endpoint=endpoint, chunks=chunks, params=params, bracketed=bracketed
+            ),
+        }
+        if (max_workers <= 1) or (len(chunks) <= 1):
+            results = [
+                self._fetch_chunk(index=i, chunk=chunk, **kwargs)
+                for i, chunk in enumerate(chunks)
+            ]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(max_workers, len(chunks))
+            ) as executor:
+                futures = [
+                    executor.submit(self._fetch_chunk, index=i, chunk=chunk, **kwargs)
+                    for i, chunk in enumerate(chunks)
+                ]
+                try:
+                    results = [future.result() for future in futures]
+                except BatchChunkError:
+                    for future in futures:
+                        future.cancel()
+                    raise
 
-        chunks = []
-        for chunk in chunker(query, batch_size):
-            ## TODO: Check that suffix is re-written on each loop,
-            ## not appended to
-            chunks.extend(
-                self._request(endpoint=endpoint, query=query, bracketed=bracketed)
+        info = []
+        for result in results:
+            info.extend(result)
+
+        return info
+
+    def _fetch_split(
+        self,
+        index: int,
+        chunk: list,
+        endpoint: str,
+        params: Optional[dict] = None,
+        bracketed: bool = True,
+        quote_method: Union[str, Callable] = "default",
+    ):
+        ## Fetch a chunk of an adaptive batch, splitting it in half for as long as the
+        ## server rejects it as too large, and tell the sizer how long it took
+        stats = {}
+        try:
+            records = self._request(
+                endpoint=endpoint,
+                query=chunk,
+                params=params,
+                bracketed=bracketed,
+                quote_method=quote_method,
+                stats=stats,
             )
+        except Exception as err:
+            if (len(chunk) <= 1) or (not self.batch_sizer.should_split(err)):
+                raise BatchChunkError(index=index, chunk=chunk, error=err) from err
+            stats = None
 
-        return chunks
+        if stats is None:
+            ## Only blame the chunk's size if its halves are answered. If they fail
+            ## down to a single identifier, that identifier's error is raised.
+            half = len(chunk) // 2
+            kwargs = {
+                "index": index,
+                "endpoint": endpoint,
+                "params": params,
+                "bracketed": bracketed,
+                "quote_method": quote_method,
+            }
+            records = self._fetch_split(chunk=chunk[:half], **kwargs)
+            records = records + self._fetch_split(chunk=chunk[half:], **kwargs)
+            self.batch_sizer.split(endpoint=endpoint, size=len(chunk))
+            return records
+        if stats:
+            self.batch_sizer.record(
+                endpoint=endpoint,
+                size=len(chunk),
+                seconds=stats["seconds"],
+                nbytes=stats["bytes"],
+            )
+        return records
 
-    def ctx_call(
+    def _iter_adaptive(
+        self,
+        fetch: Callable,
+        endpoint: str,
+        query: list,
+        batch_size: int,
+        params: Optional[dict] = None,
+        bracketed: bool = True,
+        quote_method: Union[str, Callable] = "default",
+        max_workers: int = 1,
+    ):
+        ## Yield the records of each chunk of an adaptive batch, in chunk order.
+        ## Chunks are sized by `batch_sizer` just before they are sent, in rounds of
+        ## up to `max_workers` chunks, so each round uses what the ones before it
+        ## learned. `batch_size` is only the size of the endpoint's first chunks.
+        fetch = partial(
+            fetch,
+            endpoint=endpoint,
+            params=params,
+            bracketed=bracketed,
+            quote_method=quote_method,
+        )
+        max_workers = max(1, max_workers)
+        start = 0
+        index = 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while start < len(query):
+                chunks = []
+                while (start < len(query)) and (len(chunks) < max_workers):
+                    size = self.batch_sizer.size(endpoint=endpoint, default=batch_size)
+                    chunks.append(query[start : start + size])
+                    start += size
+                indices = range(index, index + len(chunks))
+                yield from executor.map(fetch, indices, chunks)
+                index += len(chunks)
+
+    @staticmethod
+    def _tag_records(records, item: str, key: str = "dtxsid") -> list:
+        ## Records of a per-identifier request, with the identifier as their first field
+        if isinstance(records, dict):
+            records = [records]
+        return [
+            {key: item, **record}
+            if isinstance(record, dict) and (key not in record)
+            else record
+            for record in records
+        ]
+
+    def _send_one(self, request: dict):
+        ## Send one request of `_send_all`, through the per-identifier cache if it
+        ## applies
+        endpoint, query = request["endpoint"], request.get("query")
+        if not self._caches_items(endpoint=endpoint, query=query):
+            return self._request(**request)
+
+        params = request.get("params")
+        query, hits, misses = self._get_cached_items(
+            endpoint=endpoint, query=query, params=params
+        )
+        records = self._request(**{**request, "query": misses}) if misses else []
+        return self._merge_cached_items(
+            endpoint=endpoint,
+            query=query,
+            params=params,
+            hits=hits,
+            misses=misses,
+            records=records,
+        )
+
+    def _send(self, request: dict):
+        ## Send one request of `_send_all`, returning its result and error, if any
+        try:
+            return self._send_one(request), None
+        except Exception as err:
+            return None, err
+
+    def _send_all(self, calls: list, max_workers: Optional[int] = None) -> list:
+        """
+        Send independent requests on one thread pool, without stopping at failures.
+
+        Parameters
+        ----------
+        calls : list of dict
+            Keyword arguments of each request, as for `_request`.
+        max_workers : int or None, default None
+            Number of requests sent at the same time, all paced by the connection's
+            rate limiter. Defaults to the connection's `max_workers`.
+
+        Returns
+        -------
+        list of tuple
+            The decoded response and the error (None if there was none) of each
+            request, in the order of `calls`.
+        """
+
+        if max_workers is None:
+            max_workers = self.max_workers
+
+        if (max_workers <= 1) or (len(calls) <= 1):
+            return [self._send(request) for request in calls]
+        with ThreadPoolExecutor(
+            max_workers=min(max_workers, len(calls))
+        ) as executor:
+            return list(executor.map(self._send, calls))
+
+    def _warn_failed_items(self, errors: dict):
+        ## Keep the errors of a per-identifier call and warn about them
+        self.failed_items = {item: err for item, err in errors.items() if err}
+        if self.failed_items:
+            warnings.warn(
+                f"Requests for {len(self.failed_items)} of {len(errors)} identifiers "
+                "failed; see `failed_items`."
+            )
+
+    def _fan_out(
+        self,
+        endpoint: str,
+        query: Iterable[str],
+        params: Optional[dict] = None,
+        key: str = "dtxsid",
+        max_workers: Optional[int] = None,
+    ) -> list:
+        """
+        Send one GET per identifier, for endpoints without a batch (POST) search.
+
+        Requests are sent on a thread pool of up to `max_workers` threads (defaults to
+        the connection's `max_workers`), each paced by the connection's rate limiter.
+        Every record is tagged with the identifier it was requested for, as its `key`
+        field, and results are returned in the order the identifiers were given. A
+        failed identifier doesn't stop the others: its error is kept in
+        `failed_items` and a warning is raised once all requests have finished.
+        """
+
+        ## Remove duplicated DTXSIDs, keeping the order they were given in
+        query = list(dict.fromkeys(query))
+        results = self._send_all(
+            [{"endpoint": endpoint, "query": q, "params": params} for q in query],
+            max_workers=max_workers,
+        )
+
+        info = []
+        for q, (records, err) in zip(query, results):
+            if err is None:
+                info.extend(self._tag_records(records, item=q, key=key))
+        self._warn_failed_items({q: err for q, (_, err) in zip(query, results)})
+        return info
+
+    def _caches_items(self, endpoint: str, query) -> bool:
+        ## Whether results of this (batch) search are cached per identifier
+        return (
+            (self.cache is not None)
+            and (is_list_like(query))
+            and (not isinstance(query, dict))
+            and (self.cache.item_field(endpoint) is not None)
+            and (self.job_id is None)
+        )
+
+    def _get_cached_items(self, endpoint: str, query, params: Optional[dict] = None):
+        ## Split a batch query into cached results and identifiers still to fetch
+        query = list(dict.fromkeys(query))
+        keys = {
+            q: self.cache.item_key(
+                host=self.host, endpoint=endpoint, item=q, params=params
+            )
+            for q in query
+        }
+        found = self.cache.get_many(list(keys.values()))
+        hits = {
+            q: json.loads(found[key].decode("utf-8"))
+            for q, key in keys.items()
+            if key in found
+        }
+        misses = [q for q in query if q not in hits]
+        return query, hits, misses
+
+    def _merge_cached_items(
+        self,
+        endpoint: str,
+        query: list,
+        params: Optional[dict],
+        hits: dict,
+        misses: list,
+        records: list,
+    ):
+        ## Cache freshly fetched records per identifier and merge them with the hits
+        field = self.cache.item_field(endpoint)
+        fetched = {q: [] for q in misses}
+        for record in records:
+            item = record.get(field) if isinstance(record, dict) else None
+            if item not in fetched:
+                ## Can't tell which identifier the record belongs to, so don't cache
+                info = [r for q in query if q in hits for r in hits[q]]
+                info.extend(records)
+                return info
+            fetched[item].append(record)
+
+        self.cache.set_many(
+            {
+                self.cache.item_key(
+                    host=self.host, endpoint=endpoint, item=q, params=params
+                ): json.dumps(recs).encode("utf-8")
+                for q, recs in fetched.items()
+            },
+            endpoint=endpoint,
+        )
+        hits.update(fetched)
+
+        info = []
+        for q in query:
+            info.extend(hits[q])
+        return info
+
+    def _call(
         self,
         endpoint: str,
         query: Optional[str] = None,
@@ -196,8 +942,20 @@ class CTXConnection:
         batched: bool = False,
         batch_size: int = 200,
         quote_method="default",
+        max_workers: Optional[int] = None,
     ):
 
+        if (not batched) and (is_list_like(query)) and (not isinstance(query, dict)):
+            if self.batch_sizer is not None:
+                ## The sizer decides how many identifiers are sent at once
+                batched = True
+            elif len(query) > batch_size:
+                warnings.warn(
+                    "Length of query's iterable is larger than `batch_size`, "
+                    "performing batched search."
+                )
+                batched = True
+
         if batched:
             info = self._batch(
                 endpoint=endpoint,
@@ -206,22 +964,9 @@ class CTXConnection:
                 bracketed=bracketed,
                 batch_size=batch_size,
                 quote_method=quote_method,
+                max_workers=max_workers,
             )
         else:
-            if (pd.api.types.is_list_like(query)) and (len(query) > batch_size):
-                warnings.warn(
-                    "Length of query's iterable is larger than `batch_size`, "
-                    "performing batched search."
-                )
-                info = self._batch(
-                    endpoint=endpoint,
-                    query=query,
-                    params=params,
-                    bracketed=bracketed,
-                    batch_size=batch_size,
-                    quote_method=quote_method,
-                )
-
             info = self._request(
                 endpoint=endpoint,
                 query=query,
@@ -231,6 +976,212 @@ class CTXConnection:
             )
         return info
 
+    def ctx_call(
+        self,
+        endpoint: str,
+        query: Optional[str] = None,
+        params: Optional[dict] = None,
+        bracketed: bool = True,
+        batched: bool = False,
+        batch_size: int = 200,
+        quote_method="default",
+        max_workers: Optional[int] = None,
+    ):
+
+        self.retry_summary = RetrySummary()
+        kwargs = {
+            "endpoint": endpoint,
+            "params": params,
+            "bracketed": bracketed,
+            "batched": batched,
+            "batch_size": batch_size,
+            "quote_method": quote_method,
+            "max_workers": max_workers,
+        }
+
+        if not self._caches_items(endpoint=endpoint, query=query):
+            return self._call(query=query, **kwargs)
+
+        ## Only request the identifiers that aren't cached already
+        query, hits, misses = self._get_cached_items(
+            endpoint=endpoint, query=query, params=params
+        )
+        records = self._call(query=misses, **kwargs) if misses else []
+        return self._merge_cached_items(
+            endpoint=endpoint,
+            query=query,
+            params=params,
+            hits=hits,
+            misses=misses,
+            records=records,
+        )
+
+    def _fetch_items(
+        self,
+        index: int,
+        chunk: list,
+        endpoint: str,
+        params: Optional[dict] = None,
+        bracketed: bool = True,
+        quote_method: Union[str, Callable] = "default",
+        checkpoint: Optional[JobCheckpoint] = None,
+    ):
+        ## Fetch one chunk, going through the per-identifier cache if it applies
+        kwargs = {
+            "endpoint": endpoint,
+            "params": params,
+            "bracketed": bracketed,
+            "quote_method": quote_method,
+        }
+        fetch = partial(self._fetch_chunk, checkpoint=checkpoint)
+        if (self.batch_sizer is not None) and (checkpoint is None):
+            fetch = self._fetch_split
+        if not self._caches_items(endpoint=endpoint, query=chunk):
+            return fetch(index=index, chunk=chunk, **kwargs)
+
+        chunk, hits, misses = self._get_cached_items(
+            endpoint=endpoint, query=chunk, params=params
+        )
+        records = fetch(index=index, chunk=misses, **kwargs) if misses else []
+        return self._merge_cached_items(
+            endpoint=endpoint,
+            query=chunk,
+            params=params,
+            hits=hits,
+            misses=misses,
+            records=records,
+        )
+
+    def iter_ctx_call(
+        self,
+        endpoint: str,
+        query: Optional[str] = None,
+        params: Optional[dict] = None,
+        bracketed: bool = True,
+        batched: bool = True,
+        batch_size: int = 200,
+        quote_method="default",
+        max_workers: Optional[int] = None,
+    ):
+        """
+        Make a call like `ctx_call`, yielding the results of each chunk as it arrives.
+
+        List-like queries are split into chunks of `batch_size`, and each chunk's
+        records are yielded in chunk order as soon as they (and the chunks before
+        them) have been received. At most `max_workers` chunks (defaults to the
+        connection's `max_workers`) are in flight or waiting to be yielded, so memory
+        use is bounded no matter how long the query is. If the connection has a
+        `batch_sizer` (and the call isn't made inside `job`), chunks are sized by it
+        instead, and sent in rounds of `max_workers`. Any other query is sent as a
+        single request whose result is yielded once. `batched` is accepted so the
+        same keyword arguments can be passed as to `ctx_call`, but list-like queries
+        are always batched.
+
+        Yields
+        ------
+        list
+            The records returned for one chunk of the query.
+        """
+
+        self.retry_summary = RetrySummary()
+        if (not is_list_like(query)) or (isinstance(query, dict)):
+            yield self._request(
+                endpoint=endpoint,
+                query=query,
+                params=params,
+                bracketed=bracketed,
+                quote_method=quote_method,
+            )
+            return
+
+        if max_workers is None:
+            max_workers = self.max_workers
+
+        ## Remove duplicated DTXSIDs, keeping the order they were given in
+        query = list(dict.fromkeys(query))
+        if (self.batch_sizer is not None) and (self.job_id is None):
+            yield from self._iter_adaptive(
+                fetch=self._fetch_items,
+                endpoint=endpoint,
+                query=query,
+                batch_size=batch_size,
+                params=params,
+                bracketed=bracketed,
+                quote_method=quote_method,
+                max_workers=max_workers,
+            )
+            return
+        chunks = list(chunker(query, batch_size))
+        fetch = partial(
+            self._fetch_items,
+            endpoint=endpoint,
+            params=params,
+            bracketed=bracketed,
+            quote_method=quote_method,
+            checkpoint=self._start_checkpoint(
+                endpoint=endpoint, chunks=chunks, params=params, bracketed=bracketed
+            ),
+        )
+        chunks = enumerate(chunks)
+
+        if max_workers <= 1:
+            for i, chunk in chunks:
+                yield fetch(index=i, chunk=chunk)
+            return
+
+        ## Keep up to `max_workers` chunks ahead of the one being yielded
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        pending = deque()
+        try:
+            for i, chunk in chunks:
+                pending.append(executor.submit(fetch, index=i, chunk=chunk))
+                if len(pending) >= max_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            ## Also runs if the caller stops iterating early
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class RawResponse:
+    """
+    Reference to a raw API response, kept in the `attrs` of a DataFrame.
+
+    pandas deep-copies `attrs` in most operations that derive a new frame (slicing,
+    `head`, `merge`, ...). Copying a RawResponse returns the same object, so derived
+    frames share one response instead of each holding a copy.
+
+    Attributes
+    ----------
+    data : list or dict
+        The decoded response.
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = data
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __eq__(self, other):
+        if isinstance(other, RawResponse):
+            return (self.data is other.data) or (self.data == other.data)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __len__(self):
+        return len(self.data)
+
+    def __repr__(self):
+        return f"RawResponse({len(self.data)} records)"
+
 
 class ResponseTransformer:
     def __init__(self, data):
@@ -258,12 +1209,151 @@ class ResponseTransformer:
         """
         return repr(self._data)
 
-    def to_df(self):
-        df = (
-            pd.DataFrame(self._data)
-            .fillna(pd.NA)
-            .replace("-", pd.NA)
-            .replace("", pd.NA)
-        )
-        df.attrs = {"response": self._data}
+    def to_df(
+        self,
+        keep_response: bool = False,
+        dtype_backend: str = "numpy",
+        schema: Optional[dict] = None,
+        columns: Optional[list] = None,
+    ):
+        """
+        Convert the raw data to a DataFrame, with missing values as pd.NA.
+
+        Parameters
+        ----------
+        keep_response : bool, default False
+            Whether to keep a reference to the raw data, as a RawResponse in
+            `df.attrs["response"]`.
+        dtype_backend : {"numpy", "pyarrow"}, default "numpy"
+            Whether columns are NumPy and object arrays, or `pandas.ArrowDtype`
+            arrays built from a `pyarrow.Table` of the records.
+        schema : dict or None, default None
+            Column types, keyed on field name (see `ctxpy.schema`).
+        columns : list of str or None, default None
+            Fields to keep, in order. Other fields are skipped while the columns are
+            built, so they are never copied into the DataFrame. Fields missing from
+            every record become empty columns.
+        """
+        if dtype_backend == "pyarrow":
+            df = table_to_df(self.to_arrow(schema=schema, columns=columns))
+        elif dtype_backend == "numpy":
+            df = normalize_nulls(pd.DataFrame(self._data, columns=columns))
+            if schema:
+                apply_schema(df, schema)
+        else:
+            raise ValueError(
+                f"Value {dtype_backend} is invalid option for argument "
+                "`dtype_backend`."
+            )
+        if keep_response:
+            df.attrs["response"] = RawResponse(self._data)
+        return df
+
+    def to_arrow(
+        self, schema: Optional[dict] = None, columns: Optional[list] = None
+    ):
+        """
+        Convert the raw data to a pyarrow.Table, with missing values as nulls.
+
+        Needs the optional `pyarrow` dependency. See `ctxpy.arrow.records_to_table`.
+        """
+        return records_to_table(self._data, schema=schema, columns=columns)
+
+
+class ColumnBuffer:
+    """
+    Per-column buffers that the chunks of a batched call are appended to.
+
+    Each chunk's records are split into their columns as soon as the chunk arrives,
+    so the records can be freed right away instead of being held until the whole
+    call has finished. With the "numpy" backend the buffers are lists of values, one
+    per column; with the pyarrow backends each chunk becomes a pyarrow.Table and the
+    tables are concatenated without copying.
+
+    Parameters
+    ----------
+    dtype_backend : {"numpy", "pyarrow", "pyarrow_table"}, default "numpy"
+        Output format, as for `CTXConnection`.
+    schema : dict or None, default None
+        Column types, keyed on field name (see `ctxpy.schema`).
+    columns : list of str or None, default None
+        Fields to keep, in order. Other fields are never read from the records.
+
+    Attributes
+    ----------
+    rows : int
+        Number of records appended.
+    """
+
+    def __init__(
+        self,
+        dtype_backend: str = "numpy",
+        schema: Optional[dict] = None,
+        columns: Optional[list] = None,
+    ):
+        if dtype_backend not in DTYPE_BACKENDS:
+            raise ValueError(
+                f"Value {dtype_backend} is invalid option for argument "
+                "`dtype_backend`."
+            )
+        if dtype_backend != "numpy":
+            require_pyarrow()
+        self.dtype_backend = dtype_backend
+        self.schema = schema
+        self.columns = columns
+        self.rows = 0
+        self._buffers = {} if columns is None else {name: [] for name in columns}
+        self._tables = []
+
+    def write(self, records):
+        """Append the records of one chunk."""
+        if isinstance(records, dict):
+            records = [records]
+        if self.dtype_backend != "numpy":
+            table = records_to_table(records, schema=self.schema, columns=self.columns)
+            self._tables.append(table)
+            self.rows += table.num_rows
+            return
+
+        names = self.columns
+        values = None
+        if names is None:
+            names = list(records[0]) if records else []
+            if all(list(record) == names for record in records):
+                ## Records with the same fields, in the same order, are transposed
+                ## in one pass
+                values = zip(*[record.values() for record in records])
+            else:
+                names = dict.fromkeys(key for record in records for key in record)
+        if values is None:
+            values = ([record.get(name) for record in records] for name in names)
+
+        for name, column in zip(names, values):
+            buffer = self._buffers.get(name)
+            if buffer is None:
+                ## Columns first seen in this chunk are missing from the earlier ones
+                buffer = self._buffers[name] = [None] * self.rows
+            buffer.extend(column)
+        self.rows += len(records)
+        for buffer in self._buffers.values():
+            if len(buffer) < self.rows:
+                buffer.extend([None] * (self.rows - len(buffer)))
+
+    def to_arrow(self):
+        """Concatenate the chunks into one pyarrow.Table."""
+        if not self._tables:
+            return records_to_table([], schema=self.schema, columns=self.columns)
+        ## Each chunk's column types were inferred from its own records; columns
+        ## whose types disagree are widened (to text if need be) before concatenating
+        schema = unify_schemas(table.schema for table in self._tables)
+        tables = [conform_table(table, schema) for table in self._tables]
+        return pa.concat_tables(tables, promote_options="permissive")
+
+    def to_df(self) -> pd.DataFrame:
+        """Build a DataFrame from the buffers, with missing values as pd.NA."""
+        if self.dtype_backend != "numpy":
+            return table_to_df(self.to_arrow())
+        df = normalize_nulls(pd.DataFrame(self._buffers, columns=self.columns))
+        if self.schema:
+            apply_schema(df, self.schema)
         return df
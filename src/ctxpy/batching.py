@@ -0,0 +1,233 @@
+"""Adaptive sizing of the chunks of batched calls.
+
+Classes
+-------
+AdaptiveBatchSizer: tune the chunk size of each endpoint from observed responses
+
+"""
+
+import threading
+from typing import Optional
+
+import requests
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+## Responses to a chunk that mean it should be split: 413 (Content Too Large) and 504
+## (Gateway Timeout). A 400 (Bad Request) is not one of them, as it usually means an
+## identifier in the chunk is invalid, however small the chunk.
+SPLIT_STATUSES = frozenset({413, 504})
+
+## Errors raised by the HTTP clients when a request times out
+TIMEOUTS = (requests.Timeout,)
+if httpx is not None:
+    TIMEOUTS = (*TIMEOUTS, httpx.TimeoutException)
+
+
+class AdaptiveBatchSizer:
+    """
+    Chunk size of batched calls, tuned per endpoint from the responses received.
+
+    After every chunk, the time the server took to respond and the size of its body
+    are divided by the number of identifiers in the chunk, and folded into a moving
+    average. The next chunk sent to the same endpoint is sized so that it should take
+    about `target_latency` seconds and return at most `max_bytes` bytes, growing by
+    at most `max_growth` times the last chunk, and always within [`min_size`,
+    `max_size`].
+
+    A chunk the server rejects as too large (see `statuses`), or that times out, is
+    split in half and both halves are sent again. If the halves are answered, half
+    the size that failed becomes a ceiling on the endpoint's chunks. A chunk that
+    still fails once split down to a single identifier leaves the ceiling as it was,
+    since the identifier, not the chunk size, is to blame. Every `recovery` chunks
+    answered in a row raise the ceiling by a quarter, until it is back to `max_size`.
+
+    Parameters
+    ----------
+    target_latency : float, default 5.0
+        Seconds each chunk should take to be answered.
+    max_bytes : int or None, default 16777216
+        Largest response body, in bytes, each chunk should return. If None, chunks
+        are only sized on latency.
+    min_size : int, default 1
+        Smallest chunk size.
+    max_size : int, default 1000
+        Largest chunk size, i.e. the largest batch the server accepts.
+    max_growth : float, default 2.0
+        Factor a chunk size can grow by from one chunk to the next.
+    smoothing : float, default 0.5
+        Weight of the latest chunk in the moving averages, between 0 and 1.
+    recovery : int, default 10
+        Chunks answered in a row after which the ceiling is raised.
+    statuses : collection of int, default SPLIT_STATUSES
+        Response statuses that make a chunk be split.
+
+    Examples
+    --------
+    >>> sizer = AdaptiveBatchSizer(target_latency=2.0, max_size=1000)
+    >>> haz = ctx.Hazard(batch_sizer=sizer, max_workers=4)
+    >>> info = haz.search_toxvaldb(by='all', dtxsid=dtxsids)
+    >>> sizer.sizes()
+    {'hazard/toxval/search/by-dtxsid/': 340}
+    """
+
+    def __init__(
+        self,
+        target_latency: float = 5.0,
+        max_bytes: Optional[int] = 16 * 2**20,
+        min_size: int = 1,
+        max_size: int = 1000,
+        max_growth: float = 2.0,
+        smoothing: float = 0.5,
+        recovery: int = 10,
+        statuses=SPLIT_STATUSES,
+    ):
+        if target_latency <= 0:
+            raise ValueError("`target_latency` must be positive.")
+        if (max_bytes is not None) and (max_bytes <= 0):
+            raise ValueError("`max_bytes` must be positive.")
+        if not 1 <= min_size <= max_size:
+            raise ValueError("`min_size` must be at least 1 and at most `max_size`.")
+        if max_growth < 1:
+            raise ValueError("`max_growth` must be at least 1.")
+        if not 0 < smoothing <= 1:
+            raise ValueError("`smoothing` must be greater than 0 and at most 1.")
+        if recovery < 1:
+            raise ValueError("`recovery` must be at least 1.")
+
+        self.target_latency = target_latency
+        self.max_bytes = max_bytes
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_growth = max_growth
+        self.smoothing = smoothing
+        self.recovery = recovery
+        self.statuses = frozenset(statuses)
+        self._state = {}
+        self._lock = threading.Lock()
+
+    def _clamp(self, size: float, ceiling: Optional[int] = None) -> int:
+        upper = self.max_size if ceiling is None else min(self.max_size, ceiling)
+        return max(self.min_size, min(int(size), upper))
+
+    def _average(self, previous: Optional[float], value: float) -> float:
+        if previous is None:
+            return value
+        return self.smoothing * value + (1 - self.smoothing) * previous
+
+    @staticmethod
+    def _new_state(size: int) -> dict:
+        ## Chunk size, moving averages of seconds and bytes per identifier, the
+        ## ceiling left by the last chunk that had to be split, and the chunks
+        ## answered since then
+        return {
+            "size": size,
+            "seconds": None,
+            "bytes": None,
+            "ceiling": None,
+            "answered": 0,
+        }
+
+    def size(self, endpoint: str, default: int = 200) -> int:
+        """Size of the next chunk sent to `endpoint`, or `default` if none was sent."""
+        with self._lock:
+            state = self._state.get(endpoint)
+            if state is None:
+                return self._clamp(default)
+            return state["size"]
+
+    def record(
+        self,
+        endpoint: str,
+        size: int,
+        seconds: float,
+        nbytes: Optional[int] = None,
+    ):
+        """
+        Update the size of `endpoint`'s chunks from a chunk that was answered.
+
+        Parameters
+        ----------
+        endpoint : str
+            Endpoint the chunk was sent to.
+        size : int
+            Number of identifiers in the chunk.
+        seconds : float
+            Seconds the server took to respond.
+        nbytes : int or None, default None
+            Size of the response body in bytes, if known.
+        """
+        if size < 1:
+            return
+        with self._lock:
+            state = self._state.setdefault(endpoint, self._new_state(size))
+            state["seconds"] = self._average(state["seconds"], seconds / size)
+            if nbytes is not None:
+                state["bytes"] = self._average(state["bytes"], nbytes / size)
+            self._recover(state)
+
+            target = size * self.max_growth
+            if state["seconds"] > 0:
+                target = min(target, self.target_latency / state["seconds"])
+            if (self.max_bytes is not None) and state["bytes"]:
+                target = min(target, self.max_bytes / state["bytes"])
+            state["size"] = self._clamp(target, ceiling=state["ceiling"])
+
+    def _recover(self, state: dict):
+        ## Raise the ceiling once enough chunks in a row have been answered
+        if state["ceiling"] is None:
+            return
+        state["answered"] += 1
+        if state["answered"] < self.recovery:
+            return
+        state["answered"] = 0
+        ceiling = max(state["ceiling"] + 1, int(state["ceiling"] * 1.25))
+        state["ceiling"] = None if ceiling >= self.max_size else ceiling
+
+    def split(self, endpoint: str, size: int) -> int:
+        """
+        Lower the ceiling of `endpoint`'s chunks after a chunk of `size` failed, but
+        its halves were answered.
+
+        Returns
+        -------
+        int
+            The new ceiling, half of `size` (but at least `min_size`).
+        """
+        half = max(self.min_size, size // 2)
+        with self._lock:
+            state = self._state.setdefault(endpoint, self._new_state(half))
+            ceiling = state["ceiling"]
+            state["ceiling"] = half if ceiling is None else min(ceiling, half)
+            state["answered"] = 0
+            state["size"] = self._clamp(state["size"], ceiling=state["ceiling"])
+        return half
+
+    def should_split(self, error: Exception) -> bool:
+        """Whether `error`, raised while fetching a chunk, means it should be split."""
+        if isinstance(error, TIMEOUTS):
+            return True
+        response = getattr(error, "response", None)
+        return getattr(response, "status_code", None) in self.statuses
+
+    def sizes(self) -> dict:
+        """Current chunk size of each endpoint chunks have been sent to."""
+        with self._lock:
+            return {endpoint: state["size"] for endpoint, state in self._state.items()}
+
+    def reset(self, endpoint: Optional[str] = None):
+        """Forget what was learned about `endpoint`, or about every endpoint."""
+        with self._lock:
+            if endpoint is None:
+                self._state.clear()
+            else:
+                self._state.pop(endpoint, None)
+
+    def __repr__(self):
+        return (
+            f"AdaptiveBatchSizer(target_latency={self.target_latency}, "
+            f"max_bytes={self.max_bytes}, max_size={self.max_size})"
+        )
@@ -0,0 +1,290 @@
+"""Persistent cache of responses from the CTX APIs.
+
+Classes
+-------
+ResponseCache: SQLite-backed response cache with per-endpoint TTLs and LRU eviction
+
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+from pandas.api.types import is_list_like
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    expires REAL,
+    accessed REAL NOT NULL,
+    size INTEGER NOT NULL,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires);
+
+-- Running total of the size of the responses, kept by triggers so eviction doesn't
+-- have to sum the whole table on every write
+CREATE TABLE IF NOT EXISTS totals (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    size INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals (id, size)
+    SELECT 1, COALESCE(SUM(size), 0) FROM responses;
+CREATE TRIGGER IF NOT EXISTS responses_insert AFTER INSERT ON responses BEGIN
+    UPDATE totals SET size = size + NEW.size WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS responses_delete AFTER DELETE ON responses BEGIN
+    UPDATE totals SET size = size - OLD.size WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS responses_update AFTER UPDATE OF size ON responses BEGIN
+    UPDATE totals SET size = size - OLD.size + NEW.size WHERE id = 1;
+END;
+"""
+
+## Batch (POST) endpoints whose results are cached per identifier, and the record
+## field holding the identifier each record was returned for
+ITEM_FIELDS = (
+    (re.compile(r"^chemical/detail/search/by-dtxsid/$"), "dtxsid"),
+    (re.compile(r"^chemical/search/equal/$"), "searchValue"),
+    (re.compile(r"^exposure/functional-use/search/by-dtxsid/$"), "dtxsid"),
+    (re.compile(r"^exposure/product-data/search/by-dtxsid/$"), "dtxsid"),
+    (re.compile(r"^exposure/list-presence/search/by-dtxsid/$"), "dtxsid"),
+    (re.compile(r"^hazard/toxref/([a-z]+/)?search/by-dtxsid/$"), "dtxsid"),
+)
+
+## SQLite's default limit on variables in a single statement
+_MAX_VARIABLES = 999
+
+
+class ResponseCache:
+    """
+    On-disk cache of API responses, shared safely between threads and processes.
+
+    Responses are stored in a SQLite database in WAL mode, keyed on the API host,
+    endpoint, normalized query, and query parameters (which include the projection).
+    A cached response is served without touching the network until its time-to-live
+    runs out. When the cache grows past `max_size`, the least recently used responses
+    are evicted.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path or None, default None
+        Location of the SQLite database. Defaults to ~/.cache/ctxpy/responses.sqlite.
+    ttl : float or None, default 86400
+        Seconds a response stays valid. None keeps responses until evicted.
+    endpoint_ttls : dict or None, default None
+        Time-to-live overrides keyed on endpoint prefix, e.g.
+        ``{"exposure/mmdb/": 3600, "chemical/detail/": None}``. The longest matching
+        prefix is used.
+    max_size : int, default 1 GiB
+        Maximum total size, in bytes, of the cached responses.
+    timeout : float, default 30.0
+        Seconds to wait on a database locked by another process.
+    item_fields : tuple or None, default None
+        Pairs of (compiled endpoint pattern, identifier field) for batch endpoints
+        whose results are cached per identifier. Defaults to `ITEM_FIELDS`.
+
+    Notes
+    -----
+    Results of batch searches (e.g. ``Chemical.details(by='batch-dtxsid')`` or
+    ``Exposure.search_cpdat``) are split into one entry per identifier, so a later
+    search only requests the identifiers that are not already cached.
+
+    Examples
+    --------
+    >>> cache = ResponseCache(ttl=7 * 86400)
+    >>> chem = ctx.Chemical(cache=cache)
+    """
+
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        ttl: Optional[float] = 86400,
+        endpoint_ttls: Optional[dict] = None,
+        max_size: int = 2**30,
+        timeout: float = 30.0,
+        item_fields: Optional[tuple] = None,
+    ):
+        if path is None:
+            path = Path.home() / ".cache" / "ctxpy" / "responses.sqlite"
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.endpoint_ttls = dict(endpoint_ttls or {})
+        self.max_size = max_size
+        self.timeout = timeout
+        self.item_fields = ITEM_FIELDS if item_fields is None else item_fields
+
+        ## sqlite3 connections can't be shared between threads
+        self._local = threading.local()
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=self.timeout)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            ## Rows replaced by INSERT OR REPLACE only fire the delete trigger with
+            ## recursive triggers on
+            db.execute("PRAGMA recursive_triggers=ON")
+            self._local.db = db
+        return db
+
+    def key(
+        self,
+        host: str,
+        endpoint: str,
+        query=None,
+        params: Optional[dict] = None,
+    ) -> str:
+        """
+        Build the cache key of a request.
+
+        List-like queries are de-duplicated and sorted, and parameters are sorted, so
+        equivalent requests share a key.
+        """
+        if isinstance(query, dict):
+            query = sorted(query.items())
+        elif is_list_like(query):
+            query = sorted(set(query))
+        if params is not None:
+            params = sorted(params.items())
+        raw = json.dumps([host, endpoint, query, params], default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def item_key(
+        self,
+        host: str,
+        endpoint: str,
+        item: str,
+        params: Optional[dict] = None,
+    ) -> str:
+        """Build the cache key of one identifier's results from a batch endpoint."""
+        return self.key(
+            host=host, endpoint=f"{endpoint}#item", query=item, params=params
+        )
+
+    def item_field(self, endpoint: str) -> Optional[str]:
+        """Identifier field of a batch endpoint cached per item, or None."""
+        endpoint = endpoint.lstrip("/")
+        for pattern, field in self.item_fields:
+            if pattern.match(endpoint):
+                return field
+        return None
+
+    def ttl_for(self, endpoint: str) -> Optional[float]:
+        """Time-to-live, in seconds, of responses from `endpoint`."""
+        endpoint = endpoint.lstrip("/")
+        matches = [p for p in self.endpoint_ttls if endpoint.startswith(p.lstrip("/"))]
+        if not matches:
+            return self.ttl
+        return self.endpoint_ttls[max(matches, key=len)]
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached body for `key`, or None if missing or expired."""
+        now = time.time()
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT body, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            body, expires = row
+            if (expires is not None) and (expires <= now):
+                db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            db.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        return body
+
+    def set(self, key: str, endpoint: str, body: bytes):
+        """Store `body` under `key`, evicting old responses if the cache is full."""
+        now = time.time()
+        ttl = self.ttl_for(endpoint)
+        expires = None if ttl is None else now + ttl
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, endpoint, expires, accessed, size, body) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, endpoint, expires, now, len(body), body),
+            )
+            self._evict(db)
+
+    def get_many(self, keys: list) -> dict:
+        """Return a dict of the cached, unexpired bodies among `keys`."""
+        now = time.time()
+        found = {}
+        with self._connect() as db:
+            for pos in range(0, len(keys), _MAX_VARIABLES):
+                batch = keys[pos : pos + _MAX_VARIABLES]
+                marks = ",".join("?" * len(batch))
+                rows = db.execute(
+                    f"SELECT key, body, expires FROM responses WHERE key IN ({marks})",
+                    batch,
+                ).fetchall()
+                for key, body, expires in rows:
+                    if (expires is None) or (expires > now):
+                        found[key] = body
+            db.executemany(
+                "UPDATE responses SET accessed = ? WHERE key = ?",
+                [(now, key) for key in found],
+            )
+        return found
+
+    def set_many(self, entries: dict, endpoint: str):
+        """Store every key/body pair of `entries` in a single transaction."""
+        now = time.time()
+        ttl = self.ttl_for(endpoint)
+        expires = None if ttl is None else now + ttl
+        with self._connect() as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO responses "
+                "(key, endpoint, expires, accessed, size, body) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (key, endpoint, expires, now, len(body), body)
+                    for key, body in entries.items()
+                ],
+            )
+            self._evict(db)
+
+    def _evict(self, db: sqlite3.Connection):
+        ## Drop expired responses, then least recently used ones until under max_size
+        db.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),))
+        (total,) = db.execute("SELECT size FROM totals WHERE id = 1").fetchone()
+        if total <= self.max_size:
+            return
+        rows = db.execute("SELECT key, size FROM responses ORDER BY accessed")
+        stale = []
+        for key, size in rows:
+            if total <= self.max_size:
+                break
+            stale.append((key,))
+            total -= size
+        db.executemany("DELETE FROM responses WHERE key = ?", stale)
+
+    def clear(self):
+        """Remove every cached response."""
+        with self._connect() as db:
+            db.execute("DELETE FROM responses")
+
+    def close(self):
+        """Close this thread's connection to the database."""
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+    def __len__(self):
+        with self._connect() as db:
+            (count,) = db.execute("SELECT COUNT(*) FROM responses").fetchone()
+        return count
@@ -0,0 +1,312 @@
+"""Record and replay responses from the CTX APIs.
+
+A cassette is an on-disk store of responses. In record mode, requests go to the API
+and every response is saved; in replay mode, the saved responses are served back
+without touching the network. Replayed calls are deterministic, which makes them
+suitable for performance runs against real payload shapes.
+
+Classes
+-------
+Cassette: SQLite-backed store of recorded responses
+CassetteAdapter: requests transport adapter that records to, or replays from, a cassette
+AsyncCassetteTransport: httpx transport that records to, or replays from, a cassette
+
+"""
+
+import asyncio
+import hashlib
+import io
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Optional, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .exceptions import CassetteMissError
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS interactions (
+    key TEXT PRIMARY KEY,
+    method TEXT NOT NULL,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    recorded REAL NOT NULL
+);
+"""
+
+MODES = ("record", "replay")
+
+## Describe the bytes on the wire, not the decoded body that is stored
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+
+class Cassette:
+    """
+    On-disk store of API responses, keyed on the request.
+
+    Responses are stored, zlib-compressed, in a SQLite database keyed on the request
+    method, URL (with sorted query parameters) and body. Request headers, and so the
+    API key, are never stored.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        Location of the SQLite database.
+    mode : {"record", "replay"}, default "replay"
+        "record" sends every request to the API and saves its response, replacing
+        any earlier recording. "replay" serves saved responses and raises
+        CassetteMissError for requests that were never recorded.
+    latency : float, default 0.0
+        Seconds to wait before serving each replayed response, to simulate the
+        network.
+
+    Examples
+    --------
+    >>> chem = ctx.Chemical(cassette=Cassette('chemical.sqlite', mode='record'))
+    >>> chem.details(by='batch-dtxsid', query=dtxsids)
+
+    Later, without the network:
+
+    >>> chem = ctx.Chemical(cassette=Cassette('chemical.sqlite', latency=0.05))
+    >>> chem.details(by='batch-dtxsid', query=dtxsids)
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        mode: str = "replay",
+        latency: float = 0.0,
+    ):
+        if mode not in MODES:
+            raise ValueError(f"Value {mode} is invalid option for argument `mode`.")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.mode = mode
+        self.latency = latency
+
+        ## sqlite3 connections can't be shared between threads
+        self._local = threading.local()
+        with self._connect() as db:
+            db.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30.0)
+            db.execute("PRAGMA journal_mode=WAL")
+            self._local.db = db
+        return db
+
+    @staticmethod
+    def key(method: str, url: str, body: Optional[Union[str, bytes]] = None) -> str:
+        """Build the key of a request."""
+        parts = urlsplit(url)
+        query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+        url = urlunsplit(parts._replace(query=query))
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        digest = hashlib.sha256(f"{method.upper()} {url}\n".encode("utf-8"))
+        digest.update(body or b"")
+        return digest.hexdigest()
+
+    def save(
+        self,
+        method: str,
+        url: str,
+        body: Optional[Union[str, bytes]],
+        status: int,
+        headers: dict,
+        content: bytes,
+    ):
+        """Save the response to a request."""
+        headers = {
+            k: v for k, v in headers.items() if k.lower() not in _DROPPED_HEADERS
+        }
+        with self._connect() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO interactions "
+                "(key, method, url, status, headers, body, recorded) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    self.key(method, url, body),
+                    method.upper(),
+                    url,
+                    status,
+                    json.dumps(headers),
+                    zlib.compress(content),
+                    time.time(),
+                ),
+            )
+
+    def load(self, method: str, url: str, body: Optional[Union[str, bytes]] = None):
+        """
+        Return the saved response to a request.
+
+        Returns
+        -------
+        tuple
+            The status code, headers, and body of the response.
+
+        Raises
+        ------
+        CassetteMissError
+            If the request was never recorded.
+        """
+        with self._connect() as db:
+            row = db.execute(
+                "SELECT status, headers, body FROM interactions WHERE key = ?",
+                (self.key(method, url, body),),
+            ).fetchone()
+        if row is None:
+            raise CassetteMissError(method=method, url=url)
+        status, headers, content = row
+        return status, json.loads(headers), zlib.decompress(content)
+
+    def session(self) -> requests.Session:
+        """Create a session whose requests go through this cassette."""
+        session = requests.Session()
+        adapter = CassetteAdapter(self)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def async_transport(self):
+        """Create an httpx transport whose requests go through this cassette."""
+        if httpx is None:
+            raise ImportError(
+                "Asynchronous cassettes require `httpx`. Install it with "
+                "`pip install ctx-python[async]`."
+            )
+        return AsyncCassetteTransport(self)
+
+    def __len__(self):
+        with self._connect() as db:
+            (count,) = db.execute("SELECT COUNT(*) FROM interactions").fetchone()
+        return count
+
+    def close(self):
+        """Close this thread's connection to the database."""
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+
+class CassetteAdapter(BaseAdapter):
+    """
+    Transport adapter for `requests` that records to, or replays from, a cassette.
+
+    Parameters
+    ----------
+    cassette : Cassette
+        Where responses are saved to or served from.
+    adapter : requests.adapters.HTTPAdapter or None, default None
+        Adapter used to reach the API in record mode.
+    """
+
+    def __init__(self, cassette: Cassette, adapter: Optional[HTTPAdapter] = None):
+        super().__init__()
+        self.cassette = cassette
+        self.adapter = HTTPAdapter() if adapter is None else adapter
+
+    def send(self, request, stream=False, **kwargs):
+        if self.cassette.mode == "record":
+            response = self.adapter.send(request, stream=False, **kwargs)
+            self.cassette.save(
+                method=request.method,
+                url=request.url,
+                body=request.body,
+                status=response.status_code,
+                headers=dict(response.headers),
+                content=response.content,
+            )
+            return response
+
+        status, headers, content = self.cassette.load(
+            method=request.method, url=request.url, body=request.body
+        )
+        if self.cassette.latency > 0:
+            time.sleep(self.cassette.latency)
+
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response.raw = io.BytesIO(content)
+        response.url = request.url
+        response.request = request
+        response.reason = "Replayed"
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+    def close(self):
+        self.adapter.close()
+
+
+if httpx is not None:
+
+    class AsyncCassetteTransport(httpx.AsyncBaseTransport):
+        """
+        Transport for `httpx` that records to, or replays from, a cassette.
+
+        Parameters
+        ----------
+        cassette : Cassette
+            Where responses are saved to or served from.
+        transport : httpx.AsyncBaseTransport or None, default None
+            Transport used to reach the API in record mode.
+        """
+
+        def __init__(self, cassette: Cassette, transport=None):
+            self.cassette = cassette
+            self.transport = (
+                httpx.AsyncHTTPTransport() if transport is None else transport
+            )
+
+        async def handle_async_request(self, request):
+            body = await request.aread()
+            if self.cassette.mode == "record":
+                response = await self.transport.handle_async_request(request)
+                content = await response.aread()
+                self.cassette.save(
+                    method=request.method,
+                    url=str(request.url),
+                    body=body,
+                    status=response.status_code,
+                    headers=dict(response.headers),
+                    content=content,
+                )
+                headers = {
+                    k: v
+                    for k, v in response.headers.items()
+                    if k.lower() not in _DROPPED_HEADERS
+                }
+                return httpx.Response(
+                    response.status_code, headers=headers, content=content
+                )
+
+            status, headers, content = self.cassette.load(
+                method=request.method, url=str(request.url), body=body
+            )
+            if self.cassette.latency > 0:
+                await asyncio.sleep(self.cassette.latency)
+            return httpx.Response(status, headers=headers, content=content)
+
+        async def aclose(self):
+            await self.transport.aclose()
+
+else:
+    AsyncCassetteTransport = None
@@ -0,0 +1,138 @@
+"""Checkpoints for resuming long-running batched calls to the CTX APIs.
+
+Classes
+-------
+JobCheckpoint: on-disk record of the finished chunks of one batched call
+
+Functions
+---------
+write_atomic: replace a file's contents in a single step
+
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+DEFAULT_CHECKPOINT_DIR = Path.home() / ".cache" / "ctxpy" / "jobs"
+
+
+def write_atomic(path: Union[str, Path], data: bytes):
+    """
+    Write `data` to `path` so that readers see either the old or the new file.
+
+    The data is written and flushed to a temporary file in the same directory, which
+    then replaces `path`. A crash part way through leaves `path` untouched.
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class JobCheckpoint:
+    """
+    Finished chunks of one batched call, persisted so the call can be resumed.
+
+    Each call made under a job is stored in its own directory,
+    ``<directory>/<job_id>/<call key>/``, where the call key is a hash of the
+    endpoint, parameters and chunked query. The directory holds a ``manifest.json``
+    describing the call and its chunks, and one ``chunk-<index>.json`` file per
+    finished chunk. Every file is written atomically, so a chunk is either
+    completely saved or not saved at all.
+
+    Parameters
+    ----------
+    directory : str or pathlib.Path
+        Root directory of all job checkpoints.
+    job_id : str
+        Name of the job. Re-running the same call under the same job id skips the
+        chunks that were already finished.
+    endpoint : str
+        Endpoint of the batched call.
+    chunks : list of list
+        The call's query, split into chunks.
+    params : dict or None, default None
+        Query parameters of the call.
+    bracketed : bool, default True
+        How the call's chunks are formatted.
+
+    Attributes
+    ----------
+    path : pathlib.Path
+        Directory of this call's checkpoint.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        job_id: str,
+        endpoint: str,
+        chunks: list,
+        params: Optional[dict] = None,
+        bracketed: bool = True,
+    ):
+        if (not job_id) or (Path(job_id).name != job_id):
+            raise ValueError(f"Value {job_id!r} is invalid option for `job_id`.")
+
+        manifest = {
+            "job_id": job_id,
+            "endpoint": endpoint,
+            "params": params,
+            "bracketed": bracketed,
+            "chunks": [list(chunk) for chunk in chunks],
+        }
+        raw = json.dumps(
+            [endpoint, params, bracketed, manifest["chunks"]],
+            sort_keys=True,
+            default=str,
+        )
+        key = hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+        self.job_id = job_id
+        self.n_chunks = len(manifest["chunks"])
+        self.path = Path(directory) / job_id / key
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        manifest_path = self.path / "manifest.json"
+        if not manifest_path.exists():
+            manifest["created"] = time.time()
+            write_atomic(manifest_path, json.dumps(manifest, default=str).encode())
+
+    def _chunk_path(self, index: int) -> Path:
+        return self.path / f"chunk-{index:06d}.json"
+
+    @property
+    def manifest(self) -> dict:
+        """Description of the call and its chunks."""
+        return json.loads((self.path / "manifest.json").read_bytes())
+
+    @property
+    def completed(self) -> list:
+        """Indices of the chunks that have been saved, in order."""
+        return sorted(
+            int(p.stem.split("-")[1]) for p in self.path.glob("chunk-*.json")
+        )
+
+    def is_done(self, index: int) -> bool:
+        """Whether the results of chunk `index` have been saved."""
+        return self._chunk_path(index).exists()
+
+    def load(self, index: int):
+        """Return the saved results of chunk `index`."""
+        return json.loads(self._chunk_path(index).read_bytes())
+
+    def save(self, index: int, records):
+        """Save the results of chunk `index`."""
+        write_atomic(self._chunk_path(index), json.dumps(records).encode("utf-8"))
@@ -1,11 +1,12 @@
 """Access the Chemical endpoints of the CTX API."""
 
 from importlib import resources
-from typing import Iterable, Optional, Union
+from typing import Iterable, Iterator, Optional, Union
 
 from pandas.api.types import is_list_like
 
 from .base import CTXConnection
+from .utils import select_fields
 
 
 class Chemical(CTXConnection):
@@ -21,6 +22,10 @@ class Chemical(CTXConnection):
     x_api_key : Optional[str]
         A personal key for using CCTE's APIs, if left blank, it assumes a key is
         already stored in ~/.config/ccte_api/config.toml
+    **kwargs
+        Connection options passed on to CTXConnection, e.g. `session` or
+        `pool_maxsize`. Connections created with the same options share one pooled
+        HTTP session.
 
     Returns
     -------
@@ -44,8 +49,8 @@ class Chemical(CTXConnection):
 
     KIND = "chemical"
 
-    def __init__(self, x_api_key: Optional[str] = None):
-        super().__init__(x_api_key=x_api_key)
+    def __init__(self, x_api_key: Optional[str] = None, **kwargs):
+        super().__init__(x_api_key=x_api_key, **kwargs)
 
     def _toxprints():
         ## TODO: since I removed the cheminformatics part, I'd need to do something here
@@ -78,6 +83,37 @@ class Chemical(CTXConnection):
 
         return toxps
 
+    def _search_call(self, by, query, batch_size=200, top_n_hits=None) -> dict:
+        ## Validate `search` arguments and build the keyword arguments for `ctx_call`
+        options = {
+            "starts-with": "start-with",
+            "equals": "equal",
+            "contains": "contain",
+            "batch": "equal",
+        }
+
+        if by not in options.keys():
+            raise KeyError(f"Value {by} is invalid option for argument `by`.")
+
+        if (is_list_like(query)) and (by != "batch"):
+            raise NotImplementedError(
+                f"`by` option of '{by}' cannot be used in batch mode."
+            )
+
+        endpoint = f"{self.KIND}/search/{options[by]}/"
+        if top_n_hits is None:
+            params = None
+        else:
+            params = {"top": top_n_hits}
+
+        return {
+            "endpoint": endpoint,
+            "query": query,
+            "batch_size": batch_size,
+            "params": params,
+            "bracketed": False,
+        }
+
     def search(
         self,
         by: str,
@@ -111,6 +147,7 @@ class Chemical(CTXConnection):
             `query` argument. If more than 200 are submitted, then the request is
             chunked into batches of `batch_size`. If `by` argument is any other option
             than `batch` this argument is ignored.
+
         top_n_hits: int (default=None)
             For 'contains' and 'starts-with' options for 'by' parameter, this parameter
             limits the number of matches returned by the request. Setting the value to
@@ -230,34 +267,78 @@ class Chemical(CTXConnection):
           'isDuplicate': False}]
         """
 
-        options = {
-            "starts-with": "start-with",
-            "equals": "equal",
-            "contains": "contain",
-            "batch": "equal",
-        }
+        call = self._search_call(
+            by=by, query=query, batch_size=batch_size, top_n_hits=top_n_hits
+        )
+        info = super(Chemical, self).ctx_call(**call)
 
-        if by not in options.keys():
-            raise KeyError(f"Value {by} is invalid option for argument `by`.")
+        return info
 
-        if (is_list_like(query)) and (by != "batch"):
-            raise NotImplementedError(
-                f"`by` option of '{by}' cannot be used in batch mode."
-            )
+    def iter_search(
+        self,
+        by: str,
+        query: Union[str, Iterable[str]],
+        batch_size: Optional[int] = 200,
+        top_n_hits: Optional[int] = None,
+    ) -> Iterator[list]:
+        """
+        Search for chemical(s) like `search`, yielding the matches one chunk at a time.
 
-        endpoint = f"{self.KIND}/search/{options[by]}/"
-        if top_n_hits is None:
-            params = None
-        else:
-            params = {"top": top_n_hits}
+        Takes the same arguments as `search`. A batch `query` is split into chunks of
+        `batch_size`, and the matches for each chunk are yielded as soon as they are
+        received, so long batches can be processed without holding every match in
+        memory.
 
-        info = super(Chemical, self).ctx_call(endpoint=endpoint,
-                                              query=query,
-                                              batch_size=batch_size,
-                                              params=params,
-                                              bracketed=False)
+        Yields
+        ------
+        list
+            The matches for one chunk of `query`.
 
-        return info
+        Examples
+        --------
+        >>> for matches in chem.iter_search(by='batch', query=names):
+        ...     writer.writerows(matches)
+        """
+
+        call = self._search_call(
+            by=by, query=query, batch_size=batch_size, top_n_hits=top_n_hits
+        )
+        yield from self.iter_ctx_call(**call)
+
+    def _details_call(self, by, query, subset=None, batch_size=1000) -> dict:
+        ## Validate `details` arguments and build the keyword arguments for `ctx_call`
+        by_options = {
+            "dtxsid": "by-dtxsid",
+            "dtxcid": "by-dtxcid",
+            "batch-dtxsid": "by-dtxsid",
+            "batch-dtxcid": "by-dtxcid",
+        }
+        subset_options = {
+            None: "chemicaldetailall",
+            "all": "chemicaldetailall",
+            "details": "chemicaldetailstandard",
+            "identifiers": "chemicalidentifier",
+            "structures": "chemicalstructure",
+            "nta": "ntatoolkit",
+            "ccd": "ccdchemicaldetails",
+            "assays": "ccdassaydetails",
+            "compact": "compact",
+        }
+
+        if by not in by_options.keys():
+            raise KeyError(f"Value {by} is invalid option for argument `by`.")
+
+        if (subset is not None) and (subset not in subset_options.keys()):
+            raise KeyError(f"Value {subset} is invalid option for argument `subset`.")
+
+        endpoint = f"{self.KIND}/detail/search/{by_options[by]}/"
+        params = {"projection": subset_options[subset]}
+        return {
+            "endpoint": endpoint,
+            "query": query,
+            "params": params,
+            "batch_size": batch_size,
+        }
 
     def details(
         self,
@@ -265,6 +346,8 @@ class Chemical(CTXConnection):
         query: Union[str, Iterable[str]],
         subset: Optional[str] = None,
         batch_size: Optional[int] = 1000,
+        columns: Optional[list] = None,
+        sink=None,
     ) -> list:
         ## TODO: add exactly what each subset returns
         """
@@ -298,6 +381,14 @@ class Chemical(CTXConnection):
             chunked into batches of `batch_size`. If `by` argument is any other option
             than `batch` this argument is ignored.
 
+        columns : list of str or None, default None
+            Fields to keep in each record. `iter_details` drops the other fields as
+            each chunk is received.
+
+        sink : ctxpy.sink.DatasetSink or None, default None
+            If given, each chunk of details is written to this dataset as soon as it
+            is received, and the sink is returned instead of a list.
+
         Return
         ------
         dict or list
@@ -364,37 +455,75 @@ class Chemical(CTXConnection):
           ...}]
         """
 
-        by_options = {
-            "dtxsid": "by-dtxsid",
+        call = self._details_call(
+            by=by, query=query, subset=subset, batch_size=batch_size
+        )
+        if sink is not None:
+            return self._write_sink(sink=sink, call=call, columns=columns)
+        info = super(Chemical, self).ctx_call(**call)
+        if columns is not None:
+            info = select_fields(info, columns)
+
+        return info
+
+    def iter_details(
+        self,
+        by: str,
+        query: Union[str, Iterable[str]],
+        subset: Optional[str] = None,
+        batch_size: Optional[int] = 1000,
+        columns: Optional[list] = None,
+    ) -> Iterator[list]:
+        """
+        Get detailed information like `details`, yielding it one chunk at a time.
+
+        Takes the same arguments as `details`. A batch `query` is split into chunks of
+        `batch_size`, and the details for each chunk are yielded as soon as they are
+        received.
+
+        Yields
+        ------
+        list
+            Details of the chemicals in one chunk of `query`.
+
+        Examples
+        --------
+        >>> for chunk in chem.iter_details(by='batch-dtxsid', query=dtxsids):
+        ...     pd.DataFrame(chunk).to_csv('details.csv', mode='a')
+        """
+
+        call = self._details_call(
+            by=by, query=query, subset=subset, batch_size=batch_size
+        )
+        for info in self.iter_ctx_call(**call):
+            yield info if columns is None else select_fields(info, columns)
+
+    def _msready_call(self, by, query=None, start=None, end=None) -> dict:
+        ## Validate `msready` arguments and build the keyword arguments for `ctx_call`
+        options = {
             "dtxcid": "by-dtxcid",
-            "batch-dtxsid": "by-dtxsid",
-            "batch-dtxcid": "by-dtxcid",
-        }
-        subset_options = {
-            None: "chemicaldetailall",
-            "all": "chemicaldetailall",
-            "details": "chemicaldetailstandard",
-            "identifiers": "chemicalidentifier",
-            "structures": "chemicalstructure",
-            "nta": "ntatoolkit",
-            "ccd": "ccdchemicaldetails",
-            "assays": "ccdassaydetails",
-            "compact": "compact",
+            "mass": "by-mass",
+            "formula": "by-formula",
         }
 
-        if by not in by_options.keys():
+        if (not isinstance(query, str)) and (by != "mass"):
+            raise ValueError("No search term provided to `query` argument.")
+
+        if ((start is None) or (end is None)) and (by == "mass"):
+            raise ValueError(
+                "Searching by mass range, but no mass values "
+                "provided start and end of range."
+            )
+
+        if by not in options.keys():
             raise KeyError(f"Value {by} is invalid option for argument `by`.")
 
-        if (subset is not None) and (subset not in subset_options.keys()):
-            raise KeyError(f"Value {subset} is invalid option for argument `subset`.")
+        endpoint = f"{self.KIND}/msready/search/{options[by]}/"
 
-        endpoint = f"{self.KIND}/detail/search/{by_options[by]}/"
-        params = {"projection": subset_options[subset]}
-        info = super(Chemical, self).ctx_call(
-            endpoint=endpoint, query=query, params=params, batch_size=batch_size
-        )
+        if by == "mass":
+            query = f"{start}/{end}"
 
-        return info
+        return {"endpoint": endpoint, "query": query}
 
     def msready(
         self,
@@ -473,29 +602,7 @@ class Chemical(CTXConnection):
          ...]
         """
 
-        options = {
-            "dtxcid": "by-dtxcid",
-            "mass": "by-mass",
-            "formula": "by-formula",
-        }
-
-        if (not isinstance(query, str)) and (by != "mass"):
-            raise ValueError("No search term provided to `query` argument.")
-
-        if ((start is None) or (end is None)) and (by == "mass"):
-            raise ValueError(
-                "Searching by mass range, but no mass values "
-                "provided start and end of range."
-            )
-
-        if by not in options.keys():
-            raise KeyError(f"Value {by} is invalid option for argument `by`.")
-
-        endpoint = f"{self.KIND}/msready/search/{options[by]}/"
-
-        if by == "mass":
-            query = f"{start}/{end}"
-
-        info = super(Chemical, self).ctx_call(endpoint=endpoint, query=query)
+        call = self._msready_call(by=by, query=query, start=start, end=end)
+        info = super(Chemical, self).ctx_call(**call)
 
         return info
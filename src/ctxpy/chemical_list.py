@@ -19,6 +19,10 @@ class ChemicalList(CTXConnection):
     x_api_key : Optional[str]
         A personal key for using CCTE's APIs, if left blank, it assumes a key is
         already stored in ~/.config/ccte_api/config.toml
+    **kwargs
+        Connection options passed on to CTXConnection, e.g. `session` or
+        `pool_maxsize`. Connections created with the same options share one pooled
+        HTTP session.
 
     Returns
     -------
@@ -41,30 +45,13 @@ class ChemicalList(CTXConnection):
 
     KIND = "chemical/list"
 
-    def __init__(self, x_api_key: Optional[str] = None):
-        super().__init__(x_api_key=x_api_key)
+    def __init__(self, x_api_key: Optional[str] = None, **kwargs):
+        super().__init__(x_api_key=x_api_key, **kwargs)
 
     def get_list_types(self):
         return super(ChemicalList, self).ctx_call(endpoint=f"{self.KIND}/type")
 
-    def get_all_list_meta(self, output: Optional[str] = None):
-        """
-        Return names of all public lists available from the API service.
-
-        Return
-        ------
-        list
-            a list of dicts with each dict being a match to supplied a chemical
-            identifier
-
-        Examples
-        --------
-        Search for chemical(s) by DTXCID:
-
-        >>> chemlist.public_list_names()
-
-        """
-
+    def _get_all_list_meta_call(self, output=None) -> dict:
         output_options = {
             "all": "chemicallistall",
             "dtxsid": "chemicallistwithdtxsids",
@@ -83,10 +70,31 @@ class ChemicalList(CTXConnection):
             raise KeyError(f"'output' option of `{output}` is not valid.")
         endpoint = f"{self.KIND}/"
         params = {"projection": output_options[output]}
-        info = super(ChemicalList, self).ctx_call(endpoint=endpoint, params=params)
+        return {"endpoint": endpoint, "params": params}
+
+    def get_all_list_meta(self, output: Optional[str] = None):
+        """
+        Return names of all public lists available from the API service.
+
+        Return
+        ------
+        list
+            a list of dicts with each dict being a match to supplied a chemical
+            identifier
+
+        Examples
+        --------
+        Search for chemical(s) by DTXCID:
+
+        >>> chemlist.public_list_names()
+
+        """
+
+        call = self._get_all_list_meta_call(output=output)
+        info = super(ChemicalList, self).ctx_call(**call)
         return info
 
-    def get_list_meta_by_type(self, list_type: str, output: Optional[str] = None):
+    def _get_list_meta_by_type_call(self, list_type, output=None) -> dict:
         output_options = {
             "all": "chemicallistall",
             "dtxsid": "chemicallistwithdtxsids",
@@ -104,12 +112,14 @@ class ChemicalList(CTXConnection):
             raise KeyError(f"'output' option of `{output}` is not valid.")
         endpoint = f"{self.KIND}/search/by-type/"
         params = {"projection": output_options[output]}
-        info = super(ChemicalList, self).ctx_call(
-            endpoint=endpoint, query=list_type, params=params
-        )
+        return {"endpoint": endpoint, "query": list_type, "params": params}
+
+    def get_list_meta_by_type(self, list_type: str, output: Optional[str] = None):
+        call = self._get_list_meta_by_type_call(list_type=list_type, output=output)
+        info = super(ChemicalList, self).ctx_call(**call)
         return info
 
-    def get_list_meta_by_name(self, list_name: str, output: Optional[str] = None):
+    def _get_list_meta_by_name_call(self, list_name, output=None) -> dict:
         output_options = {
             "all": "chemicallistall",
             "dtxsid": "chemicallistwithdtxsids",
@@ -122,17 +132,19 @@ class ChemicalList(CTXConnection):
             raise KeyError(f"'output' option of `{output}` is not valid.")
         endpoint = f"{self.KIND}/search/by-name/"
         params = {"projection": output_options[output]}
-        info = super(ChemicalList, self).ctx_call(
-            endpoint=endpoint, query=list_name, params=params
-        )
+        return {"endpoint": endpoint, "query": list_name, "params": params}
+
+    def get_list_meta_by_name(self, list_name: str, output: Optional[str] = None):
+        call = self._get_list_meta_by_name_call(list_name=list_name, output=output)
+        info = super(ChemicalList, self).ctx_call(**call)
         return info
 
+    @staticmethod
     def _join_query(query: dict):
         query = {k: quote(v, safe="") for k, v in query.items()}
         return f"{query['list']}/{query['word']}"
 
-    def filter_list_by_chemicals(self, list_name: str, chem_filter: str, how: str):
-
+    def _filter_list_by_chemicals_call(self, list_name, chem_filter, how) -> dict:
         options = {
             "contains": "contain",
             "equals": "equal",
@@ -142,9 +154,13 @@ class ChemicalList(CTXConnection):
             raise KeyError(f"'how' value of `{how}` not a valid option.")
         query = {"list": list_name, "word": chem_filter}
         endpoint = f"{self.KIND}/chemicals/search/{options[how]}/"
-        info = super(ChemicalList, self).ctx_call(
-            endpoint=endpoint, query=query, quote_method=self._join_query
+        return {"endpoint": endpoint, "query": query, "quote_method": self._join_query}
+
+    def filter_list_by_chemicals(self, list_name: str, chem_filter: str, how: str):
+        call = self._filter_list_by_chemicals_call(
+            list_name=list_name, chem_filter=chem_filter, how=how
         )
+        info = super(ChemicalList, self).ctx_call(**call)
         return info
 
     def get_list(
@@ -179,3 +195,32 @@ class ChemicalList(CTXConnection):
         info = super(ChemicalList, self).ctx_call(endpoint=endpoint, query=list_name)
 
         return info
+
+    def _get_lists_containing_call(self, dtxsid) -> dict:
+        endpoint = f"{self.KIND}/search/by-dtxsid/"
+        return {"endpoint": endpoint, "query": dtxsid}
+
+    def get_lists_containing(self, dtxsid: str):
+        """
+        Returns the names of the chemical lists a chemical is on.
+
+        Parameters
+        ----------
+        dtxsid : string
+            A valid DSSTox Substance Identifier (DTXSID)
+
+        Return
+        ------
+        list
+            names of the lists the chemical is on
+
+        Examples
+        --------
+        >>> chemlist.get_lists_containing(dtxsid="DTXSID7020182")
+
+        """
+
+        call = self._get_lists_containing_call(dtxsid=dtxsid)
+        info = super(ChemicalList, self).ctx_call(**call)
+
+        return info
@@ -0,0 +1,312 @@
+"""Fetch cross-domain chemical dossiers with as few requests as possible.
+
+A dossier is a set of datasets (chemical details, CPDat, QSURs, SEEM, HTTK, ToxValDB,
+lists, ...) for a set of chemicals. Rather than calling each domain class in turn,
+the requests of every dataset are planned up front: datasets with a batch (POST)
+search are requested in chunks, the others one DTXSID at a time, and everything is
+sent on one thread pool. With a response cache, batch searches only request the
+DTXSIDs that aren't cached already.
+
+Data
+----
+DATASETS: how each dataset is requested, keyed on dataset name
+
+Classes
+-------
+Dossier: plan and fetch datasets for many chemicals at once
+DossierPlan: the deduplicated requests of a dossier, and the datasets each one serves
+
+"""
+
+import json
+from typing import Iterable, Optional
+
+from pandas.api.types import is_list_like
+
+from .base import CTXConnection
+from .chemical import Chemical
+from .chemical_list import ChemicalList
+from .exposure import Exposure
+from .hazard import Hazard
+from .utils import chunker
+
+## Each dataset's domain class, the method of it that builds the call, the call's
+## arguments other than the DTXSIDs, and whether the endpoint has a batch search.
+## Scalar records (e.g. list names) are wrapped in a dict under `field`.
+DATASETS = {
+    "details": {
+        "cls": Chemical,
+        "call": "_details_call",
+        "kwargs": {"by": "batch-dtxsid"},
+        "arg": "query",
+        "batch": True,
+    },
+    "cpdat-fc": {
+        "cls": Exposure,
+        "call": "_search_cpdat_call",
+        "kwargs": {"vocab_name": "fc"},
+        "batch": True,
+    },
+    "cpdat-puc": {
+        "cls": Exposure,
+        "call": "_search_cpdat_call",
+        "kwargs": {"vocab_name": "puc"},
+        "batch": True,
+    },
+    "cpdat-lpk": {
+        "cls": Exposure,
+        "call": "_search_cpdat_call",
+        "kwargs": {"vocab_name": "lpk"},
+        "batch": True,
+    },
+    "qsurs": {"cls": Exposure, "call": "_search_qsurs_call", "batch": False},
+    "seem": {
+        "cls": Exposure,
+        "call": "_search_exposures_call",
+        "kwargs": {"by": "seem"},
+        "batch": True,
+    },
+    "pathways": {
+        "cls": Exposure,
+        "call": "_search_exposures_call",
+        "kwargs": {"by": "pathways"},
+        "batch": True,
+    },
+    "httk": {"cls": Exposure, "call": "_search_httk_call", "batch": True},
+    **{
+        name: {
+            "cls": Hazard,
+            "call": "_search_toxvaldb_call",
+            "kwargs": {"by": by},
+            "batch": True,
+        }
+        for name, by in [
+            ("toxval", "all"),
+            ("cancer", "cancer"),
+            ("skin-eye", "skin-eye"),
+            ("genetox", "genetox"),
+            ("genetox-summary", "genetox-summary"),
+        ]
+    },
+    **{
+        other: {
+            "cls": Hazard,
+            "call": "_search_other_call",
+            "kwargs": {"other": other},
+            "batch": False,
+        }
+        for other in ["pprtv", "hawc", "iris", "adme-ivive"]
+    },
+    "lists": {
+        "cls": ChemicalList,
+        "call": "_get_lists_containing_call",
+        "batch": False,
+        "field": "listName",
+    },
+}
+
+## Default size of the chunks of batch searches whose call doesn't set one
+BATCH_SIZE = 200
+
+
+class DossierPlan:
+    """
+    The requests needed to fetch a dossier, each needed by one or more datasets.
+
+    Attributes
+    ----------
+    dtxsid : list of str
+        The chemicals of the dossier, without duplicates.
+    datasets : list of str
+        The datasets of the dossier, without duplicates.
+    requests : list of dict
+        Keyword arguments of each request, with no two alike.
+    uses : list of list of tuple
+        For each request, the (dataset, DTXSIDs) pairs its records belong to.
+    endpoints : dict
+        Endpoint of each dataset.
+    """
+
+    def __init__(self, dtxsid: list, datasets: list):
+        self.dtxsid = dtxsid
+        self.datasets = datasets
+        self.requests = []
+        self.uses = []
+        self.endpoints = {}
+        self._index = {}
+
+    def add(self, dataset: str, request: dict, dtxsid: list):
+        """Add a request for `dataset`, unless an identical one is planned already."""
+        key = json.dumps(request, sort_keys=True)
+        if key not in self._index:
+            self._index[key] = len(self.requests)
+            self.requests.append(request)
+            self.uses.append([])
+        self.uses[self._index[key]].append((dataset, dtxsid))
+        self.endpoints[dataset] = request["endpoint"]
+
+    def summary(self) -> dict:
+        """Number of batch (POST) and single (GET) requests in the plan."""
+        batch = sum(isinstance(r["query"], list) for r in self.requests)
+        return {"batch": batch, "single": len(self.requests) - batch}
+
+    def __len__(self):
+        return len(self.requests)
+
+    def __repr__(self):
+        counts = self.summary()
+        return (
+            f"DossierPlan({len(self.dtxsid)} chemicals, {len(self.datasets)} datasets, "
+            f"{counts['batch']} batch and {counts['single']} single requests)"
+        )
+
+
+class Dossier(CTXConnection):
+    """
+    Fetch many datasets for many chemicals, with as few requests as possible.
+
+    Takes the same arguments as CTXConnection. Every request of a dossier is sent
+    through this connection, and so shares its session, rate limiter, retry policy
+    and cache.
+
+    Examples
+    --------
+    >>> dossier = ctx.Dossier(max_workers=8)
+    >>> dossier.plan(dtxsids, datasets=['details', 'cpdat-puc', 'qsurs', 'toxval'])
+    DossierPlan(500 chemicals, 4 datasets, 6 batch and 500 single requests)
+    >>> frames = dossier.fetch(dtxsids, datasets=['details', 'cpdat-puc', 'qsurs'])
+    >>> frames['qsurs']
+    """
+
+    def __init__(self, x_api_key: Optional[str] = None, **kwargs):
+        super().__init__(x_api_key=x_api_key, **kwargs)
+        self._builders = {}
+
+    def _builder(self, cls):
+        ## Domain object whose `_*_call` methods build the calls of its datasets. It
+        ## never sends requests itself.
+        if cls not in self._builders:
+            self._builders[cls] = cls(
+                x_api_key=self.headers["x-api-key"],
+                host=self.host,
+                session=self.session,
+                rate_limiter=self.rate_limiter,
+            )
+        return self._builders[cls]
+
+    def plan(self, dtxsid, datasets: Iterable[str]) -> DossierPlan:
+        """
+        Plan the requests needed to fetch `datasets` for the chemicals in `dtxsid`.
+
+        Parameters
+        ----------
+        dtxsid : string or list-like
+            A DTXSID, or a list-like of DTXSIDs.
+        datasets : list of str
+            Datasets to fetch, from the keys of `ctxpy.dossier.DATASETS`.
+
+        Return
+        ------
+        DossierPlan
+        """
+
+        if isinstance(dtxsid, str):
+            dtxsid = [dtxsid]
+        elif not is_list_like(dtxsid):
+            raise TypeError("`dtxsid` must either be string or list-like of strings.")
+        if isinstance(datasets, str):
+            datasets = [datasets]
+        for dataset in datasets:
+            if dataset not in DATASETS:
+                raise KeyError(
+                    f"Value {dataset} is invalid option for argument `datasets`."
+                )
+
+        ## Remove duplicates, keeping the order they were given in
+        plan = DossierPlan(
+            dtxsid=list(dict.fromkeys(dtxsid)), datasets=list(dict.fromkeys(datasets))
+        )
+        for dataset in plan.datasets:
+            spec = DATASETS[dataset]
+            build = getattr(self._builder(spec["cls"]), spec["call"])
+            call = build(
+                **{spec.get("arg", "dtxsid"): plan.dtxsid}, **spec.get("kwargs", {})
+            )
+            request = {"endpoint": call["endpoint"]}
+            if call.get("params"):
+                request["params"] = call["params"]
+
+            if spec["batch"]:
+                for chunk in chunker(plan.dtxsid, call.get("batch_size", BATCH_SIZE)):
+                    plan.add(dataset, {**request, "query": list(chunk)}, list(chunk))
+            else:
+                for d in plan.dtxsid:
+                    plan.add(dataset, {**request, "query": d}, [d])
+        return plan
+
+    def _assemble(self, plan: DossierPlan, results: list, columns=None) -> dict:
+        ## Split the responses to a plan's requests into a frame per dataset
+        records = {dataset: [] for dataset in plan.datasets}
+        errors = {}
+        for uses, (info, err) in zip(plan.uses, results):
+            for dataset, dtxsid in uses:
+                errors.update({(dataset, d): err for d in dtxsid})
+                if err is not None:
+                    continue
+                rows = info
+                field = DATASETS[dataset].get("field")
+                if field is not None:
+                    rows = [
+                        value if isinstance(value, dict) else {field: value}
+                        for value in rows
+                    ]
+                if len(dtxsid) == 1:
+                    rows = self._tag_records(rows, item=dtxsid[0])
+                records[dataset].extend(rows)
+        self._warn_failed_items(errors)
+
+        return {
+            dataset: self._to_df(
+                info, endpoint=plan.endpoints.get(dataset), columns=columns
+            )
+            for dataset, info in records.items()
+        }
+
+    def fetch(
+        self,
+        dtxsid,
+        datasets: Iterable[str],
+        columns: Optional[list] = None,
+        max_workers: Optional[int] = None,
+    ) -> dict:
+        """
+        Fetch `datasets` for the chemicals in `dtxsid`.
+
+        The requests of `plan` are sent on one thread pool. If the connection has a
+        `cache`, batch searches only request the DTXSIDs that aren't cached already,
+        as `ctx_call` does. A request that fails doesn't stop the others: its error
+        is kept in `failed_items`, keyed on (dataset, DTXSID), and a warning is
+        raised once all requests have finished.
+
+        Parameters
+        ----------
+        dtxsid : string or list-like
+            A DTXSID, or a list-like of DTXSIDs.
+        datasets : list of str
+            Datasets to fetch, from the keys of `ctxpy.dossier.DATASETS`.
+        columns : list of str or None, default None
+            Fields to keep. Other fields are never copied into the DataFrames.
+        max_workers : int or None, default None
+            Number of requests sent at the same time, all paced by the connection's
+            rate limiter. Defaults to the connection's `max_workers`.
+
+        Return
+        ------
+        dict of pandas DataFrame
+            Records of each dataset, keyed on dataset name. Records of datasets
+            requested one DTXSID at a time are tagged with their `dtxsid`.
+        """
+
+        plan = self.plan(dtxsid=dtxsid, datasets=datasets)
+        results = self._send_all(plan.requests, max_workers=max_workers)
+        return self._assemble(plan=plan, results=results, columns=columns)
@@ -11,3 +11,28 @@ class TOMLTableExistsError(TOMLError):
 
 class TOMLTableNotFoundError(TOMLError):
     """Error for attempting to change non-existant table in config.toml."""
+
+
+class CTXError(Exception):
+    """A base class for errors encountered while calling the CTX APIs."""
+
+
+class BatchChunkError(CTXError):
+    """Error for a chunk of a batched call that could not be retrieved."""
+
+    def __init__(self, index: int, chunk: list, error: Exception):
+        self.index = index
+        self.chunk = chunk
+        self.error = error
+        super().__init__(
+            f"Chunk {index} ({len(chunk)} items) of batched call failed: {error!r}"
+        )
+
+
+class CassetteMissError(CTXError):
+    """Error for a request that is not recorded on the cassette being replayed."""
+
+    def __init__(self, method: str, url: str):
+        self.method = method
+        self.url = url
+        super().__init__(f"No recorded response for {method} {url}")
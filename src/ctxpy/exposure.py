@@ -1,11 +1,12 @@
 """Access the Exposure endpoints of the CTX API."""
 
-from time import sleep
-from typing import Optional
+import json
+from typing import Iterator, Optional
 
+import pandas as pd
 from pandas.api.types import is_list_like
 
-from .base import CTXConnection, ResponseTransformer
+from .base import CTXConnection
 
 
 class Exposure(CTXConnection):
@@ -24,6 +25,10 @@ class Exposure(CTXConnection):
     x_api_key : Optional[str]
         A personal key for using CCTE's APIs, if left blank, it assumes a key is
         already stored in ~/.config/ccte_api/config.toml
+    **kwargs
+        Connection options passed on to CTXConnection, e.g. `session` or
+        `pool_maxsize`. Connections created with the same options share one pooled
+        HTTP session.
 
     Returns
     -------
@@ -47,29 +52,30 @@ class Exposure(CTXConnection):
 
     KIND = "exposure"
 
-    def __init__(self, x_api_key: Optional[str] = None):
-        super().__init__(x_api_key=x_api_key)
+    def __init__(self, x_api_key: Optional[str] = None, **kwargs):
+        super().__init__(x_api_key=x_api_key, **kwargs)
 
-    def _batch(self, endpoint: str, query: str):
-        """
-        There are currently no batch searches for the `search_qsurs` and `search_mmdb`
-        methods. This function allows a list of dtxsids to be sumitted to the
-        `search_qsurs` method and run each dtxsid as its own get call to the
-        CTXConnection. While the same could be done for the `search_mmdb` method, it is
-        not yet implemented because of the bandwidth/memory that is required for a call
-        of a single medium or chemical to that endpoint.
-        """
+    def _search_cpdat_call(self, vocab_name, dtxsid, batch_size=200) -> dict:
+        options = {
+            "fc": "functional-use/search/by-dtxsid",
+            "puc": "product-data/search/by-dtxsid",
+            "lpk": "list-presence/search/by-dtxsid",
+        }
 
-        ## Remove duplicated DTXSIDs
-        query = list(set(query))
+        if vocab_name not in options.keys():
+            raise KeyError(f"Value {vocab_name} is invalid option for argument `by`.")
 
-        df = []
-        for q in query:
-            df.extend(self._request(endpoint=endpoint, query=q))
-            sleep(0.1)
-        return df
+        endpoint = f"{self.KIND}/{options[vocab_name]}/"
+        return {
+            "endpoint": endpoint,
+            "query": dtxsid,
+            "batch_size": batch_size,
+            "bracketed": True,
+        }
 
-    def search_cpdat(self, vocab_name, dtxsid, batch_size=200):
+    def search_cpdat(
+        self, vocab_name, dtxsid, batch_size=200, columns=None, sink=None
+    ):
         """
         Search for CPDat information by CPDat vocabulary and DTXSID(s).
 
@@ -90,6 +96,13 @@ class Exposure(CTXConnection):
             If string, then a single DTXSID is expected. If list like, then a list of
             DTXSIDs is expected.
 
+        columns : list of str or None, default None
+            Fields to keep. Other fields are never copied into the DataFrame.
+
+        sink : ctxpy.sink.DatasetSink or None, default None
+            If given, each chunk of results is written to this dataset as soon as it
+            is received, and the sink is returned instead of a DataFrame.
+
         Return
         ------
         pandas DataFrame
@@ -131,23 +144,48 @@ class Exposure(CTXConnection):
         5   76175  DTXSID7020182  ...                         Europe; Food contact items
         """
 
-        options = {
-            "fc": "functional-use/search/by-dtxsid",
-            "puc": "product-data/search/by-dtxsid",
-            "lpk": "list-presence/search/by-dtxsid",
-        }
+        call = self._search_cpdat_call(
+            vocab_name=vocab_name, dtxsid=dtxsid, batch_size=batch_size
+        )
+        if sink is not None:
+            return self._write_sink(sink=sink, call=call, columns=columns)
+        if self.columnar:
+            return self._collect(call=call, columns=columns)
+        info = super(Exposure, self).ctx_call(**call)
 
-        if vocab_name not in options.keys():
-            raise KeyError(f"Value {vocab_name} is invalid option for argument `by`.")
+        return self._to_df(info, endpoint=call["endpoint"], columns=columns)
 
-        endpoint = f"{self.KIND}/{options[vocab_name]}/"
-        info = super(Exposure, self).ctx_call(
-            endpoint=endpoint, query=dtxsid, batch_size=batch_size, bracketed=True
+    def iter_search_cpdat(
+        self, vocab_name, dtxsid, batch_size=200, columns=None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Search CPDat like `search_cpdat`, yielding a DataFrame per chunk of DTXSIDs.
+
+        Takes the same arguments as `search_cpdat`. A list of DTXSIDs is split into
+        chunks of `batch_size`, and each chunk's results are yielded as soon as they
+        are received.
+
+        Yields
+        ------
+        pandas DataFrame
+            CPDat information for one chunk of `dtxsid`.
+        """
+
+        call = self._search_cpdat_call(
+            vocab_name=vocab_name, dtxsid=dtxsid, batch_size=batch_size
         )
+        for info in self.iter_ctx_call(**call):
+            yield self._to_df(info, endpoint=call["endpoint"], columns=columns)
 
-        return ResponseTransformer(info).to_df()
+    def _search_qsurs_call(self, dtxsid) -> dict:
+        ## Make sure its a list-like objects of strings
+        if (not is_list_like(dtxsid)) and (not isinstance(dtxsid, str)):
+            raise TypeError("`dtxsid` must either be string or list-like of strings.")
+
+        endpoint = f"{self.KIND}/functional-use/probability/search/by-dtxsid/"
+        return {"endpoint": endpoint, "query": dtxsid}
 
-    def search_qsurs(self, dtxsid):
+    def search_qsurs(self, dtxsid, columns=None, max_workers=None):
         """
         Search for Quantitative Structure-Use Relationship (QSUR) predictions by
         DTXSID(s).
@@ -160,7 +198,16 @@ class Exposure(CTXConnection):
         ----------
         dtxsid : string or list-like
             If string, then a single DTXSID is expected. If list like, then a list of
-            DTXSIDs is expected.
+            DTXSIDs is expected. There is no batch search for QSURs, so each DTXSID
+            is requested on its own (see `max_workers`). A DTXSID whose request fails
+            doesn't stop the others; its error is kept in `failed_items`.
+        columns : list of str or None, default None
+            Fields to keep. Other fields are never copied into the DataFrame.
+        max_workers : int or None, default None
+            Number of DTXSIDs requested at the same time. Defaults to the
+            connection's `max_workers`. Requests are still paced by the connection's
+            rate limiter, 100 per second with the default limiter (see
+            `set_rate_limit`), so more workers only help up to that rate.
 
         Return
         ------
@@ -208,19 +255,51 @@ class Exposure(CTXConnection):
         18  DTXSID2021868        skin_conditioner       0.0289
         19  DTXSID2021868         skin_protectant       0.1560
         """
-        endpoint = f"{self.KIND}/functional-use/probability/search/by-dtxsid/"
-
-        ## Make sure its a list-like objects of strings
+        call = self._search_qsurs_call(dtxsid=dtxsid)
         if is_list_like(dtxsid):
-            info = self._batch(endpoint=endpoint, query=dtxsid)
-        elif isinstance(dtxsid, str):
-            info = super(Exposure, self).ctx_call(endpoint=endpoint, query=dtxsid)
+            info = self._fan_out(**call, max_workers=max_workers)
         else:
-            raise TypeError("`dtxsid` must either be string or list-like of strings.")
+            info = super(Exposure, self).ctx_call(**call)
 
-        return ResponseTransformer(info).to_df()
+        return self._to_df(info, endpoint=call["endpoint"], columns=columns)
 
-    def search_mmdb(self, by, query, aggregate=False):
+    def _search_mmdb_call(self, by, query) -> dict:
+        if is_list_like(query):
+            raise NotImplementedError(
+                "Batch mode has not been implemented for searching MMDB."
+            )
+
+        options = {
+            "medium": "/mmdb/single-sample/by-medium",
+            "aggregate": "/mmdb/aggregate/by-medium",
+            "dtxsid": "/mmdb/single-sample/by-dtxsid/",
+        }
+        if by not in options.keys():
+            raise KeyError(f"Value {by} is invalid option for argument `by`.")
+
+        endpoint = f"{self.KIND}{options[by]}"
+        if by == "dtxsid":
+            params = None
+        else:
+            params = {"medium": query}
+        return {"endpoint": endpoint, "query": query, "params": params}
+
+    def _mmdb_to_df(self, by, info, endpoint=None, columns=None):
+        ## Medium searches are paged, with records under "data"
+        if by == "dtxsid":
+            return self._to_df(info, endpoint=endpoint, columns=columns)
+        df = self._to_df(info["data"], endpoint=endpoint, columns=columns)
+        metadata = {k: v for k, v in info.items() if k != "data"}
+        if isinstance(df, pd.DataFrame):
+            df.attrs.update(metadata)
+        else:
+            ## pyarrow.Table schema metadata only holds strings
+            df = df.replace_schema_metadata(
+                {k: json.dumps(v) for k, v in metadata.items()}
+            )
+        return df
+
+    def search_mmdb(self, by, query, aggregate=False, columns=None):
         """
         Search the Multimedia Monitoring Database (MMDB) either via medium name or via
         DTXSID(s).
@@ -239,6 +318,9 @@ class Exposure(CTXConnection):
             When searching MMDB only a single medium or chemical is searchable due to
             call time contraints.
 
+        columns : list of str or None, default None
+            Fields to keep. Other fields are never copied into the DataFrame.
+
         Return
         ------
         pandas DataFrame
@@ -258,38 +340,25 @@ class Exposure(CTXConnection):
         >>> expo.search_mmdb(by='dtxsid',query='DTXSID7020182')
 
         """
-        if is_list_like(query):
-            raise NotImplementedError(
-                "Batch mode has not been implemented for searching MMDB."
-            )
+        call = self._search_mmdb_call(by=by, query=query)
+        info = super(Exposure, self).ctx_call(**call)
+
+        return self._mmdb_to_df(
+            by=by, info=info, endpoint=call["endpoint"], columns=columns
+        )
 
+    def _search_exposures_call(self, by, dtxsid) -> dict:
         options = {
-            "medium": "/mmdb/single-sample/by-medium",
-            "aggregate": "/mmdb/aggregate/by-medium",
-            "dtxsid": "/mmdb/single-sample/by-dtxsid/",
+            "pathways": "seem/general/search/by-dtxsid",
+            "seem": "seem/demographic/search/by-dtxsid",
         }
-        endpoint = f"{self.KIND}{options[by]}"
-
-        if by == "dtxsid":
-            params = None
-            info = super(Exposure, self).ctx_call(
-                endpoint=endpoint, query=query, params=params
-            )
-            info = ResponseTransformer(info).to_df()
-        elif (by in {"medium","aggregate"}):
-            params = {"medium": query}
-            info = super(Exposure, self).ctx_call(
-                endpoint=endpoint, query=query, params=params
-            )
-            info = ResponseTransformer(info["data"]).to_df()
-            meta = {k: v for k, v in info.items() if k != "data"}
-            info.attrs = meta
-        else:
-            raise ValueError(f"{by} not a valid option for `by` parameter.")
+        if by not in options.keys():
+            raise KeyError(f"Value {by} is invalid option for argument `by`.")
 
-        return info
+        endpoint = f"{self.KIND}/{options[by]}/"
+        return {"endpoint": endpoint, "query": dtxsid}
 
-    def search_exposures(self, by, dtxsid):
+    def search_exposures(self, by, dtxsid, columns=None):
         """
         Search for exposure estimates by DTXSID.
 
@@ -317,6 +386,9 @@ class Exposure(CTXConnection):
             If string, then a single DTXSID is expected. If list like, then a list of
             DTXSIDs is expected.
 
+        columns : list of str or None, default None
+            Fields to keep. Other fields are never copied into the DataFrame.
+
         Return
         ------
         pandas DataFrame
@@ -352,20 +424,16 @@ class Exposure(CTXConnection):
 
         """
 
-        options = {
-            "pathways": "seem/general/search/by-dtxsid",
-            "seem": "seem/demographic/search/by-dtxsid",
-        }
-        if by not in options.keys():
-            raise KeyError(f"Value {by} is invalid option for argument `by`.")
-
-        endpoint = f"{self.KIND}/{options[by]}/"
+        call = self._search_exposures_call(by=by, dtxsid=dtxsid)
+        info = super(Exposure, self).ctx_call(**call)
 
-        info = super(Exposure, self).ctx_call(endpoint=endpoint, query=dtxsid)
+        return self._to_df(info, endpoint=call["endpoint"], columns=columns)
 
-        return ResponseTransformer(info).to_df()
+    def _search_httk_call(self, dtxsid) -> dict:
+        endpoint = f"{self.KIND}/httk/search/by-dtxsid/"
+        return {"endpoint": endpoint, "query": dtxsid}
 
-    def search_httk(self, dtxsid):
+    def search_httk(self, dtxsid, columns=None):
         """
         Search for High-Throughput Toxicokinetics data by DTXSID.
 
@@ -375,6 +443,8 @@ class Exposure(CTXConnection):
         dtxsid : string or list-like
             If string, then a single DTXSID is expected. If list like, then a list of
             DTXSIDs is expected.
+        columns : list of str or None, default None
+            Fields to keep. Other fields are never copied into the DataFrame.
 
         Return
         ------
@@ -398,9 +468,9 @@ class Exposure(CTXConnection):
 
         """
 
-        endpoint = f"{self.KIND}/httk/search/by-dtxsid/"
-        info = super(Exposure, self).ctx_call(endpoint=endpoint, query=dtxsid)
-        return ResponseTransformer(info).to_df()
+        call = self._search_httk_call(dtxsid=dtxsid)
+        info = super(Exposure, self).ctx_call(**call)
+        return self._to_df(info, endpoint=call["endpoint"], columns=columns)
 
     def get_mmdb_vocabulary(self):
         """
@@ -428,7 +498,19 @@ class Exposure(CTXConnection):
 
         endpoint = f"{self.KIND}/mmdb/mediums"
         info = super(Exposure, self).ctx_call(endpoint=endpoint)
-        return ResponseTransformer(info).to_df()
+        return self._to_df(info, endpoint=endpoint)
+
+    def _get_cpdat_vocabulary_call(self, vocab_name) -> dict:
+        options = {
+            "fc": "functional-use/category",
+            "lpk": "list-presence/tags",
+            "puc": "product-data/puc",
+        }
+
+        if vocab_name not in options.keys():
+            raise KeyError(f"{vocab_name} is invalid Exposure vocabulary name.")
+
+        return {"endpoint": f"{self.KIND}/{options[vocab_name]}"}
 
     def get_cpdat_vocabulary(self, vocab_name):
         """
@@ -487,15 +569,6 @@ class Exposure(CTXConnection):
         3   42  Formulation  Cleaning products and household care  ... anti-static sp...
         4  291  Formulation  Cleaning products and household care  ... Includes urina...
         """
-        options = {
-            "fc": "functional-use/category",
-            "lpk": "list-presence/tags",
-            "puc": "product-data/puc",
-        }
-
-        if vocab_name not in options.keys():
-            raise KeyError(f"{vocab_name} is invalid Exposure vocabulary name.")
-
-        endpoint = f"{self.KIND}/{options[vocab_name]}"
-        info = super(Exposure, self).ctx_call(endpoint=endpoint)
-        return ResponseTransformer(info).to_df()
+        call = self._get_cpdat_vocabulary_call(vocab_name=vocab_name)
+        info = super(Exposure, self).ctx_call(**call)
+        return self._to_df(info, endpoint=call["endpoint"])
@@ -1,10 +1,13 @@
 """Access the Hazard endpoints of the CTX API."""
 
-from typing import Iterable, Optional
+from typing import Iterable, Iterator, Optional
 
+import pandas as pd
 from pandas.api.types import is_list_like
 
-from .base import CTXConnection, ResponseTransformer
+from .arrow import pa
+from .base import CTXConnection
+from .utils import chunker
 
 
 class Hazard(CTXConnection):
@@ -18,6 +21,10 @@ class Hazard(CTXConnection):
     x_api_key : Optional[str]
         A personal key for using CCTE's APIs, if left blank, it assumes a key is
         already stored in ~/.config/ccte_api/config.toml
+    **kwargs
+        Connection options passed on to CTXConnection, e.g. `session` or
+        `pool_maxsize`. Connections created with the same options share one pooled
+        HTTP session.
 
     Returns
     -------
@@ -41,8 +48,13 @@ class Hazard(CTXConnection):
 
     KIND = "hazard"
 
-    def __init__(self, x_api_key: Optional[str] = None):
-        super().__init__(x_api_key=x_api_key)
+    ## Domains of `profile`: ToxValDB searches (`search_toxvaldb`'s `by`), which have
+    ## batch routes, and other resources, which are searched one DTXSID at a time
+    TOXVAL_DOMAINS = ("all", "cancer", "skin-eye", "genetox", "genetox-summary")
+    OTHER_DOMAINS = ("pprtv", "hawc", "iris", "adme-ivive")
+
+    def __init__(self, x_api_key: Optional[str] = None, **kwargs):
+        super().__init__(x_api_key=x_api_key, **kwargs)
         self.batch_size = 200
 
     def __str__(self):
@@ -51,9 +63,34 @@ class Hazard(CTXConnection):
         else:
             return f"CTXConnection.{str.title(self.kind)}"
 
-    def search_toxvaldb(self, by: str, dtxsid: str):
+    def _search_toxvaldb_call(self, by, dtxsid) -> dict:
+        ## Make sure its a list-like objects of strings
+        if (not is_list_like(dtxsid)) and (not isinstance(dtxsid, str)):
+            raise TypeError("`dtxsid` must either be string or list-like of strings.")
+
+        options = {
+            "cancer": "cancer-summary",
+            "skin-eye": "skin-eye",
+            "all": "toxval",
+            "genetox": "genetox/details",
+            "genetox-summary": "genetox/summary",
+        }
+
+        if by not in options.keys():
+            raise KeyError(f"Value {by} is invalid option for argument `by`.")
+
+        endpoint = f"{self.KIND}/{options[by]}/search/by-dtxsid/"
+        call = {"endpoint": endpoint, "query": dtxsid, "batch_size": self.batch_size}
+        if is_list_like(dtxsid):
+            ## Lists longer than `batch_size` are meant to be split into chunks
+            call["batched"] = True
+        return call
+
+    def search_toxvaldb(
+        self, by: str, dtxsid, columns: Optional[list] = None, sink=None
+    ):
         """
-        Search ToxValDb for hazard information for a single chemical.
+        Search ToxValDb for hazard information for one or more chemicals.
 
         Retrieve a specific sub-domain of hazard information (from EPA's ToxValDB and
         other hazard resources) for a DTXSID identifier. If only the chemical name or
@@ -66,8 +103,17 @@ class Hazard(CTXConnection):
             The type of search method to use. Options are "all", "human", "eco",
             "skin-eye", "cancer", or "genetox".
 
-        dtxsid : string
-            A valid DSSTox Substance Identifier (DTXSID)
+        dtxsid : string or list-like
+            A valid DSSTox Substance Identifier (DTXSID), or a list-like of them.
+            Lists are sent as batch (POST) searches, in chunks of `batch_size`, and
+            every record carries its `dtxsid`.
+
+        columns : list of str or None, default None
+            Fields to keep. Other fields are never copied into the DataFrame.
+
+        sink : ctxpy.sink.DatasetSink or None, default None
+            If given, each chunk of results is written to this dataset as soon as it
+            is received, and the sink is returned instead of a DataFrame.
 
 
         Return
@@ -92,25 +138,50 @@ class Hazard(CTXConnection):
 
         """
 
+        call = self._search_toxvaldb_call(by=by, dtxsid=dtxsid)
+        if sink is not None:
+            return self._write_sink(sink=sink, call=call, columns=columns)
+        if self.columnar:
+            return self._collect(call=call, columns=columns)
+        info = super(Hazard, self).ctx_call(**call)
+
+        return self._to_df(info, endpoint=call["endpoint"], columns=columns)
+
+    def _search_toxrefdb_call(self, by, domain, query) -> dict:
+        domains = ["effects", "summary", "data", "observations", "all"]
         options = {
-            "cancer": "cancer-summary",
-            "skin-eye": "skin-eye",
-            "all": "toxval",
-            "genetox": "genetox/details",
-            "genetox-summary": "genetox/summary",
+            "study-type": "by-study-type",
+            "dtxsid": "by-dtxsid",
+            "study-id": "by-study-id",
         }
 
         if by not in options.keys():
             raise KeyError(f"Value {by} is invalid option for argument `by`.")
 
-        endpoint = f"{self.KIND}/{options[by]}/search/by-dtxsid/"
-        info = super(Hazard, self).ctx_call(
-            endpoint=endpoint, query=dtxsid, batch_size=self.batch_size
-        )
+        if domain not in domains:
+            raise ValueError(f"Value {domain} is invalid option for argument `domain`.")
+
+        if isinstance(query, int):
+            if by != "study-id":
+                raise TypeError("`query` is integer type, but domain is not 'study-id'")
+            query = str(query)
+
+        if (is_list_like(query)) and (by != "dtxsid"):
+            raise NotImplementedError(f"Batch searching is not available for {by}")
 
-        return ResponseTransformer(info).to_df()
+        endpoint = f"{self.KIND}/toxref/{domain}/search/{options[by]}/"
+        endpoint = endpoint.replace("/all", "")
 
-    def search_toxrefdb(self, by: str, domain: str, query: Iterable[str]):
+        return {"endpoint": endpoint, "query": query, "batch_size": self.batch_size}
+
+    def search_toxrefdb(
+        self,
+        by: str,
+        domain: str,
+        query: Iterable[str],
+        columns: Optional[list] = None,
+        sink=None,
+    ):
         """
         Search for hazard information for multiple chemicals.
 
@@ -136,6 +207,13 @@ class Hazard(CTXConnection):
             "OTH" (other), "REP" (reproductive), "SAC" (sub-acute),
             or "SUB" (sub-chronic)
 
+        columns : list of str or None, default None
+            Fields to keep. Other fields are never copied into the DataFrame.
+
+        sink : ctxpy.sink.DatasetSink or None, default None
+            If given, each chunk of results is written to this dataset as soon as it
+            is received, and the sink is returned instead of a DataFrame.
+
         Return
         ------
         pandas DataFrame
@@ -156,62 +234,248 @@ class Hazard(CTXConnection):
         4  717897  <NA>  DOE ECORISK  DTXSID7021360  ...        eco
         """
 
-        domains = ["effects", "summary", "data", "observations", "all"]
-        options = {
-            "study-type": "by-study-type",
-            "dtxsid": "by-dtxsid",
-            "study-id": "by-study-id",
-        }
-
-        if by not in options.keys():
-            raise KeyError(f"Value {by} is invalid option for argument `by`.")
-
-        if domain not in domains:
-            raise ValueError(f"Value {domain} is invalid option for argument `domain`.")
-
-        if isinstance(query, int):
-            if by != "study-id":
-                raise TypeError("`query` is integer type, but domain is not 'study-id'")
-            query = str(query)
-
-        if (is_list_like(query)) and (by != "dtxsid"):
-            raise NotImplementedError(f"Batch searching is not available for {by}")
+        call = self._search_toxrefdb_call(by=by, domain=domain, query=query)
+        if sink is not None:
+            return self._write_sink(sink=sink, call=call, columns=columns)
+        if self.columnar:
+            return self._collect(call=call, columns=columns)
+        info = super(Hazard, self).ctx_call(**call)
+
+        return self._to_df(info, endpoint=call["endpoint"], columns=columns)
+
+    def iter_search_toxrefdb(
+        self,
+        by: str,
+        domain: str,
+        query: Iterable[str],
+        columns: Optional[list] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Search ToxRefDB like `search_toxrefdb`, yielding a DataFrame per chunk.
 
-        endpoint = f"{self.KIND}/toxref/{domain}/search/{options[by]}/"
-        endpoint = endpoint.replace("/all", "")
+        Takes the same arguments as `search_toxrefdb`. A batch of DTXSIDs is split
+        into chunks of `batch_size`, and each chunk's results are yielded as soon as
+        they are received.
 
-        info = super(Hazard, self).ctx_call(
-            endpoint=endpoint, query=query, batch_size=self.batch_size
-        )
+        Yields
+        ------
+        pandas DataFrame
+            Hazard data for one chunk of `query`.
+        """
 
-        return ResponseTransformer(info).to_df()
+        call = self._search_toxrefdb_call(by=by, domain=domain, query=query)
+        for info in self.iter_ctx_call(**call):
+            yield self._to_df(info, endpoint=call["endpoint"], columns=columns)
 
-    def _search_other(self, other, dtxsid):
+    def _search_other_call(self, other, dtxsid) -> dict:
         endpoint = f"/{self.KIND}/{other}/search/by-dtxsid/"
-        info = super(Hazard, self).ctx_call(endpoint=endpoint, query=dtxsid)
-        return ResponseTransformer(info).to_df()
+        return {"endpoint": endpoint, "query": dtxsid}
+
+    def _search_other(self, other, dtxsid, columns=None, max_workers=None):
+        ## There are no batch searches for these endpoints, so each DTXSID of a list
+        ## is requested on its own
+        call = self._search_other_call(other=other, dtxsid=dtxsid)
+        if is_list_like(dtxsid):
+            info = self._fan_out(**call, max_workers=max_workers)
+        else:
+            info = super(Hazard, self).ctx_call(**call)
+        return self._to_df(info, endpoint=call["endpoint"], columns=columns)
 
-    def search_pprtv(self, dtxsid: str):
+    def search_pprtv(
+        self, dtxsid, columns: Optional[list] = None, max_workers: Optional[int] = None
+    ):
         """
         get /hazard/pprtv/search/by-dtxsid/{dtxsid}
+
+        `dtxsid` can also be a list-like of DTXSIDs, requested up to `max_workers` at
+        a time (see `Exposure.search_qsurs`). Records are tagged with their `dtxsid`.
         """
 
-        return self._search_other(other="pprtv", dtxsid=dtxsid)
+        return self._search_other(
+            other="pprtv", dtxsid=dtxsid, columns=columns, max_workers=max_workers
+        )
 
-    def search_hawc(self, dtxsid: str):
+    def search_hawc(
+        self, dtxsid, columns: Optional[list] = None, max_workers: Optional[int] = None
+    ):
         """
         /hazard/hawc/search/by-dtxsid/{dtxsid}
+
+        `dtxsid` can also be a list-like of DTXSIDs, requested up to `max_workers` at
+        a time (see `Exposure.search_qsurs`). Records are tagged with their `dtxsid`.
         """
-        return self._search_other(other="hawc", dtxsid=dtxsid)
+        return self._search_other(
+            other="hawc", dtxsid=dtxsid, columns=columns, max_workers=max_workers
+        )
 
-    def search_iris(self, dtxsid: str):
+    def search_iris(
+        self, dtxsid, columns: Optional[list] = None, max_workers: Optional[int] = None
+    ):
         """
         /hazard/iris/search/by-dtxsid/{dtxsid}
+
+        `dtxsid` can also be a list-like of DTXSIDs, requested up to `max_workers` at
+        a time (see `Exposure.search_qsurs`). Records are tagged with their `dtxsid`.
         """
-        return self._search_other(other="iris", dtxsid=dtxsid)
+        return self._search_other(
+            other="iris", dtxsid=dtxsid, columns=columns, max_workers=max_workers
+        )
 
-    def search_adme_ivive(self, dtxsid: str):
+    def search_adme_ivive(
+        self, dtxsid, columns: Optional[list] = None, max_workers: Optional[int] = None
+    ):
         """
         /hazard/adme-ivive/search/by-dtxsid/{dtxsid}
+
+        `dtxsid` can also be a list-like of DTXSIDs, requested up to `max_workers` at
+        a time (see `Exposure.search_qsurs`). Records are tagged with their `dtxsid`.
+        """
+        return self._search_other(
+            other="adme-ivive", dtxsid=dtxsid, columns=columns, max_workers=max_workers
+        )
+
+    def _profile_requests(self, dtxsid: list, domains: list) -> list:
+        ## (domain, DTXSIDs, request) of every request a profile needs
+        calls = []
+        for domain in domains:
+            if domain in self.TOXVAL_DOMAINS:
+                call = self._search_toxvaldb_call(by=domain, dtxsid=dtxsid)
+                calls.extend(
+                    (domain, chunk, {"endpoint": call["endpoint"], "query": chunk})
+                    for chunk in chunker(dtxsid, call["batch_size"])
+                )
+            else:
+                call = self._search_other_call(other=domain, dtxsid=dtxsid)
+                calls.extend(
+                    (domain, [d], {"endpoint": call["endpoint"], "query": d})
+                    for d in dtxsid
+                )
+        return calls
+
+    def _profile_results(
+        self,
+        calls: list,
+        results: list,
+        domains: list,
+        how: str = "dict",
+        columns: Optional[list] = None,
+    ):
+        ## Assemble the responses to a profile's requests into a frame per domain
+        records = {domain: [] for domain in domains}
+        endpoints = {}
+        errors = {}
+        for (domain, chunk, request), (info, err) in zip(calls, results):
+            endpoints[domain] = request["endpoint"]
+            errors.update({(domain, d): err for d in chunk})
+            if err is not None:
+                continue
+            if len(chunk) == 1:
+                records[domain].extend(self._tag_records(info, item=chunk[0]))
+            else:
+                records[domain].extend(info)
+        self._warn_failed_items(errors)
+
+        frames = {
+            domain: self._to_df(info, endpoint=endpoints.get(domain), columns=columns)
+            for domain, info in records.items()
+        }
+        if how == "dict":
+            return frames
+        if self.dtype_backend == "pyarrow_table":
+            return pa.concat_tables(
+                [
+                    table.add_column(
+                        0, "domain", pa.array([domain] * table.num_rows, pa.string())
+                    )
+                    for domain, table in frames.items()
+                ],
+                promote_options="permissive",
+            )
+        return (
+            pd.concat(frames, names=["domain"])
+            .reset_index(level="domain")
+            .reset_index(drop=True)
+        )
+
+    def _profile_args(self, dtxsid, domains, how) -> tuple:
+        ## Validate `profile` arguments
+        if how not in ("dict", "long"):
+            raise ValueError(f"Value {how} is invalid option for argument `how`.")
+        if isinstance(dtxsid, str):
+            dtxsid = [dtxsid]
+        elif not is_list_like(dtxsid):
+            raise TypeError("`dtxsid` must either be string or list-like of strings.")
+        if domains is None:
+            domains = self.TOXVAL_DOMAINS + self.OTHER_DOMAINS
+        elif isinstance(domains, str):
+            domains = [domains]
+        for domain in domains:
+            if domain not in self.TOXVAL_DOMAINS + self.OTHER_DOMAINS:
+                raise KeyError(
+                    f"Value {domain} is invalid option for argument `domains`."
+                )
+        ## Remove duplicates, keeping the order they were given in
+        return list(dict.fromkeys(dtxsid)), list(dict.fromkeys(domains))
+
+    def profile(
+        self,
+        dtxsid,
+        domains: Optional[Iterable[str]] = None,
+        how: str = "dict",
+        columns: Optional[list] = None,
+        max_workers: Optional[int] = None,
+    ):
         """
-        return self._search_other(other="adme-ivive", dtxsid=dtxsid)
+        Fetch the hazard data of many chemicals from many hazard resources at once.
+
+        Every (domain, chemical) request is scheduled on one thread pool instead of
+        searching each resource in turn. ToxValDB domains are searched in batches of
+        `batch_size` DTXSIDs; the other resources, which have no batch search, one
+        DTXSID at a time. A request that fails doesn't stop the others: its error is
+        kept in `failed_items`, keyed on (domain, DTXSID).
+
+        Parameters
+        ----------
+        dtxsid : string or list-like
+            A DTXSID, or a list-like of DTXSIDs.
+
+        domains : list of str or None, default None
+            Resources to search: any of the `by` options of `search_toxvaldb`
+            ("all", "cancer", "skin-eye", "genetox", "genetox-summary") and "pprtv",
+            "hawc", "iris" and "adme-ivive". Defaults to all of them.
+
+        how : {"dict", "long"}, default "dict"
+            Whether to return a DataFrame per domain, or one DataFrame of every
+            domain's records with a leading `domain` column.
+
+        columns : list of str or None, default None
+            Fields to keep. Other fields are never copied into the DataFrames.
+
+        max_workers : int or None, default None
+            Number of requests sent at the same time, all paced by the connection's
+            rate limiter. Defaults to the connection's `max_workers`.
+
+        Return
+        ------
+        dict of pandas DataFrame, or pandas DataFrame
+            Hazard data of each domain, keyed on domain, or stacked in one DataFrame.
+
+        Examples
+        --------
+        >>> haz = ctx.Hazard(max_workers=8)
+        >>> profile = haz.profile(dtxsids, domains=['cancer', 'iris', 'pprtv'])
+        >>> profile['iris']
+        """
+
+        dtxsid, domains = self._profile_args(dtxsid=dtxsid, domains=domains, how=how)
+        calls = self._profile_requests(dtxsid=dtxsid, domains=domains)
+        results = self._send_all(
+            [request for _, _, request in calls], max_workers=max_workers
+        )
+        return self._profile_results(
+            calls=calls,
+            results=results,
+            domains=domains,
+            how=how,
+            columns=columns,
+        )
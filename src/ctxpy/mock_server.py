@@ -0,0 +1,375 @@
+"""Local stand-in for the CTX APIs, for load testing and offline benchmarks.
+
+The server answers the endpoints used by Chemical, ChemicalList, Exposure and Hazard
+with synthetic, deterministic payloads. Latency, server errors, 429 (Too Many
+Requests) responses and payload size can all be injected.
+
+Run it from the command line with ``python -m ctxpy.mock_server --port 8080``, or
+from Python:
+
+>>> with MockCTXServer(latency=0.05, throttle_rate=0.1) as server:
+...     chem = ctx.Chemical(x_api_key='mock', host=server.url)
+...     chem.details(by='batch-dtxsid', query=dtxsids)
+
+Classes
+-------
+MockCTXServer: threaded HTTP server emulating the CTX APIs
+
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Union
+from urllib.parse import parse_qs, unquote, urlsplit
+
+## Number of fields returned for each projection; other projections return them all
+PROJECTION_FIELDS = {
+    "compact": 3,
+    "chemicalidentifier": 5,
+    "chemicalstructure": 5,
+    "chemicallistname": 2,
+    "chemicallistwithdtxsids": 4,
+}
+
+_DOMAINS = ("chemical", "exposure", "hazard")
+_SINGLE_DETAIL = re.compile(r"^chemical/detail/search/by-dtx[sc]id/.+")
+_MMDB_MEDIUM = re.compile(r"^exposure/mmdb/(single-sample|aggregate)/by-medium")
+_VALUE = re.compile(
+    r"^.*?/(by-[a-z-]+|search/(equal|start-with|contain))/(?P<value>.+)$"
+)
+
+
+class MockCTXServer:
+    """
+    Threaded HTTP server that emulates the CTX APIs with synthetic data.
+
+    GET requests return records for the identifier at the end of the path; POST
+    requests accept both bracketed (``["A","B"]``) and newline-separated bodies and
+    return records for every identifier. The `projection` parameter limits the
+    number of fields returned, as the real API does.
+
+    Parameters
+    ----------
+    host : str, default "127.0.0.1"
+        Address to listen on.
+    port : int, default 0
+        Port to listen on. 0 picks a free port.
+    latency : float or tuple of float, default 0.0
+        Seconds to wait before answering a request, or a (min, max) range to draw
+        the wait from.
+    error_rate : float, default 0.0
+        Fraction of requests answered with 500 (Internal Server Error).
+    throttle_rate : float, default 0.0
+        Fraction of requests answered with 429 (Too Many Requests).
+    retry_after : float or None, default 1
+        Retry-After header sent with 429 responses.
+    records_per_item : int, default 1
+        Records returned for each requested identifier.
+    extra_fields : int, default 0
+        Extra string fields added to every record.
+    field_size : int, default 8
+        Length of each extra string field.
+    mmdb_records : int, default 1000
+        Records returned by MMDB searches by medium.
+    max_items : int or None, default None
+        Largest POST batch accepted. Larger batches are answered with 413 (Content
+        Too Large).
+    seed : int or None, default None
+        Seed of the random faults and latencies.
+
+    Attributes
+    ----------
+    url : str
+        Base URL of the API, to be passed as `host` to a connection.
+    stats : collections.Counter
+        Number of requests and identifiers served, and of faults injected.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Union[float, tuple] = 0.0,
+        error_rate: float = 0.0,
+        throttle_rate: float = 0.0,
+        retry_after: Optional[float] = 1,
+        records_per_item: int = 1,
+        extra_fields: int = 0,
+        field_size: int = 8,
+        mmdb_records: int = 1000,
+        max_items: Optional[int] = None,
+        seed: Optional[int] = None,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.records_per_item = records_per_item
+        self.extra_fields = extra_fields
+        self.field_size = field_size
+        self.mmdb_records = mmdb_records
+        self.max_items = max_items
+        self.stats = Counter()
+        self._mmdb_bodies = {}
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.mock = self
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/ctx-api/"
+
+    def start(self):
+        """Start serving requests on a background thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever,
+                kwargs={"poll_interval": 0.05},
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving requests and close the listening socket."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _roll(self) -> float:
+        with self._lock:
+            return self._random.random()
+
+    def _delay(self) -> float:
+        if isinstance(self.latency, tuple):
+            with self._lock:
+                return self._random.uniform(*self.latency)
+        return self.latency
+
+    def _count(self, **counts):
+        with self._lock:
+            self.stats.update(counts)
+
+    def _record(self, endpoint: str, field: str, item: str, n: int, projection):
+        ## Deterministic synthetic record for one identifier
+        seed = sum(map(ord, f"{endpoint}{item}")) + n
+        record = {
+            field: item,
+            "id": seed,
+            "preferredName": f"Chemical {item}",
+            "casrn": f"{seed % 9999}-{seed % 97:02d}-{seed % 10}",
+            "value": round((seed % 1000) / 7, 4),
+            "units": "mg/kg-day",
+            "source": "-" if seed % 5 == 0 else "ToxVal",
+            "qualifier": "" if seed % 3 == 0 else "=",
+        }
+        for i in range(self.extra_fields):
+            record[f"field{i}"] = (f"{item}{i}" * self.field_size)[: self.field_size]
+        if projection in PROJECTION_FIELDS:
+            record = dict(list(record.items())[: PROJECTION_FIELDS[projection]])
+        return record
+
+    def _fault(self):
+        ## An injected 429 or 500 response, or None
+        if self._roll() < self.throttle_rate:
+            self._count(throttled=1)
+            headers = {}
+            if self.retry_after is not None:
+                headers["Retry-After"] = str(self.retry_after)
+            return HTTPStatus.TOO_MANY_REQUESTS, headers, {"title": "Too Many Requests"}
+        if self._roll() < self.error_rate:
+            self._count(errors=1)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {}, {"title": "Server Error"}
+        return None
+
+    def _get(self, endpoint: str, field: str, query: dict, projection):
+        if _MMDB_MEDIUM.match(endpoint):
+            ## MMDB responses are large, so they are only encoded once
+            self._count(items=self.mmdb_records)
+            medium = query.get("medium", ["unknown"])[0]
+            key = (endpoint, medium, projection)
+            with self._lock:
+                body = self._mmdb_bodies.get(key)
+            if body is None:
+                body = json.dumps(
+                    {
+                        "medium": medium,
+                        "totalRecords": self.mmdb_records,
+                        "data": [
+                            self._record(
+                                endpoint, "dtxsid", f"DTXSID{n:07d}", n, projection
+                            )
+                            for n in range(self.mmdb_records)
+                        ],
+                    }
+                ).encode("utf-8")
+                with self._lock:
+                    self._mmdb_bodies[key] = body
+            return body
+
+        match = _VALUE.search(endpoint)
+        item = unquote(match["value"]) if match else "DTXSID7020182"
+        self._count(items=1)
+        if _SINGLE_DETAIL.match(endpoint):
+            return self._record(endpoint, field, item, 0, projection)
+        return [
+            self._record(endpoint, field, item, n, projection)
+            for n in range(self.records_per_item)
+        ]
+
+    def respond(self, method: str, path: str, query: dict, body: bytes):
+        """
+        Build the response to a request.
+
+        Returns
+        -------
+        tuple
+            The status code, extra headers, and JSON-serializable payload (or the
+            already encoded body).
+        """
+        self._count(requests=1, **{method: 1})
+
+        delay = self._delay()
+        if delay > 0:
+            time.sleep(delay)
+        fault = self._fault()
+        if fault is not None:
+            return fault
+
+        ## The client joins the host and endpoint with a "/", and some endpoints start
+        ## with one
+        endpoint = re.sub(r"/+", "/", path).split("/ctx-api/", 1)[-1].lstrip("/")
+        if endpoint.split("/", 1)[0] not in _DOMAINS:
+            return HTTPStatus.NOT_FOUND, {}, {"title": "Not Found"}
+        projection = query.get("projection", [None])[0]
+        field = "dtxcid" if "by-dtxcid" in endpoint else "dtxsid"
+        if endpoint.startswith("chemical/search/"):
+            field = "searchValue"
+
+        if method == "GET":
+            return HTTPStatus.OK, {}, self._get(endpoint, field, query, projection)
+
+        items = _parse_body(body)
+        if (self.max_items is not None) and (len(items) > self.max_items):
+            return HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {}, {"title": "Too Large"}
+        self._count(items=len(items))
+        return HTTPStatus.OK, {}, [
+            self._record(endpoint, field, item, n, projection)
+            for item in items
+            for n in range(self.records_per_item)
+        ]
+
+
+def _parse_body(body: bytes) -> list:
+    ## Identifiers of a bracketed or newline-separated POST body
+    text = body.decode("utf-8").strip()
+    if text.startswith("["):
+        items = json.loads(text)
+    else:
+        items = [line.strip().strip('"') for line in text.splitlines()]
+    return [unquote(item) for item in items if item]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    ## Headers and body are written separately; don't let Nagle delay the body
+    disable_nagle_algorithm = True
+
+    def _handle(self, method: str):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        if not self.headers.get("x-api-key"):
+            status, headers, payload = (
+                HTTPStatus.UNAUTHORIZED,
+                {},
+                {"title": "Unauthorized"},
+            )
+        else:
+            url = urlsplit(self.path)
+            status, headers, payload = self.server.mock.respond(
+                method=method, path=url.path, query=parse_qs(url.query), body=body
+            )
+
+        if isinstance(payload, bytes):
+            data = payload
+        else:
+            data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def log_message(self, format, *args):
+        ## Keep load tests quiet
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve a local stand-in for the CTX APIs."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--records-per-item", type=int, default=1)
+    parser.add_argument("--extra-fields", type=int, default=0)
+    parser.add_argument("--mmdb-records", type=int, default=1000)
+    parser.add_argument("--max-items", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = MockCTXServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        records_per_item=args.records_per_item,
+        extra_fields=args.extra_fields,
+        mmdb_records=args.mmdb_records,
+        max_items=args.max_items,
+        seed=args.seed,
+    )
+    print(f"Serving mock CTX APIs at {server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
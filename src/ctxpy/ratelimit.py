@@ -0,0 +1,222 @@
+"""Rate limiting for calls to the CTX APIs.
+
+Classes
+-------
+RateLimiter: thread-safe, adaptive token bucket
+
+Functions
+---------
+get_rate_limiter: retrieve the process-wide rate limiter
+set_rate_limit: re-configure the process-wide rate limiter
+parse_retry_after: convert a Retry-After header to seconds
+
+"""
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http import HTTPStatus
+from typing import Optional
+
+## Default pace of the process-wide limiter: well above what a single connection sent
+## before requests were rate limited (one every 0.1 s), so that concurrent calls are
+## only slowed down once the server asks them to be, with a 429
+DEFAULT_RATE = 100.0
+DEFAULT_BURST = 100
+
+
+class RateLimiter:
+    """
+    Token bucket limiting how often requests are sent to the API server.
+
+    Tokens are added at `rate` per second, up to `burst` tokens. Every request takes
+    one token, waiting for it if the bucket is empty. Waiting requests reserve their
+    token in order, so the limiter is fair between threads (and coroutines).
+
+    When the server responds with 429 (Too Many Requests) the rate is multiplied by
+    `backoff`, and the bucket is emptied for the response's Retry-After period. Every
+    other response raises the rate by `increase` requests per second, back up to the
+    configured `rate`.
+
+    Parameters
+    ----------
+    rate : float or None, default DEFAULT_RATE (100.0)
+        Requests per second. If None, requests are never delayed, not even after a
+        429 response.
+    burst : int, default DEFAULT_BURST (100)
+        Maximum number of requests that can be sent at once after idling.
+    min_rate : float, default 0.5
+        Lowest rate the limiter will back off to.
+    backoff : float, default 0.5
+        Factor the rate is multiplied by on a 429 response.
+    increase : float, default 0.5
+        Requests per second added to the rate on each non-429 response.
+
+    Attributes
+    ----------
+    rate : float or None
+        The current (possibly backed off) rate.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        min_rate: float = 0.5,
+        backoff: float = 0.5,
+        increase: float = 0.5,
+    ):
+        self._lock = threading.Lock()
+        self.configure(
+            rate=rate,
+            burst=burst,
+            min_rate=min_rate,
+            backoff=backoff,
+            increase=increase,
+        )
+
+    def configure(
+        self,
+        rate: Optional[float] = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        min_rate: float = 0.5,
+        backoff: float = 0.5,
+        increase: float = 0.5,
+    ):
+        """Change the limiter's settings and refill the bucket."""
+        if (rate is not None) and (rate <= 0):
+            raise ValueError("`rate` must be positive or None.")
+        if burst < 1:
+            raise ValueError("`burst` must be at least 1.")
+
+        with self._lock:
+            self.max_rate = rate
+            self.rate = rate
+            self.burst = burst
+            self.min_rate = min_rate if rate is None else min(min_rate, rate)
+            self.backoff = backoff
+            self.increase = increase
+
+            self._tokens = float(burst)
+            self._last = time.monotonic()
+
+    def _reserve(self) -> float:
+        ## Take a token and return how long the caller must wait before using it
+        if self.rate is None:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._last) * self.rate
+            )
+            self._last = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """Wait, without blocking the event loop, until a request may be sent."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def throttle(self, retry_after: Optional[float] = None):
+        """
+        Back off after a 429 response.
+
+        Parameters
+        ----------
+        retry_after : float or None
+            Seconds the server asked clients to wait before retrying.
+        """
+        if self.rate is None:
+            return
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.backoff)
+            if retry_after:
+                ## Push every pending reservation back by the requested delay
+                self._tokens = min(self._tokens, -retry_after * self.rate)
+
+    def relax(self):
+        """Speed back up after a 429 slowed it down, up to the configured rate."""
+        if (self.rate is None) or (self.rate >= self.max_rate):
+            return
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def update(self, response):
+        """Adjust the rate from a response's status code and headers."""
+        if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+            self.throttle(
+                retry_after=parse_retry_after(response.headers.get("Retry-After"))
+            )
+        else:
+            self.relax()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Convert a Retry-After header to seconds.
+
+    Parameters
+    ----------
+    value : str or None
+        Header value, either a number of seconds or an HTTP date.
+
+    Returns
+    -------
+    float or None
+        Seconds to wait, or None if the header is missing or malformed.
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+_RATE_LIMITER = RateLimiter()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Get the rate limiter shared by every connection in this process.
+
+    Returns
+    -------
+    RateLimiter
+    """
+    return _RATE_LIMITER
+
+
+def set_rate_limit(
+    rate: Optional[float] = DEFAULT_RATE, burst: int = DEFAULT_BURST, **kwargs
+):
+    """
+    Re-configure the rate limiter shared by every connection in this process.
+
+    Parameters
+    ----------
+    rate : float or None, default DEFAULT_RATE (100.0)
+        Requests per second. If None, requests are never delayed.
+    burst : int, default DEFAULT_BURST (100)
+        Maximum number of requests that can be sent at once after idling.
+    **kwargs
+        Other RateLimiter options (`min_rate`, `backoff`, `increase`).
+    """
+    _RATE_LIMITER.configure(rate=rate, burst=burst, **kwargs)
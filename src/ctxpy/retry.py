@@ -0,0 +1,242 @@
+"""Retrying failed calls to the CTX APIs.
+
+Classes
+-------
+RetryPolicy: exponential backoff with jitter for transient errors
+RetrySummary: counts of attempts and retries made during a call
+
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import Counter
+from typing import Callable, Iterable, Optional
+
+import requests
+
+from .ratelimit import RateLimiter, parse_retry_after
+
+## Responses that are worth trying again
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _release(response):
+    ## Return the connection of a streamed response that won't be read to the pool
+    if getattr(response, "raw", None) is not None:
+        response.close()
+
+
+class RetrySummary:
+    """
+    Record of the attempts and retries made during a call.
+
+    Attributes
+    ----------
+    attempts : int
+        Number of requests sent, including retries.
+    retries : int
+        Number of requests that were retried.
+    waited : float
+        Total seconds spent waiting between retries.
+    reasons : collections.Counter
+        Number of retries by status code or exception name.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.attempts = 0
+        self.retries = 0
+        self.waited = 0.0
+        self.reasons = Counter()
+
+    def _record_attempt(self):
+        with self._lock:
+            self.attempts += 1
+
+    def _record_retry(self, reason, delay: float):
+        with self._lock:
+            self.retries += 1
+            self.waited += delay
+            self.reasons[reason] += 1
+
+    def as_dict(self) -> dict:
+        return {
+            "attempts": self.attempts,
+            "retries": self.retries,
+            "waited": self.waited,
+            "reasons": dict(self.reasons),
+        }
+
+    def __repr__(self):
+        return f"RetrySummary({self.as_dict()})"
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before re-sending a failed request.
+
+    A request is retried when the server responds with one of `statuses`, or when the
+    connection fails or times out. The wait after the ``n``-th failed attempt is
+    drawn uniformly from ``[0, min(max_backoff, backoff_factor * 2**(n - 1))]``
+    ("full jitter"), and is never shorter than the server's Retry-After header.
+
+    Only the failed request is re-sent, so for batched calls a transient error costs
+    one chunk, not the chunks already retrieved.
+
+    Parameters
+    ----------
+    max_attempts : int, default 3
+        Maximum number of times a request is sent. 1 disables retrying.
+    backoff_factor : float, default 0.5
+        Base, in seconds, of the exponential backoff.
+    max_backoff : float, default 30.0
+        Longest wait between two attempts, unless Retry-After asks for longer.
+    total_timeout : float or None, default None
+        Time budget, in seconds, for all attempts of a single request. No retry is
+        made if waiting for it would exceed the budget.
+    statuses : iterable of int, default (429, 500, 502, 503, 504)
+        Response status codes that are retried.
+    methods : iterable of str, default ("GET", "POST")
+        HTTP methods that are retried. The CTX APIs' POST endpoints are batch
+        searches, so they are safe to repeat.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        total_timeout: Optional[float] = None,
+        statuses: Iterable[int] = RETRY_STATUSES,
+        methods: Iterable[str] = ("GET", "POST"),
+    ):
+        if max_attempts < 1:
+            raise ValueError("`max_attempts` must be at least 1.")
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.total_timeout = total_timeout
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(methods)
+
+    def backoff(self, attempt: int) -> float:
+        """Seconds to wait after the given (1-based) failed attempt."""
+        ceiling = min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    def _delay(
+        self,
+        method: str,
+        attempt: int,
+        started: float,
+        retry_after: Optional[float] = None,
+    ) -> Optional[float]:
+        ## Seconds to wait before the next attempt, or None if it should not be made
+        if (method not in self.methods) or (attempt >= self.max_attempts):
+            return None
+        delay = self.backoff(attempt)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if self.total_timeout is not None:
+            if time.monotonic() - started + delay > self.total_timeout:
+                return None
+        return delay
+
+    def send(
+        self,
+        method: str,
+        send: Callable,
+        rate_limiter: RateLimiter,
+        summary: RetrySummary,
+        errors: tuple = (requests.ConnectionError, requests.Timeout),
+    ):
+        """
+        Call `send` until it returns a non-retryable response or attempts run out.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method of the request.
+        send : callable
+            Sends the request and returns the response.
+        rate_limiter : RateLimiter
+            Limiter waited on before every attempt and updated with every response.
+        summary : RetrySummary
+            Record the attempts and retries are added to.
+        errors : tuple of exceptions
+            Exceptions raised by `send` that are retried.
+
+        Returns
+        -------
+        The last response received.
+        """
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            rate_limiter.acquire()
+            summary._record_attempt()
+            try:
+                response = send()
+            except errors as err:
+                delay = self._delay(method=method, attempt=attempt, started=started)
+                if delay is None:
+                    raise
+                reason = type(err).__name__
+            else:
+                rate_limiter.update(response)
+                if response.status_code not in self.statuses:
+                    return response
+                delay = self._delay(
+                    method=method,
+                    attempt=attempt,
+                    started=started,
+                    retry_after=parse_retry_after(response.headers.get("Retry-After")),
+                )
+                if delay is None:
+                    return response
+                reason = response.status_code
+                _release(response)
+            summary._record_retry(reason=reason, delay=delay)
+            time.sleep(delay)
+
+    async def send_async(
+        self,
+        method: str,
+        send: Callable,
+        rate_limiter: RateLimiter,
+        summary: RetrySummary,
+        errors: tuple = (),
+    ):
+        """Asynchronous version of `send`, where `send` returns an awaitable."""
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            await rate_limiter.acquire_async()
+            summary._record_attempt()
+            try:
+                response = await send()
+            except errors as err:
+                delay = self._delay(method=method, attempt=attempt, started=started)
+                if delay is None:
+                    raise
+                reason = type(err).__name__
+            else:
+                rate_limiter.update(response)
+                if response.status_code not in self.statuses:
+                    return response
+                delay = self._delay(
+                    method=method,
+                    attempt=attempt,
+                    started=started,
+                    retry_after=parse_retry_after(response.headers.get("Retry-After")),
+                )
+                if delay is None:
+                    return response
+                reason = response.status_code
+                await response.aclose()
+            summary._record_retry(reason=reason, delay=delay)
+            await asyncio.sleep(delay)
@@ -0,0 +1,261 @@
+"""Column types of the records returned by the CTX API endpoints.
+
+Each schema maps field names to the type their column is given when a response is
+converted to a DataFrame: "category" for repeated, enumeration-like text, "Int64"
+for (nullable) integers, "float64" for measurements and "boolean" for flags. Fields
+not named in a schema keep their inferred type, and fields missing from a response
+are ignored.
+
+Data
+----
+SCHEMAS: column types of each endpoint, keyed on endpoint prefix
+
+Functions
+---------
+get_schema: look up the schema of an endpoint
+register_schema: add or replace the schema of an endpoint
+apply_schema: cast the columns of a DataFrame to a schema's types
+
+"""
+
+from typing import Optional
+
+import pandas as pd
+
+DTYPES = ("category", "Int64", "float64", "boolean")
+
+_TOXVAL = {
+    "id": "Int64",
+    "year": "Int64",
+    "source": "category",
+    "subsource": "category",
+    "toxvalType": "category",
+    "toxvalSubtype": "category",
+    "toxvalTypeSuperCategory": "category",
+    "qualifier": "category",
+    "toxvalNumeric": "float64",
+    "toxvalUnits": "category",
+    "riskAssessmentClass": "category",
+    "humanEco": "category",
+    "humanEcoNt": "category",
+    "studyType": "category",
+    "studyDurationClass": "category",
+    "studyDurationValue": "float64",
+    "studyDurationUnits": "category",
+    "speciesCommon": "category",
+    "speciesSupercategory": "category",
+    "strainGroup": "category",
+    "sex": "category",
+    "generation": "category",
+    "lifestage": "category",
+    "exposureRoute": "category",
+    "exposureMethod": "category",
+    "exposureForm": "category",
+    "media": "category",
+    "qcCategory": "category",
+}
+
+_TOXREF = {
+    "studyId": "Int64",
+    "studyYear": "Int64",
+    "studyType": "category",
+    "species": "category",
+    "strain": "category",
+    "strainGroup": "category",
+    "adminRoute": "category",
+    "adminMethod": "category",
+    "sex": "category",
+    "lifeStage": "category",
+    "generation": "category",
+    "endpointCategory": "category",
+    "endpointType": "category",
+    "endpointTarget": "category",
+    "doseLevel": "Int64",
+    "doseAdjusted": "float64",
+    "doseAdjustedUnit": "category",
+    "conc": "float64",
+    "concUnit": "category",
+    "effectVal": "float64",
+    "effectValUnit": "category",
+    "numAnimals": "Int64",
+    "treatmentRelated": "boolean",
+    "criticalEffect": "boolean",
+}
+
+_MMDB = {
+    "harmonizedMedium": "category",
+    "cleanedUnits": "category",
+    "detected": "Int64",
+    "species": "category",
+    "country": "category",
+    "stateOrProvince": "category",
+    "source": "category",
+}
+
+SCHEMAS = {
+    "hazard/toxval/": _TOXVAL,
+    "hazard/cancer-summary/": {
+        "id": "Int64",
+        "source": "category",
+        "exposureRoute": "category",
+        "cancerCall": "category",
+    },
+    "hazard/skin-eye/": {
+        "skinEyeId": "Int64",
+        "year": "Int64",
+        "source": "category",
+        "endpoint": "category",
+        "classification": "category",
+        "reliability": "category",
+        "species": "category",
+        "authority": "category",
+    },
+    "hazard/genetox/summary/": {
+        "genetoxSummaryId": "Int64",
+        "genetoxCall": "category",
+        "ames": "category",
+        "micronucleus": "category",
+        "reportsPositive": "Int64",
+        "reportsNegative": "Int64",
+    },
+    "hazard/genetox/details/": {
+        "genetoxDetailsId": "Int64",
+        "year": "Int64",
+        "source": "category",
+        "assayCategory": "category",
+        "assayType": "category",
+        "assayTypeStandard": "category",
+        "assayResult": "category",
+        "species": "category",
+        "strain": "category",
+        "metabolicActivation": "category",
+    },
+    "hazard/toxref/": _TOXREF,
+    "exposure/functional-use/probability/": {
+        "harmonizedFunctionalUse": "category",
+        "probability": "float64",
+    },
+    "exposure/functional-use/search/": {
+        "id": "Int64",
+        "docid": "Int64",
+        "datatype": "category",
+        "functioncategory": "category",
+    },
+    "exposure/product-data/search/": {
+        "id": "Int64",
+        "docid": "Int64",
+        "gencat": "category",
+        "prodfam": "category",
+        "prodtype": "category",
+        "classificationmethod": "category",
+        "weightfractiontype": "category",
+        "unittype": "category",
+        "lowerweightfraction": "float64",
+        "upperweightfraction": "float64",
+        "centralweightfraction": "float64",
+    },
+    "exposure/list-presence/search/": {
+        "id": "Int64",
+        "docid": "Int64",
+        "keywordset": "category",
+    },
+    "exposure/seem/general/": {
+        "productionVolume": "float64",
+        "units": "category",
+        "probabilityDietary": "float64",
+        "probabilityResidential": "float64",
+        "probabilityPesticde": "float64",
+        "probabilityIndustrial": "float64",
+        "stockholmConvention": "Int64",
+    },
+    "exposure/seem/demographic/": {
+        "id": "Int64",
+        "demographic": "category",
+        "predictor": "category",
+        "units": "category",
+        "median": "float64",
+        "l95": "float64",
+        "u95": "float64",
+    },
+    "exposure/httk/": {
+        "id": "Int64",
+        "parameter": "category",
+        "model": "category",
+        "percentile": "category",
+        "species": "category",
+        "dataSourceSpecies": "category",
+        "unit": "category",
+    },
+    "exposure/mmdb/single-sample/": _MMDB,
+    "exposure/mmdb/aggregate/": _MMDB,
+}
+
+
+def _prefix(endpoint: str) -> str:
+    return endpoint.strip("/") + "/"
+
+
+def get_schema(endpoint: str) -> Optional[dict]:
+    """
+    Look up the schema of an endpoint.
+
+    Parameters
+    ----------
+    endpoint : str
+        Endpoint of an API call, e.g. "hazard/toxval/search/by-dtxsid/".
+
+    Returns
+    -------
+    dict or None
+        Column types of the longest registered prefix of `endpoint`, or None if no
+        schema matches.
+    """
+    path = _prefix(endpoint)
+    matches = [prefix for prefix in SCHEMAS if path.startswith(prefix)]
+    if not matches:
+        return None
+    return SCHEMAS[max(matches, key=len)]
+
+
+def register_schema(endpoint: str, schema: dict):
+    """
+    Add or replace the schema of every endpoint starting with `endpoint`.
+
+    Parameters
+    ----------
+    endpoint : str
+        Endpoint prefix, e.g. "hazard/pprtv/".
+    schema : dict
+        Column types, keyed on field name. Types must be one of `DTYPES`.
+    """
+    for name, dtype in schema.items():
+        if dtype not in DTYPES:
+            raise ValueError(f"Value {dtype} is invalid type for field `{name}`.")
+    SCHEMAS[_prefix(endpoint)] = dict(schema)
+
+
+def apply_schema(df: pd.DataFrame, schema: dict) -> pd.DataFrame:
+    """
+    Cast the columns of `df` named in `schema` to their types, in place.
+
+    Columns whose values don't fit their declared type keep their inferred type.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The same DataFrame, for chaining.
+    """
+    for name, dtype in schema.items():
+        if name not in df.columns:
+            continue
+        col = df[name]
+        try:
+            if dtype == "float64":
+                ## astype can't cast pd.NA to float
+                col = pd.to_numeric(col).astype("float64")
+            else:
+                col = col.astype(dtype)
+        except (TypeError, ValueError):
+            continue
+        df[name] = col
+    return df
@@ -0,0 +1,146 @@
+"""Write the results of batched calls to an on-disk dataset, one chunk at a time.
+
+Requires the optional `pyarrow` dependency (``pip install ctx-python[arrow]``).
+
+Classes
+-------
+DatasetSink: Parquet or Feather dataset that chunks of records are appended to
+
+"""
+
+from pathlib import Path
+from typing import Optional, Union
+
+import pandas as pd
+
+from .arrow import (
+    conform_table,
+    pa,
+    records_to_table,
+    require_pyarrow,
+    unify_schemas,
+)
+
+try:
+    import pyarrow.dataset as ds
+except ImportError:
+    ds = None
+
+## File extension of each supported format
+FORMATS = {"parquet": "parquet", "feather": "feather"}
+
+
+class DatasetSink:
+    """
+    Parquet or Feather dataset that the results of a batched call are written to.
+
+    Pass a sink as `sink` to a batch-capable method (e.g. `Hazard.search_toxvaldb` or
+    `Exposure.search_cpdat`) and every chunk is converted to a pyarrow.Table and
+    written to the dataset as soon as it is received, so memory use doesn't grow with
+    the size of the query. Each chunk is written to its own file(s), named
+    ``chunk-<index>-<n>.<format>``.
+
+    Parameters
+    ----------
+    path : str or pathlib.Path
+        Directory of the dataset. Created if it doesn't exist.
+    format : {"parquet", "feather"}, default "parquet"
+        File format of the dataset.
+    partition_by : str or list of str or None, default None
+        Column(s) to partition the dataset by, as hive-style directories
+        (``<column>=<value>/``). If None, files are only split by chunk.
+
+    Attributes
+    ----------
+    rows : int
+        Number of rows written.
+    chunks : int
+        Number of chunks written.
+    files : list of str
+        Paths of the files written.
+    schema : pyarrow.Schema or None
+        Schema of the dataset, unified over all the chunks written.
+
+    Examples
+    --------
+    >>> sink = DatasetSink('toxval', partition_by='source')
+    >>> haz.search_toxvaldb(by='all', dtxsid=dtxsids, sink=sink)
+    >>> sink.dataset().to_table(filter=pc.field('toxvalType') == 'NOAEL')
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        format: str = "parquet",
+        partition_by: Optional[Union[str, list]] = None,
+    ):
+        require_pyarrow()
+        if format not in FORMATS:
+            raise ValueError(f"Value {format} is invalid option for argument `format`.")
+        if isinstance(partition_by, str):
+            partition_by = [partition_by]
+
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.format = format
+        self.partition_by = partition_by
+        self.rows = 0
+        self.chunks = 0
+        self.files = []
+        self.schema = None
+
+    def write(self, data):
+        """
+        Write one chunk of results to the dataset.
+
+        Parameters
+        ----------
+        data : pyarrow.Table or list of dict
+            The chunk's records, or a table built from them.
+        """
+        table = data if isinstance(data, pa.Table) else records_to_table(data)
+        index = self.chunks
+        if table.num_rows == 0:
+            self.chunks += 1
+            return
+
+        ## Columns can be missing, all null, or of another type in some chunks.
+        ## Columns whose types conflict are widened (to text if need be); files
+        ## written before are cast to the widened type when the dataset is read.
+        schema = table.schema
+        if self.schema is not None:
+            schema = unify_schemas([self.schema, table.schema])
+        table = conform_table(table, schema)
+
+        ds.write_dataset(
+            table,
+            self.path,
+            format=self.format,
+            partitioning=self.partition_by,
+            partitioning_flavor="hive" if self.partition_by else None,
+            basename_template=f"chunk-{index:06d}-{{i}}.{FORMATS[self.format]}",
+            existing_data_behavior="overwrite_or_ignore",
+            file_visitor=lambda written: self.files.append(written.path),
+        )
+        self.schema = schema
+        self.chunks += 1
+        self.rows += table.num_rows
+
+    def dataset(self):
+        """Open the dataset written so far as a pyarrow.dataset.Dataset."""
+        return ds.dataset(
+            self.path,
+            format=self.format,
+            schema=self.schema,
+            partitioning="hive" if self.partition_by else None,
+        )
+
+    def to_df(self, columns: Optional[list] = None) -> pd.DataFrame:
+        """Read the dataset, or only `columns` of it, into a DataFrame."""
+        return self.dataset().to_table(columns=columns).to_pandas()
+
+    def __repr__(self):
+        return (
+            f"DatasetSink('{self.path}', format='{self.format}', "
+            f"rows={self.rows}, chunks={self.chunks})"
+        )
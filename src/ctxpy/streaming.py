@@ -0,0 +1,262 @@
+"""Incremental decoding of JSON responses from the CTX APIs.
+
+Classes
+-------
+JSONRecordParser: push parser yielding records as a JSON body arrives
+
+"""
+
+import codecs
+import json
+import re
+from typing import Iterable, Optional
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+## A value ending in a number character with only number characters after it, up to
+## the end of the buffer, may be a number cut short (e.g. "1." or "2e")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+\-]+\Z")
+
+## Parser states
+_START = "start"
+_ARRAY = "array"
+_ARRAY_NEXT = "array-next"
+_OBJECT = "object"
+_OBJECT_COLON = "object-colon"
+_OBJECT_VALUE = "object-value"
+_OBJECT_NEXT = "object-next"
+_SCALAR = "scalar"
+_DONE = "done"
+
+
+class JSONRecordParser:
+    """
+    Parse a JSON body chunk by chunk, returning records as soon as they are complete.
+
+    The parser holds only the chunk of text it has yet to decode, never the raw bytes
+    or decoded string of the whole body; the records it returns are the caller's to
+    keep or discard.
+    Records are the items of a top-level array, or of the array under `records_key`
+    when the body is an object (as in paged MMDB responses). Every other member of a
+    top-level object is decoded whole and kept in `metadata`.
+
+    Parameters
+    ----------
+    records_key : str or None, default "data"
+        Member of a top-level object whose array items are returned as records.
+
+    Attributes
+    ----------
+    metadata : dict
+        Members of a top-level object other than `records_key`.
+    is_object : bool
+        Whether the body's top level is an object.
+
+    Examples
+    --------
+    >>> parser = JSONRecordParser()
+    >>> parser.feed(b'{"totalRecords": 2, "data": [{"id": 1}, {"i')
+    [{'id': 1}]
+    >>> parser.feed(b'd": 2}]}')
+    [{'id': 2}]
+    >>> parser.close(), parser.metadata
+    ([], {'totalRecords': 2})
+    """
+
+    def __init__(self, records_key: Optional[str] = "data"):
+        self.records_key = records_key
+        self.metadata = {}
+        self.is_object = False
+        self.has_records = False
+
+        ## Each record is decoded separately, so share key strings between records
+        ## the way a single `json.loads` call would
+        keys = {}
+        self._decoder = json.JSONDecoder(
+            object_pairs_hook=lambda pairs: {keys.setdefault(k, k): v for k, v in pairs}
+        )
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._state = _START
+        self._in_records = False
+        self._key = None
+        self._final = False
+        self._value = None
+
+    def feed(self, chunk: bytes) -> list:
+        """Add the next chunk of the body and return the records it completed."""
+        self._buf = self._buf[self._pos :] + self._text.decode(chunk)
+        self._pos = 0
+        return self._parse()
+
+    def close(self) -> list:
+        """Signal the end of the body and return any remaining records."""
+        self._buf = self._buf[self._pos :] + self._text.decode(b"", final=True)
+        self._pos = 0
+        self._final = True
+        records = self._parse()
+        if self._state == _SCALAR:
+            self._value = json.loads(self._buf)
+            self._state = _DONE
+        if self._state != _DONE:
+            raise json.JSONDecodeError("Unexpected end of body", self._buf, self._pos)
+        return records
+
+    @property
+    def value(self):
+        """The decoded body, for bodies that are not arrays or objects."""
+        return self._value
+
+    def _skip(self):
+        self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+        return self._buf[self._pos] if self._pos < len(self._buf) else None
+
+    def _decode_value(self):
+        ## Decode a complete value at the current position, or return False if more
+        ## of the body is needed first
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if self._final:
+                raise
+            return False
+        ## A number at the end of the buffer may still be cut short
+        if (not self._final) and _NUMBER_TAIL.match(self._buf, end - 1):
+            return False
+        self._pos = end
+        return (value,)
+
+    def _expect(self, char):
+        raise json.JSONDecodeError(f"Expected {char!r}", self._buf, self._pos)
+
+    def _parse(self) -> list:  # noqa: PLR0912, PLR0915
+        records = []
+        while True:
+            char = self._skip()
+            if (char is None) or (self._state in {_DONE, _SCALAR}):
+                return records
+
+            if self._state == _START:
+                if char == "[":
+                    self._pos += 1
+                    self._state = _ARRAY
+                    self.has_records = True
+                elif char == "{":
+                    self._pos += 1
+                    self._state = _OBJECT
+                    self.is_object = True
+                else:
+                    self._state = _SCALAR
+
+            elif self._state == _ARRAY:
+                if char == "]":
+                    self._pos += 1
+                    self._end_array()
+                    continue
+                decoded = self._decode_value()
+                if decoded is False:
+                    return records
+                records.append(decoded[0])
+                self._state = _ARRAY_NEXT
+
+            elif self._state == _ARRAY_NEXT:
+                if char == ",":
+                    self._pos += 1
+                    self._state = _ARRAY
+                elif char == "]":
+                    self._pos += 1
+                    self._end_array()
+                else:
+                    self._expect(",")
+
+            elif self._state == _OBJECT:
+                if char == "}":
+                    self._pos += 1
+                    self._state = _DONE
+                    continue
+                decoded = self._decode_value()
+                if decoded is False:
+                    return records
+                self._key = decoded[0]
+                self._state = _OBJECT_COLON
+
+            elif self._state == _OBJECT_COLON:
+                if char != ":":
+                    self._expect(":")
+                self._pos += 1
+                self._state = _OBJECT_VALUE
+
+            elif self._state == _OBJECT_VALUE:
+                if (self._key == self.records_key) and (char == "["):
+                    self._pos += 1
+                    self._state = _ARRAY
+                    self._in_records = True
+                    self.has_records = True
+                    continue
+                decoded = self._decode_value()
+                if decoded is False:
+                    return records
+                self.metadata[self._key] = decoded[0]
+                self._state = _OBJECT_NEXT
+
+            elif self._state == _OBJECT_NEXT:
+                if char == ",":
+                    self._pos += 1
+                    self._state = _OBJECT
+                elif char == "}":
+                    self._pos += 1
+                    self._state = _DONE
+                else:
+                    self._expect(",")
+
+    def _end_array(self):
+        if self._in_records:
+            self._in_records = False
+            self._state = _OBJECT_NEXT
+        else:
+            self._state = _DONE
+
+    def assemble(self, records: list):
+        """
+        Rebuild the full decoded body from the parser's records and metadata.
+
+        Parameters
+        ----------
+        records : list
+            Every record returned by `feed` and `close`.
+
+        Returns
+        -------
+        list, dict, or scalar
+            The same value `json.loads` would have returned for the whole body.
+        """
+        if self._state == _DONE and not (self.is_object or self.has_records):
+            return self._value
+        if not self.is_object:
+            return records
+        info = dict(self.metadata)
+        if self.has_records:
+            info[self.records_key] = records
+        return info
+
+
+def iter_records(chunks: Iterable[bytes], parser: JSONRecordParser):
+    """
+    Yield the records of a JSON body read from an iterable of byte chunks.
+
+    Parameters
+    ----------
+    chunks : iterable of bytes
+        The body, e.g. ``response.iter_content(chunk_size=65536)``.
+    parser : JSONRecordParser
+        Parser the chunks are fed through; its `metadata` is filled in as the
+        body is read.
+
+    Yields
+    ------
+    Each record of the body, in order.
+    """
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
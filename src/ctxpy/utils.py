@@ -5,6 +5,9 @@ from typing import Optional, Union
 
 from dotenv import dotenv_values, set_key
 
+## Placeholders the APIs use for missing text values
+NULL_SENTINELS = ("-", "")
+
 
 def chunker(listlike, size):
     """
@@ -25,6 +28,26 @@ def chunker(listlike, size):
     return (listlike[pos : pos + size] for pos in range(0, len(listlike), size))
 
 
+def select_fields(records, fields: list):
+    """
+    Keep only the named fields of API records.
+
+    Parameters
+    ----------
+    records : list of dict or dict
+        Decoded response of an API call.
+    fields : list of str
+        Fields to keep, in order. Fields a record doesn't have are skipped.
+
+    Returns
+    -------
+    list of dict or dict
+    """
+    if isinstance(records, dict):
+        return {k: records[k] for k in fields if k in records}
+    return [{k: r[k] for k in fields if k in r} for r in records]
+
+
 def flatten(lofl: list):
     """
     Takes a list of lists into and flattens into a single list
@@ -0,0 +1,250 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+import ctxpy
+from ctxpy.cache import ResponseCache
+from ctxpy.exceptions import BatchChunkError
+from ctxpy.ratelimit import RateLimiter
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+def connect(cls, handler, **kwargs):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return cls(
+        x_api_key="key", client=client, rate_limiter=RateLimiter(rate=None), **kwargs
+    )
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestAsync(unittest.TestCase):
+    def test_request_get(self):
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json=[{"dtxsid": "DTXSID7020182"}])
+
+        async def run():
+            async with connect(ctxpy.AsyncChemical, handler) as chem:
+                return await chem.details(by="dtxsid", query="DTXSID7020182")
+
+        info = asyncio.run(run())
+
+        self.assertEqual(info, [{"dtxsid": "DTXSID7020182"}])
+        self.assertEqual(requests[0].method, "GET")
+        self.assertEqual(
+            str(requests[0].url),
+            "https://comptox.epa.gov/ctx-api/chemical/detail/search/by-dtxsid/"
+            "DTXSID7020182?projection=chemicaldetailall",
+        )
+        self.assertEqual(requests[0].headers["x-api-key"], "key")
+
+    def test_batch_keeps_chunk_order(self):
+        async def handler(request):
+            query = json.loads(request.content)
+            ## Finish the first chunks last
+            await asyncio.sleep(0.001 * (20 - int(query[0][6:])))
+            return httpx.Response(200, json=[{"dtxsid": q} for q in query])
+
+        dtxsids = [f"DTXSID{i}" for i in range(20)]
+
+        async def run():
+            haz = connect(ctxpy.AsyncHazard, handler)
+            haz.batch_size = 3
+            return await haz.search_toxrefdb(by="dtxsid", domain="all", query=dtxsids)
+
+        with self.assertWarns(UserWarning):
+            result = asyncio.run(run())
+
+        self.assertEqual(result["dtxsid"].tolist(), dtxsids)
+
+    def test_batch_reports_failed_chunk(self):
+        def handler(request):
+            query = json.loads(request.content)
+            if "DTXSID5" in query:
+                return httpx.Response(502)
+            return httpx.Response(200, json=[{"dtxsid": q} for q in query])
+
+        async def run():
+            conn = connect(ctxpy.AsyncChemical, handler)
+            return await conn.ctx_call(
+                endpoint="chemical/detail/search/by-dtxsid/",
+                query=[f"DTXSID{i}" for i in range(10)],
+                batched=True,
+                batch_size=2,
+            )
+
+        with self.assertRaises(BatchChunkError) as cm:
+            asyncio.run(run())
+        self.assertEqual(cm.exception.index, 2)
+
+    def test_semaphore_bounds_in_flight_requests(self):
+        in_flight = {"now": 0, "max": 0}
+
+        async def handler(request):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.001)
+            in_flight["now"] -= 1
+            return httpx.Response(200, json=[{"harmonizedFunctionalUse": "x"}])
+
+        async def run():
+            expo = connect(ctxpy.AsyncExposure, handler, max_concurrency=4)
+            return await expo.search_qsurs(dtxsid=[f"DTXSID{i}" for i in range(30)])
+
+        result = asyncio.run(run())
+
+        self.assertEqual(len(result), 30)
+        self.assertLessEqual(in_flight["max"], 4)
+
+    def test_search_qsurs_failed_dtxsid(self):
+        def handler(request):
+            dtxsid = request.url.path.rstrip("/").split("/")[-1]
+            if dtxsid == "DTXSID1":
+                return httpx.Response(404, json={"title": "Not Found"})
+            return httpx.Response(200, json=[{"harmonizedFunctionalUse": "x"}])
+
+        async def run():
+            expo = connect(ctxpy.AsyncExposure, handler)
+            with self.assertWarns(UserWarning):
+                result = await expo.search_qsurs(
+                    dtxsid=["DTXSID0", "DTXSID1", "DTXSID2"], max_workers=2
+                )
+            return expo, result
+
+        expo, result = asyncio.run(run())
+
+        self.assertEqual(result["dtxsid"].tolist(), ["DTXSID0", "DTXSID2"])
+        self.assertEqual(list(expo.failed_items), ["DTXSID1"])
+        self.assertIsInstance(expo.failed_items["DTXSID1"], httpx.HTTPStatusError)
+
+    def test_hazard_profile(self):
+        def handler(request):
+            if request.method == "POST":
+                return httpx.Response(
+                    200, json=[{"dtxsid": q} for q in json.loads(request.content)]
+                )
+            return httpx.Response(200, json=[{"name": request.url.path}])
+
+        async def run():
+            haz = connect(ctxpy.AsyncHazard, handler)
+            return await haz.profile(
+                dtxsid=["DTXSID1", "DTXSID2"], domains=["all", "hawc"], max_workers=2
+            )
+
+        result = asyncio.run(run())
+
+        self.assertEqual(result["all"]["dtxsid"].tolist(), ["DTXSID1", "DTXSID2"])
+        self.assertEqual(result["hawc"]["dtxsid"].tolist(), ["DTXSID1", "DTXSID2"])
+
+    def test_dossier_fetch(self):
+        def handler(request):
+            if request.method == "POST":
+                return httpx.Response(
+                    200, json=[{"dtxsid": q} for q in json.loads(request.content)]
+                )
+            return httpx.Response(200, json=[{"harmonizedFunctionalUse": "x"}])
+
+        async def run():
+            dossier = connect(ctxpy.AsyncDossier, handler)
+            return await dossier.fetch(
+                dtxsid=["DTXSID1", "DTXSID2"], datasets=["cpdat-fc", "qsurs"]
+            )
+
+        result = asyncio.run(run())
+
+        self.assertEqual(result["cpdat-fc"]["dtxsid"].tolist(), ["DTXSID1", "DTXSID2"])
+        self.assertEqual(result["qsurs"]["dtxsid"].tolist(), ["DTXSID1", "DTXSID2"])
+
+    def test_dossier_fetch_cached(self):
+        posts = []
+
+        def handler(request):
+            query = json.loads(request.content)
+            posts.append(query)
+            return httpx.Response(200, json=[{"dtxsid": q} for q in query])
+
+        async def run(path):
+            dossier = connect(
+                ctxpy.AsyncDossier, handler, cache=ResponseCache(path=path)
+            )
+            for dtxsid in [["DTXSID1", "DTXSID2"], ["DTXSID1", "DTXSID2", "DTXSID3"]]:
+                result = await dossier.fetch(dtxsid=dtxsid, datasets=["cpdat-fc"])
+            return result
+
+        with tempfile.TemporaryDirectory() as tmp:
+            result = asyncio.run(run(Path(tmp) / "cache.sqlite"))
+
+        self.assertEqual(posts, [["DTXSID1", "DTXSID2"], ["DTXSID3"]])
+        self.assertEqual(
+            result["cpdat-fc"]["dtxsid"].tolist(), ["DTXSID1", "DTXSID2", "DTXSID3"]
+        )
+
+    def test_stream_mode(self):
+        hit = {"totalRecords": 2, "data": [{"id": 0}, {"id": 1}]}
+
+        def handler(request):
+            return httpx.Response(200, json=hit)
+
+        async def run():
+            async with connect(
+                ctxpy.AsyncExposure, handler, stream=True, stream_chunk_size=8
+            ) as expo:
+                return await expo.search_mmdb(by="medium", query="soil")
+
+        result = asyncio.run(run())
+
+        pd.testing.assert_frame_equal(result, pd.DataFrame(hit["data"]))
+        self.assertEqual(result.attrs, {"totalRecords": 2})
+
+    def test_iter_details_yields_each_chunk(self):
+        def handler(request):
+            query = json.loads(request.content)
+            return httpx.Response(200, json=[{"dtxsid": q} for q in query])
+
+        dtxsids = [f"DTXSID{i}" for i in range(5)]
+
+        async def run():
+            async with connect(ctxpy.AsyncChemical, handler, max_workers=2) as chem:
+                return [
+                    chunk
+                    async for chunk in chem.iter_details(
+                        by="batch-dtxsid", query=dtxsids, batch_size=2
+                    )
+                ]
+
+        chunks = asyncio.run(run())
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertEqual([r["dtxsid"] for chunk in chunks for r in chunk], dtxsids)
+
+    def test_validation_matches_sync(self):
+        haz = ctxpy.AsyncHazard(x_api_key="key")
+        with self.assertRaises(KeyError):
+            asyncio.run(haz.search_toxvaldb(by="not-an-option", dtxsid="DTXSID7020182"))
+
+    @patch("ctxpy.aio.AsyncCTXConnection.ctx_call")
+    def test_search_mmdb_by_medium(self, mocker):
+        hit = {"medium": "soil", "totalRecords": 1, "data": [{"id": 0}]}
+        mocker.return_value = hit
+
+        expo = ctxpy.AsyncExposure(x_api_key="key")
+        result = asyncio.run(expo.search_mmdb(by="medium", query="soil"))
+
+        mocker.assert_called_once_with(
+            endpoint="exposure/mmdb/single-sample/by-medium",
+            query="soil",
+            params={"medium": "soil"},
+        )
+        pd.testing.assert_frame_equal(result, pd.DataFrame(hit["data"]))
+        self.assertEqual(result.attrs, {"medium": "soil", "totalRecords": 1})
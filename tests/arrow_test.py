@@ -0,0 +1,108 @@
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+import ctxpy
+from ctxpy.arrow import pa, records_to_table
+from ctxpy.base import ColumnBuffer, ResponseTransformer
+from ctxpy.mock_server import MockCTXServer
+from ctxpy.ratelimit import RateLimiter
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class TestArrow(unittest.TestCase):
+    data = [
+        {"dtxsid": "DTXSID1", "source": "-", "value": 1.5, "flag": True},
+        {"dtxsid": "DTXSID2", "source": "", "value": None, "flag": None},
+        {"dtxsid": "DTXSID3", "source": "ToxVal", "value": "-", "extra": [1, 2]},
+    ]
+
+    def test_records_to_table(self):
+        table = records_to_table(self.data)
+
+        ## Keys missing from the first record still become columns
+        self.assertEqual(
+            table.column_names, ["dtxsid", "source", "value", "flag", "extra"]
+        )
+        self.assertEqual(table.column("source").to_pylist(), [None, None, "ToxVal"])
+        ## "-" placeholders in numeric columns don't force the column to text
+        self.assertEqual(table.column("value").type, pa.float64())
+        self.assertEqual(table.column("value").to_pylist(), [1.5, None, None])
+        self.assertEqual(table.column("extra").to_pylist(), [None, None, [1, 2]])
+
+    def test_columns(self):
+        table = records_to_table(self.data, columns=["value", "dtxsid"])
+        self.assertEqual(table.column_names, ["value", "dtxsid"])
+        df = ResponseTransformer(self.data).to_df(
+            dtype_backend="pyarrow", columns=["extra"]
+        )
+        self.assertEqual(df["extra"].tolist()[2], [1, 2])
+
+    def test_column_buffer(self):
+        buffer = ColumnBuffer(dtype_backend="pyarrow_table")
+        ## A column that is all null in one chunk takes its type from the others
+        buffer.write([{"dtxsid": "DTXSID1", "source": "-"}])
+        buffer.write([{"dtxsid": "DTXSID2", "source": "ToxVal", "value": 1.5}])
+        table = buffer.to_arrow()
+        self.assertEqual(table.column_names, ["dtxsid", "source", "value"])
+        self.assertEqual(table.column("source").type, pa.string())
+        self.assertEqual(table.column("value").to_pylist(), [None, 1.5])
+
+    def test_column_buffer_mixed_types(self):
+        for backend in ("pyarrow", "pyarrow_table"):
+            with self.subTest(dtype_backend=backend):
+                buffer = ColumnBuffer(dtype_backend=backend)
+                ## Chunks that disagree on a column's type
+                buffer.write([{"a": 1, "b": 1}])
+                buffer.write([{"a": "text", "b": 2.5}])
+                table = buffer.to_arrow()
+                self.assertEqual(table.column("a").type, pa.string())
+                self.assertEqual(table.column("a").to_pylist(), ["1", "text"])
+                self.assertEqual(table.column("b").to_pylist(), [1.0, 2.5])
+                self.assertEqual(len(buffer.to_df()), 2)
+
+    def test_mixed_column_kept_as_text(self):
+        table = records_to_table([{"a": 1}, {"a": "one"}, {"a": "-"}])
+        self.assertEqual(table.column("a").to_pylist(), ["1", "one", None])
+
+    def test_to_df_pyarrow(self):
+        df = ResponseTransformer(self.data).to_df(dtype_backend="pyarrow")
+        self.assertTrue(all(isinstance(t, pd.ArrowDtype) for t in df.dtypes))
+        self.assertEqual(df["source"].isna().tolist(), [True, True, False])
+        self.assertEqual(df["flag"].isna().tolist(), [False, True, True])
+
+    def test_invalid_dtype_backend(self):
+        with self.assertRaises(ValueError):
+            ResponseTransformer(self.data).to_df(dtype_backend="polars")
+        with self.assertRaises(ValueError):
+            ctxpy.Hazard(x_api_key="key", dtype_backend="polars")
+
+    @patch("ctxpy.base.CTXConnection.ctx_call")
+    def test_domain_methods(self, mocker):
+        mocker.return_value = self.data
+
+        haz = ctxpy.Hazard(x_api_key="key", dtype_backend="pyarrow")
+        df = haz.search_toxvaldb(by="all", dtxsid="DTXSID1")
+        self.assertIsInstance(df["value"].dtype, pd.ArrowDtype)
+
+        haz = ctxpy.Hazard(x_api_key="key", dtype_backend="pyarrow_table")
+        table = haz.search_toxvaldb(by="all", dtxsid="DTXSID1")
+        self.assertIsInstance(table, pa.Table)
+        self.assertEqual(table.num_rows, len(self.data))
+
+    def test_mmdb_table_metadata(self):
+        with MockCTXServer(mmdb_records=5) as server:
+            expo = ctxpy.Exposure(
+                x_api_key="key",
+                host=server.url,
+                rate_limiter=RateLimiter(rate=None),
+                dtype_backend="pyarrow_table",
+            )
+            table = expo.search_mmdb(by="medium", query="soil")
+        self.assertEqual(table.num_rows, 5)
+        self.assertEqual(table.schema.metadata[b"medium"], b'"soil"')
+
+
+if __name__ == "__main__":
+    unittest.main()
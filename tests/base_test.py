@@ -0,0 +1,289 @@
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import requests
+
+import ctxpy
+from ctxpy.base import (
+    ColumnBuffer,
+    CTXConnection,
+    RawResponse,
+    ResponseTransformer,
+    get_session,
+)
+from ctxpy.exceptions import BatchChunkError
+
+
+def mock_response(content=b"[]", status_code=200):
+    response = MagicMock(spec=requests.Response)
+    response.content = content
+    response.status_code = status_code
+    return response
+
+
+class TestCTXConnection(unittest.TestCase):
+    def test_domain_classes_share_session(self):
+        chem = ctxpy.Chemical(x_api_key="key")
+        haz = ctxpy.Hazard(x_api_key="key")
+        expo = ctxpy.Exposure(x_api_key="key")
+        clist = ctxpy.ChemicalList(x_api_key="key")
+
+        self.assertIs(chem.session, haz.session)
+        self.assertIs(chem.session, expo.session)
+        self.assertIs(chem.session, clist.session)
+
+    def test_pool_settings_create_separate_session(self):
+        default = CTXConnection(x_api_key="key")
+        large = CTXConnection(x_api_key="key", pool_maxsize=50)
+
+        self.assertIsNot(default.session, large.session)
+        self.assertIs(large.session, get_session(pool_maxsize=50))
+        adapter = large.session.get_adapter("https://comptox.epa.gov/ctx-api/")
+        self.assertEqual(adapter._pool_maxsize, 50)
+
+    def test_keep_alive_disabled(self):
+        conn = CTXConnection(x_api_key="key", keep_alive=False)
+        self.assertEqual(conn.session.headers["Connection"], "close")
+
+    def test_provided_session(self):
+        session = requests.Session()
+        conn = ctxpy.Chemical(x_api_key="key", session=session)
+        self.assertIs(conn.session, session)
+
+    def test_request_uses_session(self):
+        session = MagicMock(spec=requests.Session)
+        session.request.return_value = mock_response(b'[{"dtxsid": "DTXSID7020182"}]')
+        conn = CTXConnection(x_api_key="key", session=session)
+
+        info = conn._request(endpoint="chemical/search/equal/", query=["BPA"])
+
+        session.request.assert_called_once_with(
+            method="POST",
+            url="https://comptox.epa.gov/ctx-api/chemical/search/equal/",
+            data='["BPA"]',
+            headers={
+                "accept": "application/json",
+                "x-api-key": "key",
+                "content-type": "application/json",
+            },
+            params=None,
+        )
+        self.assertEqual(info, [{"dtxsid": "DTXSID7020182"}])
+        ## POST headers should not leak into the connection's stored headers
+        self.assertNotIn("content-type", conn.headers)
+
+    @patch("ctxpy.base.requests.request")
+    def test_request_does_not_use_module_request(self, mocker):
+        session = MagicMock(spec=requests.Session)
+        session.request.return_value = mock_response()
+        conn = CTXConnection(x_api_key="key", session=session)
+
+        conn._request(endpoint="chemical/search/equal/", query="BPA")
+
+        mocker.assert_not_called()
+
+    def test_batch_sends_each_chunk(self):
+        conn = CTXConnection(x_api_key="key")
+        query = ["A", "B", "C", "B", "D", "E"]
+        with patch.object(
+            CTXConnection, "_request", side_effect=lambda **kw: list(kw["query"])
+        ) as mocker:
+            info = conn._batch(
+                endpoint="chemical/search/equal/",
+                query=query,
+                batch_size=2,
+                params={"projection": "compact"},
+            )
+
+        self.assertEqual(info, ["A", "B", "C", "D", "E"])
+        self.assertEqual(
+            [c.kwargs["query"] for c in mocker.call_args_list],
+            [["A", "B"], ["C", "D"], ["E"]],
+        )
+        for c in mocker.call_args_list:
+            self.assertEqual(c.kwargs["params"], {"projection": "compact"})
+
+    def test_concurrent_batch_keeps_chunk_order(self):
+        conn = CTXConnection(x_api_key="key")
+        query = [f"DTXSID{i}" for i in range(20)]
+
+        def request(**kwargs):
+            ## Finish the first chunks last
+            time.sleep(0.01 * (20 - int(kwargs["query"][0][6:])) / 5)
+            return list(kwargs["query"])
+
+        with patch.object(CTXConnection, "_request", side_effect=request):
+            info = conn.ctx_call(
+                endpoint="chemical/search/equal/",
+                query=query,
+                batched=True,
+                batch_size=3,
+                max_workers=4,
+            )
+
+        self.assertEqual(info, query)
+
+    def test_concurrent_batch_reports_failed_chunk(self):
+        conn = CTXConnection(x_api_key="key", max_workers=3)
+        query = [f"DTXSID{i}" for i in range(10)]
+
+        def request(**kwargs):
+            if "DTXSID5" in kwargs["query"]:
+                raise requests.exceptions.HTTPError("502 Server Error")
+            return list(kwargs["query"])
+
+        with patch.object(CTXConnection, "_request", side_effect=request):
+            with self.assertRaises(BatchChunkError) as cm:
+                conn._batch(
+                    endpoint="chemical/search/equal/", query=query, batch_size=2
+                )
+
+        self.assertEqual(cm.exception.index, 2)
+        self.assertEqual(cm.exception.chunk, ["DTXSID4", "DTXSID5"])
+        self.assertIsInstance(cm.exception.error, requests.exceptions.HTTPError)
+
+    def test_iter_ctx_call_yields_each_chunk(self):
+        conn = CTXConnection(x_api_key="key", max_workers=4)
+        query = [f"DTXSID{i}" for i in range(20)]
+
+        def request(**kwargs):
+            ## Finish the first chunks last
+            time.sleep(0.01 * (20 - int(kwargs["query"][0][6:])) / 5)
+            return list(kwargs["query"])
+
+        with patch.object(CTXConnection, "_request", side_effect=request):
+            chunks = list(
+                conn.iter_ctx_call(
+                    endpoint="chemical/search/equal/", query=query, batch_size=3
+                )
+            )
+
+        self.assertEqual(len(chunks), 7)
+        self.assertEqual(chunks[0], ["DTXSID0", "DTXSID1", "DTXSID2"])
+        self.assertEqual([q for chunk in chunks for q in chunk], query)
+
+    def test_iter_ctx_call_is_lazy(self):
+        conn = CTXConnection(x_api_key="key")
+        query = [f"DTXSID{i}" for i in range(10)]
+
+        with patch.object(
+            CTXConnection, "_request", side_effect=lambda **kw: list(kw["query"])
+        ) as mocker:
+            chunks = conn.iter_ctx_call(
+                endpoint="chemical/search/equal/", query=query, batch_size=2
+            )
+            mocker.assert_not_called()
+            self.assertEqual(next(chunks), ["DTXSID0", "DTXSID1"])
+            chunks.close()
+
+        self.assertEqual(mocker.call_count, 1)
+
+    def test_iter_ctx_call_single_query(self):
+        conn = CTXConnection(x_api_key="key")
+        with patch.object(
+            CTXConnection, "_request", return_value={"dtxsid": "DTXSID7020182"}
+        ):
+            chunks = list(
+                conn.iter_ctx_call(
+                    endpoint="chemical/detail/search/by-dtxsid/", query="DTXSID7020182"
+                )
+            )
+        self.assertEqual(chunks, [{"dtxsid": "DTXSID7020182"}])
+
+    def test_to_df_normalizes_nulls(self):
+        data = [
+            {"name": "-", "value": 1.5, "flag": True, "notes": None, "tags": [1]},
+            {"name": "", "value": None, "flag": None, "notes": None, "tags": "-"},
+            {"name": "Atrazine", "value": 2.0, "flag": False, "notes": "", "tags": ""},
+        ]
+        df = ResponseTransformer(data).to_df()
+
+        ## Same result as chaining fillna and replace over the whole frame
+        expected = (
+            pd.DataFrame(data).fillna(pd.NA).replace("-", pd.NA).replace("", pd.NA)
+        )
+        pd.testing.assert_frame_equal(df, expected)
+        self.assertEqual(df["name"].isna().tolist(), [True, True, False])
+        self.assertIs(df.loc[1, "flag"], pd.NA)
+        self.assertEqual(df.loc[0, "tags"], [1])
+        self.assertEqual(df["value"].dtype, "float64")
+
+    def test_to_df_keeps_response_only_if_asked(self):
+        data = [{"dtxsid": f"DTXSID{i}", "big": i % 2 == 1} for i in range(10)]
+        self.assertNotIn("response", ResponseTransformer(data).to_df().attrs)
+
+        df = ResponseTransformer(data).to_df(keep_response=True)
+        response = df.attrs["response"]
+        self.assertIsInstance(response, RawResponse)
+        self.assertIs(response.data, data)
+
+        ## Derived frames share the response instead of copying it
+        self.assertIs(df.head(3).attrs["response"], response)
+        self.assertIs(df[df["big"]].attrs["response"], response)
+
+    @patch("ctxpy.base.CTXConnection.ctx_call")
+    def test_keep_response_option(self, mocker):
+        hit = [{"dtxsid": "DTXSID7020182", "cancerCall": "-"}]
+        mocker.return_value = hit
+
+        haz = ctxpy.Hazard(x_api_key="key")
+        df = haz.search_toxvaldb(by="cancer", dtxsid="DTXSID7020182")
+        self.assertEqual(df.attrs, {})
+
+        haz = ctxpy.Hazard(x_api_key="key", keep_response=True)
+        df = haz.search_toxvaldb(by="cancer", dtxsid="DTXSID7020182")
+        self.assertIs(df.attrs["response"].data, hit)
+
+    def test_to_df_columns(self):
+        data = [
+            {"dtxsid": "DTXSID1", "name": "A", "notes": "x", "value": 1},
+            {"dtxsid": "DTXSID2", "name": "-", "value": 2},
+        ]
+        df = ResponseTransformer(data).to_df(columns=["value", "name", "missing"])
+        self.assertEqual(list(df.columns), ["value", "name", "missing"])
+        self.assertEqual(df["value"].tolist(), [1, 2])
+        self.assertEqual(df["name"].isna().tolist(), [False, True])
+        self.assertTrue(df["missing"].isna().all())
+
+    def test_column_buffer(self):
+        chunks = [
+            [{"dtxsid": "DTXSID1", "name": "A"}, {"dtxsid": "DTXSID2", "name": "-"}],
+            [],
+            [{"dtxsid": "DTXSID3", "value": 1.5}],
+        ]
+        buffer = ColumnBuffer()
+        for chunk in chunks:
+            buffer.write(chunk)
+
+        self.assertEqual(buffer.rows, 3)
+        expected = ResponseTransformer([r for chunk in chunks for r in chunk]).to_df()
+        pd.testing.assert_frame_equal(buffer.to_df(), expected)
+
+        buffer = ColumnBuffer(columns=["value", "dtxsid"])
+        for chunk in chunks:
+            buffer.write(chunk)
+        df = buffer.to_df()
+        self.assertEqual(list(df.columns), ["value", "dtxsid"])
+        self.assertEqual(df["value"].isna().tolist(), [True, True, False])
+
+    @patch("ctxpy.base.CTXConnection.iter_ctx_call")
+    def test_columnar_option(self, mocker):
+        chunks = [
+            [{"dtxsid": "DTXSID1", "source": "ToxVal"}],
+            [{"dtxsid": "DTXSID2", "source": "-"}],
+        ]
+        mocker.return_value = iter(chunks)
+
+        haz = ctxpy.Hazard(columnar=True)
+        df = haz.search_toxvaldb(by="all", dtxsid=["DTXSID1", "DTXSID2"])
+
+        mocker.assert_called_once_with(
+            endpoint="hazard/toxval/search/by-dtxsid/",
+            query=["DTXSID1", "DTXSID2"],
+            batch_size=200,
+            batched=True,
+        )
+        self.assertEqual(df["dtxsid"].tolist(), ["DTXSID1", "DTXSID2"])
+        self.assertEqual(df["source"].isna().tolist(), [False, True])
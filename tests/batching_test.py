@@ -0,0 +1,194 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import requests
+
+import ctxpy
+from ctxpy.batching import AdaptiveBatchSizer
+from ctxpy.exceptions import BatchChunkError
+from ctxpy.mock_server import MockCTXServer
+from ctxpy.ratelimit import RateLimiter
+
+ENDPOINT = "chemical/detail/search/by-dtxsid/"
+
+
+def http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(response=response)
+
+
+class TestBatching(unittest.TestCase):
+    def connect(self, cls, server, **kwargs):
+        return cls(
+            x_api_key="key",
+            host=server.url,
+            rate_limiter=RateLimiter(rate=None),
+            **kwargs,
+        )
+
+    def test_sizer_grows_within_limits(self):
+        sizer = AdaptiveBatchSizer(target_latency=1.0, max_size=500)
+        self.assertEqual(sizer.size(ENDPOINT, default=100), 100)
+
+        ## Fast responses grow the chunk by at most `max_growth`, up to `max_size`
+        sizer.record(ENDPOINT, size=100, seconds=0.01, nbytes=1000)
+        self.assertEqual(sizer.size(ENDPOINT), 200)
+        sizer.record(ENDPOINT, size=200, seconds=0.02, nbytes=2000)
+        sizer.record(ENDPOINT, size=400, seconds=0.04, nbytes=4000)
+        self.assertEqual(sizer.size(ENDPOINT), 500)
+
+    def test_sizer_shrinks_on_latency_and_bytes(self):
+        sizer = AdaptiveBatchSizer(target_latency=1.0, max_bytes=10_000, smoothing=1)
+        sizer.record(ENDPOINT, size=100, seconds=4.0)
+        self.assertEqual(sizer.size(ENDPOINT), 25)
+        sizer.record(ENDPOINT, size=25, seconds=0.0, nbytes=25_000)
+        self.assertEqual(sizer.size(ENDPOINT), 10)
+
+    def test_sizer_split(self):
+        sizer = AdaptiveBatchSizer()
+        self.assertEqual(sizer.split(ENDPOINT, size=200), 100)
+        ## The failed size stays a ceiling, however fast later chunks are
+        sizer.record(ENDPOINT, size=100, seconds=0.0)
+        self.assertEqual(sizer.size(ENDPOINT), 100)
+        sizer.reset(ENDPOINT)
+        self.assertEqual(sizer.size(ENDPOINT, default=200), 200)
+
+        self.assertTrue(sizer.should_split(http_error(413)))
+        self.assertTrue(sizer.should_split(requests.Timeout()))
+        self.assertFalse(sizer.should_split(http_error(400)))
+        self.assertFalse(sizer.should_split(http_error(404)))
+        self.assertFalse(sizer.should_split(ValueError()))
+
+    def test_sizer_ceiling_recovers(self):
+        sizer = AdaptiveBatchSizer(max_size=400, recovery=2)
+        sizer.split(ENDPOINT, size=200)
+        for _ in range(4):
+            sizer.record(ENDPOINT, size=100, seconds=0.0)
+        self.assertEqual(sizer.size(ENDPOINT), 156)
+        for _ in range(10):
+            sizer.record(ENDPOINT, size=400, seconds=0.0)
+        self.assertEqual(sizer.size(ENDPOINT), 400)
+
+    def test_sizer_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            AdaptiveBatchSizer(target_latency=0)
+        with self.assertRaises(ValueError):
+            AdaptiveBatchSizer(min_size=10, max_size=5)
+
+    def test_split_on_too_large(self):
+        dtxsids = [f"DTXSID{i}" for i in range(300)]
+        sizer = AdaptiveBatchSizer()
+        with MockCTXServer(max_items=60) as server:
+            chem = self.connect(ctxpy.Chemical, server, batch_sizer=sizer)
+            info = chem.details(by="batch-dtxsid", query=dtxsids)
+
+        self.assertEqual([r["dtxsid"] for r in info], dtxsids)
+        self.assertLessEqual(sizer.size(ENDPOINT), 60)
+        self.assertEqual(server.stats["items"], 300)
+
+    def test_split_concurrent(self):
+        dtxsids = [f"DTXSID{i}" for i in range(500)]
+        sizer = AdaptiveBatchSizer(max_size=400)
+        with MockCTXServer(max_items=100) as server:
+            chem = self.connect(
+                ctxpy.Chemical, server, batch_sizer=sizer, max_workers=4
+            )
+            info = chem.details(by="batch-dtxsid", query=dtxsids)
+
+        self.assertEqual([r["dtxsid"] for r in info], dtxsids)
+
+    def test_iter_split_on_too_large(self):
+        dtxsids = [f"DTXSID{i}" for i in range(300)]
+        sizer = AdaptiveBatchSizer()
+        with MockCTXServer(max_items=60) as server:
+            chem = self.connect(ctxpy.Chemical, server, batch_sizer=sizer)
+            chunks = list(chem.iter_details(by="batch-dtxsid", query=dtxsids))
+            haz = self.connect(
+                ctxpy.Hazard, server, batch_sizer=sizer, columnar=True, max_workers=2
+            )
+            df = haz.search_toxvaldb(by="all", dtxsid=dtxsids)
+
+        self.assertEqual([r["dtxsid"] for c in chunks for r in c], dtxsids)
+        self.assertEqual(df["dtxsid"].tolist(), dtxsids)
+        self.assertLessEqual(sizer.size("hazard/toxval/search/by-dtxsid/"), 60)
+
+    def test_single_item_error_raises(self):
+        sizer = AdaptiveBatchSizer()
+        with MockCTXServer(max_items=0) as server:
+            chem = self.connect(ctxpy.Chemical, server, batch_sizer=sizer)
+            with self.assertRaises(BatchChunkError) as ctx:
+                chem.details(by="batch-dtxsid", query=["DTXSID1", "DTXSID2"])
+
+        self.assertEqual(len(ctx.exception.chunk), 1)
+
+    def test_bad_identifier_keeps_size(self):
+        dtxsids = [f"DTXSID{i}" for i in range(1000)]
+        sizes = []
+
+        def request(query, stats=None, **kwargs):
+            sizes.append(len(query))
+            if "DTXSID500" in query:
+                raise error
+            stats.update(seconds=0.01, bytes=100 * len(query))
+            return [{"dtxsid": q} for q in query]
+
+        for status in [400, 504]:
+            with self.subTest(status=status):
+                error = http_error(status)
+                sizer = AdaptiveBatchSizer()
+                chem = ctxpy.Chemical(x_api_key="key", batch_sizer=sizer)
+                with patch.object(chem, "_request", side_effect=request):
+                    with self.assertRaises(BatchChunkError):
+                        chem.details(by="batch-dtxsid", query=dtxsids)
+                    self.assertEqual(sizer.sizes().get(ENDPOINT, 1000), 1000)
+
+                    sizes.clear()
+                    dtxsids.remove("DTXSID500")
+                    info = chem.details(by="batch-dtxsid", query=dtxsids)
+                    dtxsids.insert(500, "DTXSID500")
+
+                self.assertEqual(len(info), 999)
+                self.assertEqual(sizes, [999])
+
+    def test_async_split_on_too_large(self):
+        dtxsids = [f"DTXSID{i}" for i in range(300)]
+        sizer = AdaptiveBatchSizer()
+
+        async def run(server):
+            async with self.connect(
+                ctxpy.AsyncChemical, server, batch_sizer=sizer, max_workers=2
+            ) as chem:
+                return await chem.details(by="batch-dtxsid", query=dtxsids)
+
+        with MockCTXServer(max_items=60) as server:
+            info = asyncio.run(run(server))
+
+        self.assertEqual([r["dtxsid"] for r in info], dtxsids)
+        self.assertLessEqual(sizer.size(ENDPOINT), 60)
+
+    def test_async_iter_split_on_too_large(self):
+        dtxsids = [f"DTXSID{i}" for i in range(300)]
+        sizer = AdaptiveBatchSizer()
+
+        async def run(server):
+            async with self.connect(
+                ctxpy.AsyncChemical, server, batch_sizer=sizer, max_workers=2
+            ) as chem:
+                return [
+                    chunk
+                    async for chunk in chem.iter_details(
+                        by="batch-dtxsid", query=dtxsids
+                    )
+                ]
+
+        with MockCTXServer(max_items=60) as server:
+            chunks = asyncio.run(run(server))
+
+        self.assertEqual([r["dtxsid"] for c in chunks for r in c], dtxsids)
+        self.assertLessEqual(sizer.size(ENDPOINT), 60)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+import json
+import sqlite3
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+from urllib.parse import unquote
+
+import requests
+
+from ctxpy.base import CTXConnection
+from ctxpy.cache import ResponseCache
+from ctxpy.ratelimit import RateLimiter
+
+
+def mock_response(content=b'[{"dtxsid": "DTXSID7020182"}]'):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = content
+    return response
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "cache.sqlite"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def connect(self, cache):
+        session = MagicMock(spec=requests.Session)
+        session.request.side_effect = lambda **kwargs: mock_response()
+        return CTXConnection(
+            x_api_key="key",
+            session=session,
+            rate_limiter=RateLimiter(rate=None),
+            cache=cache,
+        )
+
+    def test_hit_skips_network(self):
+        conn = self.connect(ResponseCache(path=self.path))
+        params = {"projection": "chemicaldetailall"}
+
+        first = conn._request(
+            endpoint="chemical/detail/search/by-dtxsid/",
+            query="DTXSID7020182",
+            params=params,
+        )
+        second = conn._request(
+            endpoint="chemical/detail/search/by-dtxsid/",
+            query="DTXSID7020182",
+            params=params,
+        )
+
+        self.assertEqual(first, second)
+        conn.session.request.assert_called_once()
+
+    def test_cache_is_shared_on_disk(self):
+        endpoint = "chemical/detail/search/by-dtxcid/"
+        self.connect(ResponseCache(path=self.path))._request(
+            endpoint=endpoint, query=["DTXCID501360", "DTXCID30182"]
+        )
+        conn = self.connect(ResponseCache(path=self.path))
+
+        ## Same identifiers in another order map to the same entry
+        conn._request(endpoint=endpoint, query=["DTXCID30182", "DTXCID501360"])
+
+        conn.session.request.assert_not_called()
+
+    def test_key_includes_params(self):
+        conn = self.connect(ResponseCache(path=self.path))
+        endpoint = "chemical/detail/search/by-dtxsid/"
+
+        conn._request(endpoint=endpoint, query="A", params={"projection": "compact"})
+        conn._request(endpoint=endpoint, query="A", params={"projection": "ntatoolkit"})
+
+        self.assertEqual(conn.session.request.call_count, 2)
+
+    def test_endpoint_ttl(self):
+        cache = ResponseCache(
+            path=self.path,
+            ttl=60,
+            endpoint_ttls={"exposure/": 1, "exposure/mmdb/": None},
+        )
+        self.assertEqual(cache.ttl_for("chemical/search/equal/"), 60)
+        self.assertEqual(cache.ttl_for("exposure/httk/search/by-dtxsid/"), 1)
+        self.assertIsNone(cache.ttl_for("/exposure/mmdb/mediums"))
+
+    def test_expired_response_is_refetched(self):
+        cache = ResponseCache(path=self.path, ttl=10)
+        conn = self.connect(cache)
+
+        conn._request(endpoint="chemical/search/equal/", query="BPA")
+        with patch("ctxpy.cache.time.time", return_value=time.time() + 11):
+            conn._request(endpoint="chemical/search/equal/", query="BPA")
+
+        self.assertEqual(conn.session.request.call_count, 2)
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(path=self.path, max_size=25)
+        cache.set("a", "x/", b"0123456789")
+        time.sleep(0.01)
+        cache.set("b", "x/", b"0123456789")
+        time.sleep(0.01)
+        ## Touch "a" so "b" becomes least recently used
+        cache.get("a")
+        cache.set("c", "x/", b"0123456789")
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_size_total(self):
+        ## Responses cached by an earlier version, before the total was kept
+        with sqlite3.connect(self.path) as db:
+            db.execute(
+                "CREATE TABLE responses (key TEXT PRIMARY KEY, endpoint TEXT NOT NULL, "
+                "expires REAL, accessed REAL NOT NULL, size INTEGER NOT NULL, "
+                "body BLOB NOT NULL)"
+            )
+            db.execute("INSERT INTO responses VALUES ('a', 'x/', NULL, 0, 4, 'abcd')")
+        db.close()
+
+        cache = ResponseCache(path=self.path, max_size=100)
+        cache.set("b", "x/", b"0123456789")
+        ## Replacing a response counts only its new size
+        cache.set("b", "x/", b"01234")
+        cache.set_many({"c": b"012", "d": b"0"}, endpoint="x/")
+        cache.get("a")
+
+        db = cache._connect()
+        (total,) = db.execute("SELECT size FROM totals").fetchone()
+        (expected,) = db.execute("SELECT SUM(size) FROM responses").fetchone()
+        self.assertEqual(total, 13)
+        self.assertEqual(total, expected)
+        cache.clear()
+        self.assertEqual(db.execute("SELECT size FROM totals").fetchone(), (0,))
+
+    def test_disabled_by_default(self):
+        conn = CTXConnection(x_api_key="key")
+        self.assertIsNone(conn.cache)
+
+    def test_batch_fetches_only_missing_items(self):
+        sent = []
+
+        def request(**kwargs):
+            query = json.loads(unquote(kwargs["data"]))
+            sent.append(query)
+            records = [{"dtxsid": q, "n": i} for i, q in enumerate(query)]
+            return mock_response(json.dumps(records).encode())
+
+        cache = ResponseCache(path=self.path)
+        conn = self.connect(cache)
+        conn.session.request.side_effect = request
+        endpoint = "chemical/detail/search/by-dtxsid/"
+        params = {"projection": "chemicaldetailall"}
+
+        conn.ctx_call(endpoint=endpoint, query=["A", "B", "C"], params=params)
+        info = conn.ctx_call(endpoint=endpoint, query=["D", "B", "A"], params=params)
+
+        self.assertEqual(sent, [["A", "B", "C"], ["D"]])
+        self.assertEqual(
+            info,
+            [{"dtxsid": "D", "n": 0}, {"dtxsid": "B", "n": 1}, {"dtxsid": "A", "n": 0}],
+        )
+
+        ## Everything is cached now; identifiers without results are cached as empty
+        conn.ctx_call(endpoint=endpoint, query=["A", "B", "C", "D"], params=params)
+        self.assertEqual(len(sent), 2)
+
+    def test_unmatched_records_are_not_cached(self):
+        cache = ResponseCache(path=self.path)
+        conn = self.connect(cache)
+        conn.session.request.side_effect = lambda **kwargs: mock_response(
+            b'[{"searchValue": "bpa", "dtxsid": "DTXSID7020182"}]'
+        )
+
+        info = conn.ctx_call(endpoint="chemical/search/equal/", query=["BPA"])
+
+        self.assertEqual(info, [{"searchValue": "bpa", "dtxsid": "DTXSID7020182"}])
+        self.assertEqual(len(cache), 0)
+
+    def test_item_fields(self):
+        cache = ResponseCache(path=self.path)
+        self.assertEqual(cache.item_field("chemical/search/equal/"), "searchValue")
+        self.assertEqual(
+            cache.item_field("exposure/product-data/search/by-dtxsid/"), "dtxsid"
+        )
+        self.assertEqual(cache.item_field("hazard/toxref/search/by-dtxsid/"), "dtxsid")
+        self.assertEqual(
+            cache.item_field("hazard/toxref/effects/search/by-dtxsid/"), "dtxsid"
+        )
+        self.assertIsNone(cache.item_field("hazard/toxval/search/by-dtxsid/"))
@@ -0,0 +1,109 @@
+import asyncio
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import ctxpy
+from ctxpy.cassette import Cassette
+from ctxpy.exceptions import CassetteMissError
+from ctxpy.mock_server import MockCTXServer
+from ctxpy.ratelimit import RateLimiter
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+class TestCassette(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / "cassette.sqlite"
+
+    def connect(self, cls, cassette, host, **kwargs):
+        return cls(
+            x_api_key="key",
+            host=host,
+            cassette=cassette,
+            rate_limiter=RateLimiter(rate=None),
+            **kwargs,
+        )
+
+    def record(self):
+        dtxsids = [f"DTXSID{i}" for i in range(5)]
+        with MockCTXServer(mmdb_records=20) as server:
+            host = server.url
+            chem = self.connect(
+                ctxpy.Chemical, Cassette(self.path, mode="record"), host
+            )
+            details = chem.details(by="batch-dtxsid", query=dtxsids)
+            single = chem.details(by="dtxsid", query="DTXSID7020182")
+            expo = self.connect(
+                ctxpy.Exposure, Cassette(self.path, mode="record"), host
+            )
+            mmdb = expo.search_mmdb(by="medium", query="soil")
+        return host, dtxsids, details, single, mmdb
+
+    def test_replay_without_server(self):
+        host, dtxsids, details, single, mmdb = self.record()
+
+        cassette = Cassette(self.path)
+        self.assertEqual(len(cassette), 3)
+        chem = self.connect(ctxpy.Chemical, cassette, host)
+        self.assertEqual(chem.details(by="batch-dtxsid", query=dtxsids), details)
+        self.assertEqual(chem.details(by="dtxsid", query="DTXSID7020182"), single)
+
+        ## Streamed decoding reads the replayed body too
+        expo = self.connect(ctxpy.Exposure, cassette, host, stream=True)
+        replayed = expo.search_mmdb(by="medium", query="soil")
+        self.assertTrue(replayed.equals(mmdb))
+
+    def test_replay_miss(self):
+        host = self.record()[0]
+        chem = self.connect(ctxpy.Chemical, Cassette(self.path), host)
+        with self.assertRaises(CassetteMissError):
+            chem.details(by="batch-dtxsid", query=["DTXSID9"])
+        with self.assertRaises(CassetteMissError):
+            chem.details(by="dtxsid", query="DTXSID9")
+
+    def test_replay_latency(self):
+        host = self.record()[0]
+        chem = self.connect(ctxpy.Chemical, Cassette(self.path, latency=0.05), host)
+        start = time.perf_counter()
+        chem.details(by="dtxsid", query="DTXSID7020182")
+        self.assertGreaterEqual(time.perf_counter() - start, 0.05)
+
+    def test_key_ignores_parameter_order(self):
+        self.assertEqual(
+            Cassette.key("GET", "https://a/b?x=1&y=2"),
+            Cassette.key("get", "https://a/b?y=2&x=1"),
+        )
+        self.assertNotEqual(
+            Cassette.key("POST", "https://a/b", '["A"]'),
+            Cassette.key("POST", "https://a/b", '["B"]'),
+        )
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            Cassette(self.path, mode="rewind")
+
+    @unittest.skipIf(httpx is None, "httpx is not installed")
+    def test_async_replay(self):
+        host, dtxsids, details, single, _ = self.record()
+
+        async def run():
+            async with self.connect(
+                ctxpy.AsyncChemical, Cassette(self.path), host
+            ) as chem:
+                return (
+                    await chem.details(by="batch-dtxsid", query=dtxsids),
+                    await chem.details(by="dtxsid", query="DTXSID7020182"),
+                )
+
+        self.assertEqual(asyncio.run(run()), (details, single))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import requests
+
+from ctxpy.base import CTXConnection
+from ctxpy.checkpoint import JobCheckpoint, write_atomic
+from ctxpy.exceptions import BatchChunkError
+
+
+class TestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.conn = CTXConnection(x_api_key="key", checkpoint_dir=self.tmp.name)
+        self.query = [f"DTXSID{i}" for i in range(10)]
+
+    def batch(self):
+        return self.conn._batch(
+            endpoint="chemical/detail/search/by-dtxsid/",
+            query=self.query,
+            batch_size=2,
+            params={"projection": "compact"},
+        )
+
+    def test_resume_skips_finished_chunks(self):
+        def failing(**kwargs):
+            if "DTXSID6" in kwargs["query"]:
+                raise requests.exceptions.ConnectionError("dropped")
+            return [{"dtxsid": q} for q in kwargs["query"]]
+
+        with self.conn.job("details"):
+            with patch.object(CTXConnection, "_request", side_effect=failing):
+                with self.assertRaises(BatchChunkError) as cm:
+                    self.batch()
+            self.assertEqual(cm.exception.index, 3)
+
+            with patch.object(
+                CTXConnection,
+                "_request",
+                side_effect=lambda **kw: [{"dtxsid": q} for q in kw["query"]],
+            ) as mocker:
+                info = self.batch()
+
+        self.assertEqual(
+            [c.kwargs["query"] for c in mocker.call_args_list],
+            [["DTXSID6", "DTXSID7"], ["DTXSID8", "DTXSID9"]],
+        )
+        self.assertEqual(info, [{"dtxsid": q} for q in self.query])
+        self.assertIsNone(self.conn.job_id)
+
+    def test_manifest_and_chunks_on_disk(self):
+        with self.conn.job("details"):
+            with patch.object(
+                CTXConnection, "_request", side_effect=lambda **kw: list(kw["query"])
+            ):
+                self.batch()
+
+        (path,) = (Path(self.tmp.name) / "details").iterdir()
+        manifest = json.loads((path / "manifest.json").read_text())
+        self.assertEqual(manifest["endpoint"], "chemical/detail/search/by-dtxsid/")
+        self.assertEqual(manifest["params"], {"projection": "compact"})
+        self.assertEqual(manifest["chunks"][0], ["DTXSID0", "DTXSID1"])
+        self.assertEqual(len(list(path.glob("chunk-*.json"))), 5)
+        self.assertEqual(list(path.glob(".*")), [])
+
+    def test_no_checkpoint_outside_job(self):
+        with patch.object(
+            CTXConnection, "_request", side_effect=lambda **kw: list(kw["query"])
+        ):
+            self.batch()
+        self.assertEqual(list(Path(self.tmp.name).iterdir()), [])
+
+    def test_calls_are_kept_apart(self):
+        first = JobCheckpoint(self.tmp.name, "job", "a/", chunks=[["A"], ["B"]])
+        second = JobCheckpoint(self.tmp.name, "job", "a/", chunks=[["A"], ["C"]])
+        first.save(0, [{"dtxsid": "A"}])
+
+        self.assertNotEqual(first.path, second.path)
+        self.assertEqual(first.completed, [0])
+        self.assertEqual(second.completed, [])
+        self.assertEqual(first.load(0), [{"dtxsid": "A"}])
+
+    def test_invalid_job_id(self):
+        with self.assertRaises(ValueError):
+            JobCheckpoint(self.tmp.name, "../escape", "a/", chunks=[["A"]])
+
+    def test_write_atomic_keeps_old_file_on_error(self):
+        path = Path(self.tmp.name) / "file.json"
+        write_atomic(path, b"old")
+
+        with patch("ctxpy.checkpoint.os.replace", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                write_atomic(path, b"new")
+
+        self.assertEqual(path.read_bytes(), b"old")
+        self.assertEqual([p.name for p in Path(self.tmp.name).iterdir()], ["file.json"])
+
+
+if __name__ == "__main__":
+    unittest.main()
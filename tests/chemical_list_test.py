@@ -264,6 +264,19 @@ class TestChemicalLists(unittest.TestCase):
         mocker.assert_called_once_with(endpoint=endpoint, query=query)
         self.assertEqual(result, hit)
 
+    @patch("ctxpy.base.CTXConnection.ctx_call")
+    def test_get_lists_containing(self, mocker):
+        hit = ["BIOSOLIDS2021", "CALWATERBDS"]
+        mocker.return_value = hit
+        dtxsid = "DTXSID7020182"
+        endpoint = "chemical/list/search/by-dtxsid/"
+
+        clist = ctxpy.ChemicalList()
+        result = clist.get_lists_containing(dtxsid=dtxsid)
+
+        mocker.assert_called_once_with(endpoint=endpoint, query=dtxsid)
+        self.assertEqual(result, hit)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -507,5 +507,63 @@ class TestChemical(unittest.TestCase):
         self.assertEqual(result, hit)
 
 
+    @patch("ctxpy.base.CTXConnection.iter_ctx_call")
+    def test_iter_details_batch(self, mocker):
+        chunks = [[{"dtxsid": "DTXSID7021360"}], [{"dtxsid": "DTXSID001009823"}]]
+        mocker.return_value = iter(chunks)
+
+        dtxsid = ["DTXSID7021360", "DTXSID001009823"]
+        chem = ctxpy.Chemical()
+        result = chem.iter_details(by="batch-dtxsid", query=dtxsid, batch_size=1)
+
+        mocker.assert_not_called()
+        self.assertEqual(list(result), chunks)
+        mocker.assert_called_once_with(
+            endpoint="chemical/detail/search/by-dtxsid/",
+            query=dtxsid,
+            params={"projection": "chemicaldetailall"},
+            batch_size=1,
+        )
+
+    @patch("ctxpy.base.CTXConnection.iter_ctx_call")
+    def test_iter_details_columns(self, mocker):
+        chunks = [
+            [{"dtxsid": "DTXSID7021360", "casrn": "50-00-0", "monoisotopicMass": 1}],
+            [{"dtxsid": "DTXSID001009823", "monoisotopicMass": 2}],
+        ]
+        mocker.return_value = iter(chunks)
+
+        chem = ctxpy.Chemical()
+        result = chem.iter_details(
+            by="batch-dtxsid",
+            query=["DTXSID7021360", "DTXSID001009823"],
+            columns=["dtxsid", "casrn"],
+        )
+
+        self.assertEqual(
+            list(result),
+            [
+                [{"dtxsid": "DTXSID7021360", "casrn": "50-00-0"}],
+                [{"dtxsid": "DTXSID001009823"}],
+            ],
+        )
+
+    @patch("ctxpy.base.CTXConnection.iter_ctx_call")
+    def test_iter_search_batch(self, mocker):
+        chunks = [[{"dtxsid": "DTXSID7021360", "searchValue": "Toluene"}]]
+        mocker.return_value = iter(chunks)
+
+        chem = ctxpy.Chemical()
+        result = list(chem.iter_search(by="batch", query=["Toluene"]))
+
+        mocker.assert_called_once_with(
+            endpoint="chemical/search/equal/",
+            query=["Toluene"],
+            batch_size=200,
+            params=None,
+            bracketed=False,
+        )
+        self.assertEqual(result, chunks)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,110 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import requests
+
+import ctxpy
+from ctxpy.cache import ResponseCache
+from ctxpy.dossier import DossierPlan
+from ctxpy.mock_server import MockCTXServer
+from ctxpy.ratelimit import RateLimiter
+
+
+class TestDossier(unittest.TestCase):
+    dtxsid = ["DTXSID1", "DTXSID2", "DTXSID3", "DTXSID1"]
+
+    def test_plan(self):
+        dossier = ctxpy.Dossier(x_api_key="key")
+        plan = dossier.plan(
+            dtxsid=self.dtxsid, datasets=["details", "cpdat-puc", "qsurs", "lists"]
+        )
+
+        ## One batch request for each batch search, one per DTXSID for the others
+        self.assertEqual(plan.summary(), {"batch": 2, "single": 6})
+        self.assertEqual(
+            plan.requests[0],
+            {
+                "endpoint": "chemical/detail/search/by-dtxsid/",
+                "params": {"projection": "chemicaldetailall"},
+                "query": ["DTXSID1", "DTXSID2", "DTXSID3"],
+            },
+        )
+        self.assertEqual(
+            plan.requests[2],
+            {
+                "endpoint": "exposure/functional-use/probability/search/by-dtxsid/",
+                "query": "DTXSID1",
+            },
+        )
+        self.assertEqual(plan.endpoints["lists"], "chemical/list/search/by-dtxsid/")
+
+    def test_plan_dedupes_requests(self):
+        plan = DossierPlan(dtxsid=["DTXSID1"], datasets=["a", "b"])
+        request = {"endpoint": "hazard/iris/search/by-dtxsid/", "query": "DTXSID1"}
+        plan.add("a", dict(request), ["DTXSID1"])
+        plan.add("b", dict(request), ["DTXSID1"])
+
+        self.assertEqual(len(plan), 1)
+        self.assertEqual(plan.uses, [[("a", ["DTXSID1"]), ("b", ["DTXSID1"])]])
+
+    def test_plan_invalid_dataset(self):
+        dossier = ctxpy.Dossier(x_api_key="key")
+        with self.assertRaises(KeyError):
+            dossier.plan(dtxsid=self.dtxsid, datasets=["toxcast"])
+        with self.assertRaises(TypeError):
+            dossier.plan(dtxsid=7020182, datasets=["details"])
+
+    @patch("ctxpy.base.CTXConnection._request")
+    def test_fetch(self, mocker):
+        def request(endpoint, query, params=None):
+            if isinstance(query, list):
+                return [{"dtxsid": q, "preferredName": f"name {q}"} for q in query]
+            if query == "DTXSID2":
+                raise requests.exceptions.HTTPError("404 Client Error")
+            return ["LIST_A", "LIST_B"]
+
+        mocker.side_effect = request
+        dossier = ctxpy.Dossier(x_api_key="key", max_workers=4)
+        with self.assertWarns(UserWarning):
+            result = dossier.fetch(dtxsid=self.dtxsid, datasets=["details", "lists"])
+
+        self.assertEqual(mocker.call_count, 4)
+        self.assertEqual(list(result), ["details", "lists"])
+        self.assertEqual(len(result["details"]), 3)
+        self.assertEqual(list(result["lists"].columns), ["dtxsid", "listName"])
+        self.assertEqual(
+            result["lists"]["dtxsid"].tolist(),
+            ["DTXSID1", "DTXSID1", "DTXSID3", "DTXSID3"],
+        )
+        self.assertEqual(list(dossier.failed_items), [("lists", "DTXSID2")])
+
+    def test_fetch_cached(self):
+        datasets = ["details", "cpdat-fc", "cpdat-puc", "qsurs"]
+        with tempfile.TemporaryDirectory() as tmp, MockCTXServer() as server:
+            dossier = ctxpy.Dossier(
+                x_api_key="key",
+                host=server.url,
+                rate_limiter=RateLimiter(rate=None),
+                cache=ResponseCache(path=Path(tmp) / "cache.sqlite"),
+                max_workers=4,
+            )
+            first = dossier.fetch(dtxsid=self.dtxsid[:2], datasets=datasets)
+            sent = dict(server.stats)
+
+            ## A second fetch is answered from the cache, and a third only requests
+            ## the DTXSID that wasn't fetched before
+            second = dossier.fetch(dtxsid=self.dtxsid[:2], datasets=datasets)
+            self.assertEqual(server.stats, sent)
+            dossier.fetch(dtxsid=self.dtxsid[:3], datasets=datasets)
+
+        self.assertEqual(sent["POST"], 3)
+        for dataset in datasets:
+            self.assertTrue(first[dataset].equals(second[dataset]))
+        self.assertEqual(server.stats["POST"], 6)
+        self.assertEqual(server.stats["items"] - sent["items"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
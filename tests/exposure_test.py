@@ -2,6 +2,7 @@ import unittest
 from unittest.mock import patch
 
 import pandas as pd
+import requests
 
 import ctxpy
 
@@ -102,6 +103,29 @@ class TestExposure(unittest.TestCase, CustomAssertions):
         mocker.assert_called_once_with(endpoint=endpoint, query=dtxsid)
         self.assertFramesEqual(left=result, right=pd.DataFrame(hit))
 
+    @patch("ctxpy.base.CTXConnection._request")
+    def test_search_qsurs_fan_out(self, mocker):
+        def request(endpoint, query, params=None):
+            if query == "DTXSID2":
+                raise requests.exceptions.HTTPError("404 Client Error")
+            return [{"harmonizedFunctionalUse": f"use of {query}", "probability": 0.5}]
+
+        mocker.side_effect = request
+
+        expo = ctxpy.Exposure(max_workers=4)
+        dtxsid = ["DTXSID3", "DTXSID1", "DTXSID2", "DTXSID3"]
+        with self.assertWarns(UserWarning):
+            result = expo.search_qsurs(dtxsid=dtxsid)
+
+        self.assertEqual(mocker.call_count, 3)
+        ## Records are tagged with their DTXSID, in the order the DTXSIDs were given
+        self.assertEqual(result["dtxsid"].tolist(), ["DTXSID3", "DTXSID1"])
+        self.assertEqual(
+            result["harmonizedFunctionalUse"].tolist(),
+            ["use of DTXSID3", "use of DTXSID1"],
+        )
+        self.assertEqual(list(expo.failed_items), ["DTXSID2"])
+
     @patch("ctxpy.base.CTXConnection.ctx_call")
     def test_get_cpdat_vocabulary_fc(self, mocker):
 
@@ -682,5 +706,27 @@ class TestExposure(unittest.TestCase, CustomAssertions):
         self.assertFramesEqual(left=result, right=pd.DataFrame(result))
 
 
+    @patch("ctxpy.base.CTXConnection.iter_ctx_call")
+    def test_iter_search_cpdat_batch(self, mocker):
+        chunks = [
+            [{"id": 0, "dtxsid": "DTXSID7020182"}],
+            [{"id": 1, "dtxsid": "DTXSID2021868"}],
+        ]
+        mocker.return_value = iter(chunks)
+
+        dtxsid = ["DTXSID7020182", "DTXSID2021868"]
+        expo = ctxpy.Exposure()
+        result = list(expo.iter_search_cpdat(vocab_name="fc", dtxsid=dtxsid))
+
+        mocker.assert_called_once_with(
+            endpoint="exposure/functional-use/search/by-dtxsid/",
+            query=dtxsid,
+            batch_size=200,
+            bracketed=True,
+        )
+        self.assertEqual(len(result), 2)
+        for df, chunk in zip(result, chunks):
+            self.assertFramesEqual(left=df, right=pd.DataFrame(chunk))
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,7 +1,9 @@
 import unittest
+import warnings
 from unittest.mock import patch
 
 import pandas as pd
+import requests
 
 import ctxpy
 
@@ -65,7 +67,9 @@ class TestHazard(unittest.TestCase, CustomAssertions):
 
         dtxsid = ["DTXSID7020182", "DTXSID2021868"]
         endpoint = "hazard/cancer-summary/search/by-dtxsid/"
-        mocker.assert_called_once_with(endpoint=endpoint, query=dtxsid, batch_size=200)
+        mocker.assert_called_once_with(
+            endpoint=endpoint, query=dtxsid, batch_size=200, batched=True
+        )
         self.assertFramesEqual(left=result, right=pd.DataFrame(hit))
 
     @patch("ctxpy.base.CTXConnection.ctx_call")
@@ -138,7 +142,9 @@ class TestHazard(unittest.TestCase, CustomAssertions):
         result = haz.search_toxvaldb(by="skin-eye", dtxsid=dtxsid)
 
         endpoint = "hazard/skin-eye/search/by-dtxsid/"
-        mocker.assert_called_once_with(endpoint=endpoint, query=dtxsid, batch_size=200)
+        mocker.assert_called_once_with(
+            endpoint=endpoint, query=dtxsid, batch_size=200, batched=True
+        )
         self.assertFramesEqual(left=result, right=pd.DataFrame(hit))
 
     @patch("ctxpy.base.CTXConnection.ctx_call")
@@ -304,7 +310,9 @@ class TestHazard(unittest.TestCase, CustomAssertions):
         haz = ctxpy.Hazard()
         result = haz.search_toxvaldb(by="all", dtxsid=dtxsid)
         endpoint = "hazard/toxval/search/by-dtxsid/"
-        mocker.assert_called_once_with(endpoint=endpoint, query=dtxsid, batch_size=200)
+        mocker.assert_called_once_with(
+            endpoint=endpoint, query=dtxsid, batch_size=200, batched=True
+        )
         self.assertFramesEqual(left=result, right=pd.DataFrame(hit))
 
     @patch("ctxpy.base.CTXConnection.ctx_call")
@@ -420,7 +428,9 @@ class TestHazard(unittest.TestCase, CustomAssertions):
         haz = ctxpy.Hazard()
         result = haz.search_toxvaldb(by="genetox", dtxsid=dtxsid)
         endpoint = "hazard/genetox/details/search/by-dtxsid/"
-        mocker.assert_called_once_with(endpoint=endpoint, query=dtxsid, batch_size=200)
+        mocker.assert_called_once_with(
+            endpoint=endpoint, query=dtxsid, batch_size=200, batched=True
+        )
         self.assertFramesEqual(left=result, right=pd.DataFrame(hit))
 
     @patch("ctxpy.base.CTXConnection.ctx_call")
@@ -474,7 +484,9 @@ class TestHazard(unittest.TestCase, CustomAssertions):
         haz = ctxpy.Hazard()
         result = haz.search_toxvaldb(by="genetox-summary", dtxsid=dtxsid)
         endpoint = "hazard/genetox/summary/search/by-dtxsid/"
-        mocker.assert_called_once_with(endpoint=endpoint, query=dtxsid, batch_size=200)
+        mocker.assert_called_once_with(
+            endpoint=endpoint, query=dtxsid, batch_size=200, batched=True
+        )
         self.assertFramesEqual(left=result, right=pd.DataFrame(hit))
 
     @patch("ctxpy.base.CTXConnection.ctx_call")
@@ -1215,6 +1227,26 @@ class TestHazard(unittest.TestCase, CustomAssertions):
         mocker.assert_called_once_with(endpoint=endpoint, query=dtxsid)
         self.assertFramesEqual(left=result, right=pd.DataFrame(hit))
 
+    @patch("ctxpy.base.CTXConnection._request")
+    def test_search_pprtv_batch(self, mocker):
+        def request(endpoint, query, params=None):
+            return [{"id": 0, "name": f"name of {query}", "rfdValue": "-"}]
+
+        mocker.side_effect = request
+        dtxsid = ["DTXSID7020182", "DTXSID2021868"]
+        haz = ctxpy.Hazard(max_workers=2)
+        result = haz.search_pprtv(dtxsid=dtxsid)
+
+        self.assertEqual(mocker.call_count, 2)
+        mocker.assert_any_call(
+            endpoint="/hazard/pprtv/search/by-dtxsid/",
+            query="DTXSID2021868",
+            params=None,
+        )
+        self.assertEqual(list(result.columns), ["dtxsid", "id", "name", "rfdValue"])
+        self.assertEqual(result["dtxsid"].tolist(), dtxsid)
+        self.assertTrue(result["rfdValue"].isna().all())
+
     @patch("ctxpy.base.CTXConnection.ctx_call")
     def test_search_hawc(self, mocker):
         hit = [
@@ -1287,5 +1319,121 @@ class TestHazard(unittest.TestCase, CustomAssertions):
         self.assertFramesEqual(left=result, right=pd.DataFrame(hit))
 
 
+    @patch("ctxpy.base.CTXConnection.iter_ctx_call")
+    def test_iter_search_toxrefdb_dtxsid_batch(self, mocker):
+        chunks = [
+            [{"studyId": 0, "dtxsid": "DTXSID7020182"}],
+            [{"studyId": 1, "dtxsid": "DTXSID2021868"}],
+        ]
+        mocker.return_value = iter(chunks)
+
+        dtxsid = ["DTXSID7020182", "DTXSID2021868"]
+        haz = ctxpy.Hazard()
+        result = list(
+            haz.iter_search_toxrefdb(by="dtxsid", domain="summary", query=dtxsid)
+        )
+
+        mocker.assert_called_once_with(
+            endpoint="hazard/toxref/summary/search/by-dtxsid/",
+            query=dtxsid,
+            batch_size=200,
+        )
+        self.assertEqual(len(result), 2)
+        for df, chunk in zip(result, chunks):
+            self.assertFramesEqual(left=df, right=pd.DataFrame(chunk))
+
+    @patch("ctxpy.base.CTXConnection.ctx_call")
+    def test_search_toxvaldb_batch(self, mocker):
+        hit = [
+            {"id": 0, "dtxsid": "DTXSID7020182", "source": "ToxVal"},
+            {"id": 1, "dtxsid": "DTXSID2021868", "source": "IRIS"},
+        ]
+        mocker.return_value = hit
+        dtxsid = ["DTXSID7020182", "DTXSID2021868"]
+        haz = ctxpy.Hazard()
+        result = haz.search_toxvaldb(by="cancer", dtxsid=dtxsid)
+        mocker.assert_called_once_with(
+            endpoint="hazard/cancer-summary/search/by-dtxsid/",
+            query=dtxsid,
+            batch_size=200,
+            batched=True,
+        )
+        self.assertFramesEqual(left=result, right=pd.DataFrame(hit))
+
+        with self.assertRaises(TypeError):
+            haz.search_toxvaldb(by="all", dtxsid=7020182)
+
+    @patch("ctxpy.base.CTXConnection._request")
+    def test_search_toxvaldb_longer_than_batch_size(self, mocker):
+        mocker.side_effect = lambda endpoint, query, **kwargs: [
+            {"dtxsid": q} for q in query
+        ]
+        dtxsid = ["DTXSID1", "DTXSID2", "DTXSID3"]
+        haz = ctxpy.Hazard()
+        haz.batch_size = 2
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            result = haz.search_toxvaldb(by="all", dtxsid=dtxsid)
+
+        self.assertEqual(mocker.call_count, 2)
+        self.assertEqual(result["dtxsid"].tolist(), dtxsid)
+
+    @patch("ctxpy.base.CTXConnection.ctx_call")
+    def test_search_toxvaldb_columns(self, mocker):
+        hit = [
+            {"id": 0, "dtxsid": "DTXSID7020182", "source": "ToxVal", "url": "a"},
+            {"id": 1, "dtxsid": "DTXSID7020182", "source": "-", "url": "b"},
+        ]
+        mocker.return_value = hit
+
+        haz = ctxpy.Hazard()
+        result = haz.search_toxvaldb(
+            by="all", dtxsid="DTXSID7020182", columns=["source", "id"]
+        )
+
+        mocker.assert_called_once_with(
+            endpoint="hazard/toxval/search/by-dtxsid/",
+            query="DTXSID7020182",
+            batch_size=200,
+        )
+        self.assertEqual(list(result.columns), ["source", "id"])
+        self.assertEqual(result["source"].isna().tolist(), [False, True])
+
+
+    @patch("ctxpy.base.CTXConnection._request")
+    def test_profile(self, mocker):
+        def request(endpoint, query):
+            if isinstance(query, list):
+                return [{"dtxsid": q, "source": endpoint.split("/")[1]} for q in query]
+            if query == "DTXSID2":
+                raise requests.exceptions.HTTPError("404 Client Error")
+            return [{"name": endpoint.split("/")[2]}]
+
+        mocker.side_effect = request
+        dtxsid = ["DTXSID1", "DTXSID2", "DTXSID3", "DTXSID1"]
+        haz = ctxpy.Hazard(max_workers=4)
+        haz.batch_size = 2
+        with self.assertWarns(UserWarning):
+            result = haz.profile(dtxsid=dtxsid, domains=["cancer", "iris"])
+
+        ## Two batches of ToxValDB DTXSIDs, and one IRIS request per DTXSID
+        self.assertEqual(mocker.call_count, 5)
+        self.assertEqual(list(result), ["cancer", "iris"])
+        self.assertEqual(
+            result["cancer"]["dtxsid"].tolist(), ["DTXSID1", "DTXSID2", "DTXSID3"]
+        )
+        self.assertEqual(result["iris"]["dtxsid"].tolist(), ["DTXSID1", "DTXSID3"])
+        self.assertEqual(list(haz.failed_items), [("iris", "DTXSID2")])
+
+        with self.assertWarns(UserWarning):
+            long = haz.profile(dtxsid=dtxsid, domains=["cancer", "iris"], how="long")
+        self.assertEqual(list(long.columns), ["domain", "dtxsid", "source", "name"])
+        self.assertEqual(long["domain"].tolist(), ["cancer"] * 3 + ["iris"] * 2)
+
+        with self.assertRaises(KeyError):
+            haz.profile(dtxsid=dtxsid, domains=["toxcast"])
+        with self.assertRaises(ValueError):
+            haz.profile(dtxsid=dtxsid, how="wide")
+
 if __name__ == "__main__":
     unittest.main()
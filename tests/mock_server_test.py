@@ -0,0 +1,91 @@
+import unittest
+
+import requests
+
+import ctxpy
+from ctxpy.mock_server import MockCTXServer
+from ctxpy.ratelimit import RateLimiter
+from ctxpy.retry import RetryPolicy
+
+
+class TestMockServer(unittest.TestCase):
+    def connect(self, cls, server, **kwargs):
+        return cls(
+            x_api_key="key",
+            host=server.url,
+            rate_limiter=RateLimiter(rate=None),
+            **kwargs,
+        )
+
+    def test_get_single_detail(self):
+        with MockCTXServer() as server:
+            chem = self.connect(ctxpy.Chemical, server)
+            info = chem.details(by="dtxsid", query="DTXSID7020182")
+
+        self.assertIsInstance(info, dict)
+        self.assertEqual(info["dtxsid"], "DTXSID7020182")
+        self.assertEqual(server.stats["GET"], 1)
+
+    def test_post_bracketed_and_newline_bodies(self):
+        dtxsids = [f"DTXSID{i}" for i in range(5)]
+        with MockCTXServer() as server:
+            chem = self.connect(ctxpy.Chemical, server)
+            details = chem.details(by="batch-dtxsid", query=dtxsids, subset="compact")
+            matches = chem.search(by="batch", query=["Bisphenol A", "Toluene"])
+
+        self.assertEqual([r["dtxsid"] for r in details], dtxsids)
+        self.assertEqual(len(details[0]), 3)
+        self.assertEqual(
+            [r["searchValue"] for r in matches], ["Bisphenol A", "Toluene"]
+        )
+        self.assertEqual(server.stats["POST"], 2)
+        self.assertEqual(server.stats["items"], 7)
+
+    def test_domain_endpoints(self):
+        with MockCTXServer(records_per_item=2, mmdb_records=10) as server:
+            haz = self.connect(ctxpy.Hazard, server)
+            expo = self.connect(ctxpy.Exposure, server)
+            toxval = haz.search_toxvaldb(by="all", dtxsid="DTXSID7020182")
+            iris = haz.search_iris(dtxsid="DTXSID7020182")
+            mmdb = expo.search_mmdb(by="medium", query="soil")
+
+        self.assertEqual(len(toxval), 2)
+        self.assertEqual(iris["dtxsid"].unique().tolist(), ["DTXSID7020182"])
+        self.assertEqual(len(mmdb), 10)
+        self.assertEqual(mmdb.attrs["medium"], "soil")
+
+    def test_throttling_is_retried(self):
+        with MockCTXServer(throttle_rate=0.5, retry_after=0, seed=1) as server:
+            chem = self.connect(
+                ctxpy.Chemical,
+                server,
+                retry_policy=RetryPolicy(max_attempts=20, backoff_factor=0),
+            )
+            for i in range(10):
+                chem.details(by="dtxsid", query=f"DTXSID{i}")
+
+        self.assertGreater(server.stats["throttled"], 0)
+        self.assertEqual(server.stats["requests"], 10 + server.stats["throttled"])
+
+    def test_errors_and_oversized_batches(self):
+        with MockCTXServer(error_rate=1.0) as server:
+            chem = self.connect(
+                ctxpy.Chemical, server, retry_policy=RetryPolicy(max_attempts=1)
+            )
+            with self.assertRaises(requests.exceptions.HTTPError):
+                chem.details(by="dtxsid", query="DTXSID7020182")
+
+        with MockCTXServer(max_items=2) as server:
+            chem = self.connect(ctxpy.Chemical, server)
+            with self.assertRaises(requests.exceptions.HTTPError) as cm:
+                chem.details(by="batch-dtxsid", query=["A", "B", "C"])
+        self.assertEqual(cm.exception.response.status_code, 413)
+
+    def test_missing_api_key(self):
+        with MockCTXServer() as server:
+            response = requests.get(f"{server.url}chemical/list/type")
+        self.assertEqual(response.status_code, 401)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+import ctxpy
+from ctxpy.base import CTXConnection
+from ctxpy.ratelimit import RateLimiter, get_rate_limiter, parse_retry_after
+
+
+def mock_response(status_code=200, headers=None):
+    response = MagicMock(spec=requests.Response)
+    response.content = b"[]"
+    response.status_code = status_code
+    response.headers = headers or {}
+    return response
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_burst_is_not_delayed(self):
+        limiter = RateLimiter(rate=1, burst=5)
+        start = time.monotonic()
+        for _ in range(5):
+            limiter.acquire()
+        self.assertLess(time.monotonic() - start, 0.1)
+
+    def test_rate_is_enforced(self):
+        limiter = RateLimiter(rate=50, burst=1)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        ## First token is free, the next five wait 1/50 s each
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_unlimited(self):
+        limiter = RateLimiter(rate=None)
+        for _ in range(1000):
+            self.assertEqual(limiter._reserve(), 0.0)
+
+    def test_throttle_and_relax(self):
+        limiter = RateLimiter(rate=10, burst=10, backoff=0.5, increase=1)
+        limiter.update(mock_response(429))
+        self.assertEqual(limiter.rate, 5)
+        limiter.update(mock_response(200))
+        self.assertEqual(limiter.rate, 6)
+        for _ in range(10):
+            limiter.update(mock_response(200))
+        self.assertEqual(limiter.rate, 10)
+
+    def test_retry_after_empties_bucket(self):
+        limiter = RateLimiter(rate=10, burst=10)
+        limiter.update(mock_response(429, headers={"Retry-After": "2"}))
+        self.assertGreaterEqual(limiter._reserve(), 2)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("3"), 3.0)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0)
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertIsNone(parse_retry_after(None))
+
+    def test_connections_share_limiter(self):
+        chem = ctxpy.Chemical(x_api_key="key")
+        expo = ctxpy.Exposure(x_api_key="key")
+        self.assertIs(chem.rate_limiter, get_rate_limiter())
+        self.assertIs(expo.rate_limiter, get_rate_limiter())
+
+    def test_request_waits_on_limiter(self):
+        limiter = MagicMock(spec=RateLimiter)
+        session = MagicMock(spec=requests.Session)
+        response = mock_response()
+        session.request.return_value = response
+        conn = CTXConnection(x_api_key="key", session=session, rate_limiter=limiter)
+
+        conn._request(endpoint="chemical/search/equal/", query="BPA")
+
+        limiter.acquire.assert_called_once_with()
+        limiter.update.assert_called_once_with(response)
+
+    @patch("ctxpy.base.CTXConnection._request", return_value=[])
+    def test_exposure_batch_get_uses_limiter_not_sleep(self, mocker):
+        expo = ctxpy.Exposure(x_api_key="key")
+        with patch("time.sleep") as sleeper:
+            expo.search_qsurs(dtxsid=["DTXSID7020182", "DTXSID2021868"])
+        sleeper.assert_not_called()
+        self.assertEqual(mocker.call_count, 2)
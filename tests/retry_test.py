@@ -0,0 +1,119 @@
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from ctxpy.base import CTXConnection
+from ctxpy.ratelimit import RateLimiter
+from ctxpy.retry import RetryPolicy
+
+
+def mock_response(status_code=200, content=b"[]", headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    response.headers.update(headers or {})
+    return response
+
+
+def connect(responses, **kwargs):
+    session = MagicMock(spec=requests.Session)
+    session.request.side_effect = responses
+    return CTXConnection(
+        x_api_key="key",
+        session=session,
+        rate_limiter=RateLimiter(rate=None),
+        **kwargs,
+    )
+
+
+@patch("ctxpy.retry.time.sleep")
+class TestRetry(unittest.TestCase):
+    def test_retries_transient_status(self, sleeper):
+        conn = connect([mock_response(502), mock_response(200, b'[{"a": 1}]')])
+
+        info = conn.ctx_call(endpoint="chemical/search/equal/", query="BPA")
+
+        self.assertEqual(info, [{"a": 1}])
+        self.assertEqual(conn.session.request.call_count, 2)
+        self.assertEqual(conn.retry_summary.retries, 1)
+        self.assertEqual(conn.retry_summary.reasons[502], 1)
+        sleeper.assert_called_once()
+
+    def test_honors_retry_after(self, sleeper):
+        conn = connect(
+            [mock_response(429, headers={"Retry-After": "7"}), mock_response(200)]
+        )
+
+        conn.ctx_call(endpoint="chemical/search/equal/", query="BPA")
+
+        sleeper.assert_called_once_with(7.0)
+        self.assertEqual(conn.retry_summary.waited, 7.0)
+
+    def test_gives_up_after_max_attempts(self, sleeper):
+        conn = connect(
+            [mock_response(503)] * 4, retry_policy=RetryPolicy(max_attempts=4)
+        )
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            conn.ctx_call(endpoint="chemical/search/equal/", query="BPA")
+
+        self.assertEqual(conn.retry_summary.attempts, 4)
+        self.assertEqual(conn.retry_summary.retries, 3)
+
+    def test_total_timeout(self, sleeper):
+        conn = connect(
+            [mock_response(429, headers={"Retry-After": "60"})],
+            retry_policy=RetryPolicy(total_timeout=10),
+        )
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            conn.ctx_call(endpoint="chemical/search/equal/", query="BPA")
+
+        sleeper.assert_not_called()
+
+    def test_does_not_retry_client_error(self, sleeper):
+        conn = connect([mock_response(404)])
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            conn.ctx_call(endpoint="chemical/search/equal/", query="BPA")
+
+        self.assertEqual(conn.retry_summary.retries, 0)
+
+    def test_retries_connection_error(self, sleeper):
+        conn = connect([requests.exceptions.ConnectionError(), mock_response(200)])
+
+        conn.ctx_call(endpoint="chemical/search/equal/", query="BPA")
+
+        self.assertEqual(conn.retry_summary.reasons["ConnectionError"], 1)
+
+    def test_batch_retries_only_failed_chunk(self, sleeper):
+        sent = []
+
+        def request(**kwargs):
+            query = json.loads(kwargs["data"])
+            sent.append(query)
+            if (query == ["C", "D"]) and (sent.count(query) == 1):
+                return mock_response(502)
+            return mock_response(200, json.dumps(query).encode())
+
+        conn = connect(request)
+
+        info = conn.ctx_call(
+            endpoint="chemical/detail/search/by-dtxsid/",
+            query=["A", "B", "C", "D", "E"],
+            batched=True,
+            batch_size=2,
+        )
+
+        self.assertEqual(info, ["A", "B", "C", "D", "E"])
+        self.assertEqual(sent, [["A", "B"], ["C", "D"], ["C", "D"], ["E"]])
+        self.assertEqual(conn.retry_summary.attempts, 4)
+
+    def test_backoff_is_bounded(self, sleeper):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5)
+        for attempt in range(1, 10):
+            delay = policy.backoff(attempt)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(5, 2 ** (attempt - 1)))
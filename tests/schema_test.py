@@ -0,0 +1,77 @@
+import unittest
+from unittest.mock import patch
+
+import pandas as pd
+
+import ctxpy
+from ctxpy.arrow import pa
+from ctxpy.base import ResponseTransformer
+from ctxpy.schema import SCHEMAS, apply_schema, get_schema, register_schema
+
+
+class TestSchema(unittest.TestCase):
+    hit = [
+        {"id": 1, "source": "ToxVal", "toxvalNumeric": "-", "year": None},
+        {"id": 2, "source": "-", "toxvalNumeric": 3.5, "year": 2001},
+        {"id": 3, "source": "ToxVal", "toxvalNumeric": 0.1, "year": 1999},
+    ]
+
+    def test_get_schema(self):
+        toxval = get_schema("/hazard/toxval/search/by-dtxsid/")
+        self.assertIs(toxval, SCHEMAS["hazard/toxval/"])
+        self.assertEqual(
+            get_schema("hazard/genetox/details/search/by-dtxsid/")["assayResult"],
+            "category",
+        )
+        self.assertIsNone(get_schema("hazard/pprtv/search/by-dtxsid/"))
+
+    def test_register_schema(self):
+        self.addCleanup(SCHEMAS.pop, "hazard/pprtv/", None)
+        register_schema("/hazard/pprtv", {"pprtvSubstanceId": "Int64"})
+        self.assertEqual(
+            get_schema("hazard/pprtv/search/by-dtxsid/"), {"pprtvSubstanceId": "Int64"}
+        )
+        with self.assertRaises(ValueError):
+            register_schema("hazard/pprtv/", {"name": "object"})
+
+    def test_apply_schema(self):
+        df = apply_schema(
+            ResponseTransformer(self.hit).to_df(),
+            {"id": "Int64", "source": "category", "toxvalNumeric": "float64"},
+        )
+        self.assertEqual(df["id"].dtype, "Int64")
+        self.assertIsInstance(df["source"].dtype, pd.CategoricalDtype)
+        self.assertEqual(df["source"].isna().tolist(), [False, True, False])
+        self.assertEqual(df["toxvalNumeric"].dtype, "float64")
+
+        ## Values that don't fit the declared type keep their inferred type
+        df = apply_schema(pd.DataFrame({"id": ["a", "b"]}), {"id": "Int64"})
+        self.assertEqual(df["id"].tolist(), ["a", "b"])
+
+    @patch("ctxpy.base.CTXConnection.ctx_call")
+    def test_use_schemas(self, mocker):
+        mocker.return_value = self.hit
+
+        haz = ctxpy.Hazard(x_api_key="key")
+        df = haz.search_toxvaldb(by="all", dtxsid="DTXSID7020182")
+        self.assertNotIsInstance(df["source"].dtype, pd.CategoricalDtype)
+
+        haz = ctxpy.Hazard(x_api_key="key", use_schemas=True)
+        df = haz.search_toxvaldb(by="all", dtxsid="DTXSID7020182")
+        self.assertIsInstance(df["source"].dtype, pd.CategoricalDtype)
+        self.assertEqual(df["year"].dtype, "Int64")
+        self.assertEqual(df["toxvalNumeric"].dtype, "float64")
+
+    @unittest.skipIf(pa is None, "pyarrow is not installed")
+    def test_arrow_schema(self):
+        table = ResponseTransformer(self.hit).to_arrow(
+            schema=get_schema("hazard/toxval/")
+        )
+        self.assertTrue(pa.types.is_dictionary(table.column("source").type))
+        self.assertEqual(table.column("source").to_pylist(), ["ToxVal", None, "ToxVal"])
+        self.assertEqual(table.column("toxvalNumeric").to_pylist(), [None, 3.5, 0.1])
+        self.assertEqual(table.column("year").type, pa.int64())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import ctxpy
+from ctxpy.arrow import pa, pc
+from ctxpy.sink import DatasetSink
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class TestSink(unittest.TestCase):
+    chunks = [
+        [
+            {"dtxsid": "DTXSID1", "source": "ToxVal", "toxvalNumeric": 1.5},
+            {"dtxsid": "DTXSID1", "source": "IRIS", "toxvalNumeric": "-"},
+        ],
+        [],
+        [
+            {"dtxsid": "DTXSID2", "source": "ToxVal", "toxvalNumeric": 2.0},
+            {"dtxsid": "DTXSID2", "source": "-", "extra": "x"},
+        ],
+    ]
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name)
+
+    def test_write(self):
+        for fmt in ("parquet", "feather"):
+            with self.subTest(format=fmt):
+                sink = DatasetSink(self.path / fmt, format=fmt)
+                for chunk in self.chunks:
+                    sink.write(chunk)
+
+                self.assertEqual(sink.rows, 4)
+                self.assertEqual(sink.chunks, 3)
+                ## Empty chunks don't write a file
+                self.assertEqual(len(sink.files), 2)
+                self.assertTrue(all(f.endswith(f".{fmt}") for f in sink.files))
+
+                df = sink.to_df().sort_values("dtxsid", kind="stable")
+                self.assertEqual(
+                    list(df.columns), ["dtxsid", "source", "toxvalNumeric", "extra"]
+                )
+                self.assertEqual(df["source"].isna().sum(), 1)
+                self.assertEqual(df["extra"].notna().sum(), 1)
+
+    def test_partition_by(self):
+        sink = DatasetSink(self.path, partition_by="dtxsid")
+        for chunk in self.chunks:
+            sink.write(chunk)
+
+        self.assertEqual(
+            sorted(p.name for p in self.path.iterdir()),
+            ["dtxsid=DTXSID1", "dtxsid=DTXSID2"],
+        )
+        table = sink.dataset().to_table(filter=pc.field("dtxsid") == "DTXSID2")
+        self.assertEqual(table.num_rows, 2)
+
+    def test_mixed_type_chunks(self):
+        for fmt in ("parquet", "feather"):
+            with self.subTest(format=fmt):
+                sink = DatasetSink(self.path / fmt, format=fmt)
+                sink.write([{"a": 1, "b": 1}])
+                sink.write([{"a": "text", "b": 2.5}])
+                sink.write([{"a": 3, "b": 4}])
+
+                self.assertEqual(sink.chunks, 3)
+                self.assertEqual(sink.schema.field("a").type, pa.string())
+                self.assertEqual(sink.schema.field("b").type, pa.float64())
+                df = sink.to_df().sort_values("b")
+                self.assertEqual(df["a"].tolist(), ["1", "text", "3"])
+                self.assertEqual(df["b"].tolist(), [1.0, 2.5, 4.0])
+
+    def test_invalid_format(self):
+        with self.assertRaises(ValueError):
+            DatasetSink(self.path, format="csv")
+
+    @patch("ctxpy.base.CTXConnection.iter_ctx_call")
+    def test_search_toxvaldb_sink(self, mocker):
+        mocker.return_value = iter(self.chunks)
+
+        haz = ctxpy.Hazard()
+        sink = DatasetSink(self.path)
+        result = haz.search_toxvaldb(
+            by="all",
+            dtxsid=["DTXSID1", "DTXSID2"],
+            columns=["dtxsid", "toxvalNumeric"],
+            sink=sink,
+        )
+
+        mocker.assert_called_once_with(
+            endpoint="hazard/toxval/search/by-dtxsid/",
+            query=["DTXSID1", "DTXSID2"],
+            batch_size=200,
+            batched=True,
+        )
+        self.assertIs(result, sink)
+        self.assertEqual(sink.rows, 4)
+        self.assertEqual(sink.schema.names, ["dtxsid", "toxvalNumeric"])
+        self.assertEqual(sink.schema.field("toxvalNumeric").type, pa.float64())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import json
+import unittest
+from unittest.mock import MagicMock
+
+import requests
+
+from ctxpy.base import CTXConnection
+from ctxpy.streaming import JSONRecordParser, iter_records
+
+MMDB = {
+    "totalRecords": 3,
+    "data": [
+        {"dtxsid": "DTXSID7020182", "result": 1.5e-3, "medium": "surface water"},
+        {"dtxsid": "DTXSID2021315", "result": 12, "medium": "surface water"},
+        {"dtxsid": "DTXSID3031864", "result": None, "units": "µg/L"},
+    ],
+    "pageSize": 1000,
+    "page": 1,
+}
+
+
+def parse(body, size):
+    ## Feed the body through a parser in chunks of `size` bytes
+    chunks = [body[i : i + size] for i in range(0, len(body), size)]
+    parser = JSONRecordParser()
+    records = list(iter_records(chunks, parser))
+    return parser, records
+
+
+class TestStreaming(unittest.TestCase):
+    def test_array_any_chunk_size(self):
+        body = json.dumps(MMDB["data"]).encode("utf-8")
+        for size in range(1, len(body) + 1):
+            parser, records = parse(body, size)
+            self.assertEqual(records, MMDB["data"])
+            self.assertEqual(parser.assemble(records), MMDB["data"])
+
+    def test_object_records_and_metadata(self):
+        body = json.dumps(MMDB, indent=2).encode("utf-8")
+        for size in (1, 7, 64, len(body)):
+            parser, records = parse(body, size)
+            self.assertEqual(records, MMDB["data"])
+            self.assertEqual(
+                parser.metadata, {"totalRecords": 3, "pageSize": 1000, "page": 1}
+            )
+            self.assertEqual(parser.assemble(records), MMDB)
+
+    def test_records_returned_before_body_ends(self):
+        parser = JSONRecordParser()
+        self.assertEqual(parser.feed(b'[{"a": 1}, {"a"'), [{"a": 1}])
+        self.assertEqual(parser.feed(b": 2}"), [{"a": 2}])
+        self.assertEqual(parser.feed(b"]"), [])
+        self.assertEqual(parser.close(), [])
+
+    def test_number_split_across_chunks(self):
+        parser, records = parse(b"[12345, 678]", 3)
+        self.assertEqual(records, [12345, 678])
+
+    def test_body_split_at_every_offset(self):
+        body = (
+            '{"total": 2e3, "data": [1.5, -0.25E-2, 3e+10, 0, -7, {"score": 2.5e3},'
+            ' "\\u00b5g/L", "µg/L", true, null], "page": 10}'
+        ).encode("utf-8")
+        info = json.loads(body)
+        for offset in range(len(body) + 1):
+            with self.subTest(offset=offset):
+                parser = JSONRecordParser()
+                records = parser.feed(body[:offset]) + parser.feed(body[offset:])
+                records += parser.close()
+                self.assertEqual(parser.assemble(records), info)
+
+    def test_object_without_records(self):
+        body = b'{"dtxsid": "DTXSID7020182", "casrn": "80-05-7"}'
+        parser, records = parse(body, 5)
+        self.assertEqual(records, [])
+        self.assertEqual(
+            parser.assemble(records), {"dtxsid": "DTXSID7020182", "casrn": "80-05-7"}
+        )
+
+    def test_scalar_and_empty_bodies(self):
+        parser, records = parse(b'"DTXSID7020182"', 4)
+        self.assertEqual(parser.assemble(records), "DTXSID7020182")
+        parser, records = parse(b"[]", 1)
+        self.assertEqual(parser.assemble(records), [])
+
+    def test_truncated_body_raises(self):
+        with self.assertRaises(json.JSONDecodeError):
+            parse(b'[{"a": 1}, {"a": 2', 4)
+        with self.assertRaises(json.JSONDecodeError):
+            parse(b'[{"a": 1} {"a": 2}]', 4)
+
+    def test_request_stream_mode(self):
+        body = json.dumps(MMDB).encode("utf-8")
+        response = MagicMock(spec=requests.Response)
+        response.status_code = 200
+        response.iter_content.side_effect = lambda chunk_size: (
+            body[i : i + chunk_size] for i in range(0, len(body), chunk_size)
+        )
+        session = MagicMock(spec=requests.Session)
+        session.request.return_value = response
+        conn = CTXConnection(
+            x_api_key="key", session=session, stream=True, stream_chunk_size=16
+        )
+
+        info = conn._request(
+            endpoint="exposure/mmdb/single-sample/by-medium", query="surface water"
+        )
+
+        self.assertEqual(info, MMDB)
+        self.assertTrue(session.request.call_args.kwargs["stream"])
+        response.iter_content.assert_called_once_with(chunk_size=16)
+        response.close.assert_called()
+
+    def test_request_stream_mode_error_closes(self):
+        response = MagicMock(spec=requests.Response)
+        response.status_code = 404
+        response.raise_for_status.side_effect = requests.HTTPError(response=response)
+        session = MagicMock(spec=requests.Session)
+        session.request.return_value = response
+        conn = CTXConnection(x_api_key="key", session=session, stream=True)
+
+        with self.assertRaises(requests.HTTPError):
+            conn._request(
+                endpoint="exposure/mmdb/single-sample/by-medium", query="surface water"
+            )
+
+        response.iter_content.assert_not_called()
+        response.close.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
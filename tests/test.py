@@ -1,19 +1,47 @@
 import unittest
 
+from aio_test import TestAsync
+from arrow_test import TestArrow
+from base_test import TestCTXConnection
+from batching_test import TestBatching
+from cache_test import TestResponseCache
+from cassette_test import TestCassette
+from checkpoint_test import TestCheckpoint
 from chemical_list_test import TestChemicalLists
 from chemical_test import TestChemical
+from dossier_test import TestDossier
 from exposure_test import TestExposure
 from hazard_test import TestHazard
+from mock_server_test import TestMockServer
+from ratelimit_test import TestRateLimiter
+from retry_test import TestRetry
+from schema_test import TestSchema
+from sink_test import TestSink
+from streaming_test import TestStreaming
 from utilities_test import TestUtilities
 
 loader = unittest.TestLoader()
 suite = unittest.TestSuite(
     [
         loader.loadTestsFromTestCase(TestUtilities),
+        loader.loadTestsFromTestCase(TestCTXConnection),
         loader.loadTestsFromTestCase(TestChemical),
         loader.loadTestsFromTestCase(TestChemicalLists),
         loader.loadTestsFromTestCase(TestExposure),
         loader.loadTestsFromTestCase(TestHazard),
+        loader.loadTestsFromTestCase(TestAsync),
+        loader.loadTestsFromTestCase(TestRateLimiter),
+        loader.loadTestsFromTestCase(TestRetry),
+        loader.loadTestsFromTestCase(TestResponseCache),
+        loader.loadTestsFromTestCase(TestStreaming),
+        loader.loadTestsFromTestCase(TestCheckpoint),
+        loader.loadTestsFromTestCase(TestMockServer),
+        loader.loadTestsFromTestCase(TestCassette),
+        loader.loadTestsFromTestCase(TestArrow),
+        loader.loadTestsFromTestCase(TestSchema),
+        loader.loadTestsFromTestCase(TestSink),
+        loader.loadTestsFromTestCase(TestDossier),
+        loader.loadTestsFromTestCase(TestBatching),
     ]
 )
 runner = unittest.TextTestRunner()